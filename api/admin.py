@@ -1,6 +1,194 @@
-from django.contrib.admin import site
-from .models import Subject, Topic, StudySession
+"""
+Admin classes sized for large tables.
 
-site.register(Subject)
-site.register(Topic)
-site.register(StudySession)
+Changelists select the related rows their columns show (no per-row
+``__str__`` lookups), use raw-ID widgets instead of rendering every user or
+subject into a ``<select>``, only order by indexed columns, and estimate
+the row count of unfiltered lists of the biggest tables instead of running
+``COUNT(*)``. ``WeeklyRollupAdmin`` also serves the platform usage
+dashboard (usage.py) at ``/admin/api/weeklyrollup/usage/``.
+"""
+
+from django.contrib.admin import ModelAdmin, display, register
+from django.core.paginator import Paginator
+from django.db import connection
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.functional import cached_property
+
+from .models import (
+    ArchivedStudyDay, GroupWeeklyScore, Subject, Topic, StudyGroup, StudyGroupMembership, StudySession,
+    SyncBatch, SyncChange, SyncCursor, TopicStatusChange, WeeklyRollup,
+)
+from .usage import platform_usage
+
+
+def estimated_row_count(model):
+    """The database's statistics estimate of ``model``'s row count, None if it has none."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            row = cursor.fetchone()
+            return row[0] if row and row[0] >= 0 else None  # -1: never analyzed
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:  # never analyzed
+                return None
+            # Each index's row starts with the number of rows it covers
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [table])
+            counts = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+            return max(counts, default=None)
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Uses the statistics estimate for unfiltered lists of more than ``estimate_above`` rows."""
+    estimate_above = 100_000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.has_filters():
+            estimate = estimated_row_count(self.object_list.model)
+            if estimate is not None and estimate > self.estimate_above:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # no second COUNT(*) of the whole table when filtering
+
+
+@register(Subject)
+class SubjectAdmin(ModelAdmin):
+    list_display = ['name', 'user', 'topic_count', 'mastered_count', 'total_study_seconds', 'created_at']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    search_fields = ['name', '=user__username']
+
+
+@register(Topic)
+class TopicAdmin(LargeTableAdmin):
+    list_display = ['name', 'subject_name', 'status', 'difficulty', 'position']
+    list_select_related = ['subject']
+    list_filter = ['status', 'difficulty']
+    raw_id_fields = ['subject']
+    search_fields = ['name']
+    ordering = ['-id']
+
+    @display(description='subject')
+    def subject_name(self, obj):
+        return obj.subject.name
+
+
+@register(StudySession)
+class StudySessionAdmin(LargeTableAdmin):
+    list_display = ['id', 'user', 'subject_name', 'topic_name', 'duration_seconds', 'local_date', 'created_at']
+    list_select_related = ['user', 'subject', 'topic']
+    raw_id_fields = ['user', 'subject', 'topic']
+    date_hierarchy = 'created_at'  # session_created_idx
+    search_fields = ['=user__username']
+
+    @display(description='subject')
+    def subject_name(self, obj):
+        return obj.subject.name if obj.subject else None
+
+    @display(description='topic')
+    def topic_name(self, obj):
+        return obj.topic.name if obj.topic else None
+
+
+@register(ArchivedStudyDay)
+class ArchivedStudyDayAdmin(LargeTableAdmin):
+    list_display = ['day', 'user', 'subject_name', 'session_count', 'total_seconds']
+    list_select_related = ['user', 'subject']
+    raw_id_fields = ['user', 'subject']
+    search_fields = ['=user__username']
+    ordering = ['-id']
+
+    @display(description='subject')
+    def subject_name(self, obj):
+        return obj.subject.name if obj.subject else None
+
+
+@register(TopicStatusChange)
+class TopicStatusChangeAdmin(LargeTableAdmin):
+    list_display = ['changed_at', 'user', 'topic', 'from_status', 'to_status']
+    list_select_related = ['user', 'topic__subject']  # Topic.__str__ shows the subject
+    raw_id_fields = ['user', 'topic', 'subject']
+    search_fields = ['=user__username']
+    ordering = ['-id']
+
+
+@register(WeeklyRollup)
+class WeeklyRollupAdmin(LargeTableAdmin):
+    list_display = ['user', 'tz', 'week', 'session_count', 'total_duration_seconds', 'days_studied']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    search_fields = ['=user__username']
+    change_list_template = 'admin/api/weeklyrollup/change_list.html'
+
+    def get_urls(self):
+        return [
+            path('usage/', self.admin_site.admin_view(self.usage_view), name='api_weeklyrollup_usage'),
+            *super().get_urls(),
+        ]
+
+    def usage_view(self, request):
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Platform usage',
+            'opts': self.model._meta,
+            'usage': platform_usage(),
+        }
+        return TemplateResponse(request, 'admin/api/usage.html', context)
+
+
+@register(SyncChange)
+class SyncChangeAdmin(LargeTableAdmin):
+    list_display = ['kind', 'object_id', 'version', 'deleted', 'user']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    list_filter = ['kind', 'deleted']
+    ordering = ['-id']
+
+
+@register(SyncBatch)
+class SyncBatchAdmin(LargeTableAdmin):
+    list_display = ['batch_id', 'user', 'created_at']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    ordering = ['-id']
+
+
+@register(SyncCursor)
+class SyncCursorAdmin(ModelAdmin):
+    list_display = ['user', 'version']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+
+
+@register(StudyGroup)
+class StudyGroupAdmin(ModelAdmin):
+    list_display = ['name', 'owner', 'member_count', 'created_at']
+    list_select_related = ['owner']
+    raw_id_fields = ['owner']
+    search_fields = ['name', '=owner__username']
+
+
+@register(StudyGroupMembership)
+class StudyGroupMembershipAdmin(LargeTableAdmin):
+    list_display = ['user', 'group', 'joined_at']
+    list_select_related = ['user', 'group']
+    raw_id_fields = ['user', 'group']
+    ordering = ['-id']
+
+
+@register(GroupWeeklyScore)
+class GroupWeeklyScoreAdmin(LargeTableAdmin):
+    list_display = ['group', 'week', 'user', 'total_seconds', 'session_count']
+    list_select_related = ['group', 'user']
+    raw_id_fields = ['group', 'user']
+    ordering = ['-id']
@@ -9,9 +9,13 @@ import json
 import logging
 import re
 
-from groq import Groq
 from django.conf import settings
 
+from .lazy_imports import LazyImport
+
+# The SDK's import costs more than the rest of the API's; see lazy_imports.py
+Groq = LazyImport('groq', 'Groq')
+
 logger = logging.getLogger(__name__)
 
 SYSTEM_PROMPT = """You are a senior academic curriculum expert with deep knowledge across all university disciplines — including STEM, humanities, social sciences, medicine, law, business, arts, and practical/vocational subjects.
@@ -0,0 +1,164 @@
+"""
+archive.py — Moving old sessions out of the working set.
+
+Sessions created more than ``SESSION_RETENTION_DAYS`` ago are folded into
+``ArchivedStudyDay`` rows (one per user, subject and day: session count and
+seconds) and deleted from ``StudySession``, so the session table, and every
+scan of it, stays proportional to the retention window rather than to the
+account's age. Reports and streaks (``stats.py``) add the archived tier for
+the days that may have been archived.
+
+Archived days are the sessions' stored ``local_date`` (their date in the
+owner's home timezone, see local_dates.py), the same day streaks and home
+timezone reports count them on; a report in another timezone attributes
+archived time to those whole days. Notes,
+topics and exact times are dropped; pass ``export_dir`` to keep the raw rows
+as gzipped JSON lines (one file per run that archived anything) before they
+are deleted.
+
+Subject counters are left untouched: archived time still counts towards a
+subject's ``total_study_seconds``. Archived sessions are logged as deleted
+for delta sync (sync.py).
+"""
+
+import gzip
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import sync
+from .models import ArchivedStudyDay, StudySession
+
+BATCH_SIZE = 5000
+
+EXPORT_FIELDS = (
+    'id', 'user_id', 'subject_id', 'topic_id', 'start_time', 'end_time',
+    'duration_seconds', 'notes', 'created_at', 'local_date',
+)
+
+
+@dataclass
+class ArchiveResult:
+    sessions: int = 0        # raw sessions folded into the aggregate tier
+    days: int = 0            # aggregate rows created or updated
+    export_path: Path = None
+
+
+def cutoff(now=None):
+    """Sessions created before this instant are due for archival."""
+    return (now or timezone.now()) - timedelta(days=settings.SESSION_RETENTION_DAYS)
+
+
+def archived_through(now=None):
+    """
+    The latest local date, in any timezone, that can hold archived sessions.
+    Days after it are served from ``StudySession`` alone.
+    """
+    return timezone.localtime(cutoff(now)).date() + timedelta(days=1)
+
+
+def export_path(export_dir):
+    path = Path(export_dir) / f"sessions-{timezone.now():%Y%m%dT%H%M%S%f}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _fold(rows):
+    """``{(user_id, subject_id, day): [session_count, total_seconds]}`` for ``rows``."""
+    folded = defaultdict(lambda: [0, 0])
+    for row in rows:
+        # Not backfilled yet (manage.py backfill_local_dates): its date in TIME_ZONE
+        day = row['local_date'] or timezone.localdate(row['created_at'])
+        totals = folded[row['user_id'], row['subject_id'], day]
+        totals[0] += 1
+        totals[1] += row['duration_seconds']
+    return folded
+
+
+def _merge(folded):
+    """Add ``folded`` totals to the aggregate rows, creating missing ones."""
+    existing = {
+        (a.user_id, a.subject_id, a.day): a
+        for a in ArchivedStudyDay.objects.filter(
+            user_id__in={user_id for user_id, _, _ in folded},
+            day__in={day for _, _, day in folded},
+        )
+    }
+    changed, new = [], []
+    for key, (count, seconds) in folded.items():
+        aggregate = existing.get(key)
+        if aggregate is None:
+            user_id, subject_id, day = key
+            new.append(ArchivedStudyDay(
+                user_id=user_id, subject_id=subject_id, day=day,
+                session_count=count, total_seconds=seconds,
+            ))
+        else:
+            aggregate.session_count += count
+            aggregate.total_seconds += seconds
+            changed.append(aggregate)
+    ArchivedStudyDay.objects.bulk_create(new, batch_size=500)
+    ArchivedStudyDay.objects.bulk_update(changed, ['session_count', 'total_seconds'], batch_size=500)
+    return len(new) + len(changed)
+
+
+def _delete_without_signals(session_ids):
+    """
+    ``DELETE`` the sessions in plain SQL. The time stays in the subject
+    counters, rollups and group scores, so the post_delete receivers that
+    ``QuerySet.delete()`` would run per row must not run. Nothing references
+    a session, so there is nothing to cascade to.
+    """
+    table = connection.ops.quote_name(StudySession._meta.db_table)
+    pk = connection.ops.quote_name(StudySession._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {pk} IN ({", ".join(["%s"] * len(session_ids))})', session_ids)
+
+
+def archive_sessions(before=None, export_dir=None, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Fold every session created before ``before`` (default: ``cutoff()``) into
+    the aggregate tier, ``batch_size`` sessions per transaction.
+    """
+    before = before or cutoff()
+    result = ArchiveResult()
+    due = StudySession.objects.filter(created_at__lt=before).order_by('id')
+    if dry_run:
+        result.sessions = due.count()
+        result.days = len(_fold(due.values('user_id', 'subject_id', 'created_at', 'local_date', 'duration_seconds')))
+        return result
+
+    export = None
+    try:
+        while True:
+            with transaction.atomic():
+                rows = list(due.values(*EXPORT_FIELDS)[:batch_size])
+                if not rows:
+                    break
+                if export_dir is not None:
+                    if export is None:
+                        result.export_path = export_path(export_dir)
+                        export = gzip.open(result.export_path, 'xt', encoding='utf-8')
+                    # Written (and flushed) before the rows are deleted: a failed
+                    # batch can repeat rows in the export but never lose them
+                    export.writelines(json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in rows)
+                    export.flush()
+                result.days += _merge(_fold(rows))
+                _delete_without_signals([row['id'] for row in rows])
+                by_user = defaultdict(list)
+                for row in rows:
+                    by_user[row['user_id']].append(row['id'])
+                for user_id, ids in by_user.items():
+                    sync.record(user_id, deleted={'session': ids})
+                result.sessions += len(rows)
+    finally:
+        if export is not None:
+            export.close()
+    return result
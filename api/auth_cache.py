@@ -0,0 +1,97 @@
+"""
+auth_cache.py — Cached user and profile lookups for authenticated requests.
+
+Every API call resolves ``request.user`` from the session; with the defaults
+that costs a session query plus a user query, and ``/api/auth/user/`` adds a
+social-account query for the avatar. Here the user row and the profile
+payload (username, name, email, avatar, home timezone) are kept in the
+default cache, so on a warm cache an authenticated request touches the
+database only for the data it actually serves.
+
+Entries are refreshed at login and dropped whenever the user, their
+``UserProfile`` or their GitHub account changes (see ``signals.py``). That
+only reaches the cache of the process handling the change, so with the
+per-process default cache entries live ``AUTH_CACHE_LOCAL_TIMEOUT``
+seconds instead of ``AUTH_CACHE_TIMEOUT``: other workers stop
+authenticating a deactivated user, or an old password, within seconds.
+"""
+
+from allauth.account.auth_backends import AuthenticationBackend
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .models import UserProfile
+
+
+def cache_timeout():
+    """``AUTH_CACHE_TIMEOUT`` with a shared default cache, at most ``AUTH_CACHE_LOCAL_TIMEOUT`` otherwise."""
+    if isinstance(caches['default'], LocMemCache):
+        return min(settings.AUTH_CACHE_TIMEOUT, settings.AUTH_CACHE_LOCAL_TIMEOUT)
+    return settings.AUTH_CACHE_TIMEOUT
+
+
+def user_cache_key(user_id):
+    return f'auth.user.{user_id}'
+
+
+def profile_cache_key(user_id):
+    return f'auth.profile.{user_id}'
+
+
+class CachedAuthenticationBackend(AuthenticationBackend):
+    """
+    allauth's backend, with ``get_user`` — run once per request by
+    ``AuthenticationMiddleware`` — served from the cache.
+
+    The cached object carries the password hash, so Django's session hash
+    check still logs out other sessions after a password change.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, cache_timeout())
+        return user
+
+
+def build_profile(user):
+    """The ``/api/auth/user/`` payload, read from the database."""
+    avatar_url = ''
+    try:
+        social_account = user.socialaccount_set.filter(provider='github').first()
+        if social_account:
+            avatar_url = social_account.extra_data.get('avatar_url', '')
+    except Exception:
+        pass
+    timezone = UserProfile.objects.filter(user=user).values_list('timezone', flat=True).first()
+    return {
+        'id': user.id, 'username': user.username,
+        'email': user.email,
+        'name': user.get_full_name() or user.username,
+        'avatar_url': avatar_url,
+        'timezone': timezone or '',  # blank: not chosen yet, dated in UTC
+    }
+
+
+def refresh_profile(user):
+    """Rebuild and cache ``user``'s profile payload."""
+    profile = build_profile(user)
+    cache.set(profile_cache_key(user.id), profile, cache_timeout())
+    return profile
+
+
+def get_profile(user):
+    """Cached profile payload for ``user``, building it on a miss."""
+    profile = cache.get(profile_cache_key(user.id))
+    if profile is None:
+        profile = refresh_profile(user)
+    return profile
+
+
+def invalidate_user(user_id):
+    """Drop the cached user and profile so the next request reloads them."""
+    cache.delete_many([user_cache_key(user_id), profile_cache_key(user_id)])
@@ -0,0 +1,116 @@
+"""
+compression.py — gzip / brotli for API responses.
+
+JSON responses of at least ``COMPRESSION_MIN_SIZE`` bytes are compressed
+with the best encoding the client accepts: brotli when the ``brotli``
+package is installed, otherwise gzip. Smaller bodies aren't worth the CPU or
+the header overhead, and anything already encoded or streamed is left alone.
+Static files and the frontend bundle never get here: WhiteNoise serves them
+from the files precompressed at build time.
+
+API bodies never echo secrets (the CSRF token travels in a cookie), so
+compressing them doesn't open a BREACH-style side channel.
+"""
+
+import gzip
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+def accepted_encodings(header):
+    """``'gzip, br;q=0.8, *;q=0'`` → ``{'gzip': 1.0, 'br': 0.8, '*': 0.0}``"""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """Preferred available encoding for an Accept-Encoding header, or None."""
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get('*', 0.0)
+    available = (['br'] if brotli is not None else []) + ['gzip']
+    best = max(available, key=lambda coding: accepted.get(coding, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def is_json(content_type):
+    media_type = content_type.partition(';')[0].strip().lower()
+    return media_type == 'application/json' or media_type.endswith('+json')
+
+
+class CompressionMiddleware:
+    """
+    Compresses large JSON responses; disable with ``COMPRESSION_ENABLED = False``.
+    Sync and async capable, so under ASGI the chain stays async.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.COMPRESSION_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress_response(request, await self.get_response(request))
+
+    def compress_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not is_json(response.get('Content-Type', ''))
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # The body changed, so a strong ETag no longer matches it byte for byte
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
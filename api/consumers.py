@@ -0,0 +1,63 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .local_dates import home_timezone, resolve_tz
+from .realtime import stats_group_name
+from .stats import stats_snapshot
+
+
+class StatsConsumer(AsyncJsonWebsocketConsumer):
+    """
+    WS /ws/stats/?tz=Asia/Kolkata (default: the user's home timezone)
+
+    Pushes the dashboard stats (today's seconds, streak, mastery counts) for
+    the logged-in user. On connect the client receives
+    ``{"type": "snapshot", "stats": {...}}``; afterwards, whenever a session or
+    topic changes, it receives ``{"type": "delta", "changes": {...}}`` holding
+    only the fields whose value changed.
+
+    Anonymous connections are closed with code 4403.
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4403)
+            return
+
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        self.user = user
+        self.tz_name = query.get('tz', [''])[0]
+        self.group_name = stats_group_name(user.id)
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        self.stats = await self._load_stats()
+        await self.send_json({'type': 'snapshot', 'stats': self.stats})
+
+    async def disconnect(self, code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Clients may ask for a full resync, e.g. after waking from sleep
+        if content.get('type') == 'resync':
+            self.stats = await self._load_stats()
+            await self.send_json({'type': 'snapshot', 'stats': self.stats})
+
+    async def stats_changed(self, event):
+        """Group message handler for ``{'type': 'stats.changed'}``."""
+        fresh = await self._load_stats()
+        changes = {k: v for k, v in fresh.items() if self.stats.get(k) != v}
+        self.stats = fresh
+        if changes:
+            await self.send_json({'type': 'delta', 'changes': changes})
+
+    @database_sync_to_async
+    def _load_stats(self):
+        # The home timezone is re-read each time: the user may change it mid-connection
+        tz = resolve_tz(self.tz_name) if self.tz_name else home_timezone(self.user)
+        return stats_snapshot(self.user, tz)
@@ -0,0 +1,100 @@
+"""
+counters.py — Denormalized per-subject counters.
+
+``Subject.topic_count``, ``mastered_count`` and ``total_study_seconds`` are
+kept current with single ``UPDATE ... SET col = col + n`` statements (``F()``
+expressions), so concurrent writers never lose an increment. Model saves and
+deletes are handled by the receivers in ``signals.py``; bulk writes that
+bypass signals (syllabus imports) call these functions directly.
+
+Anything else that writes around them (raw SQL, ``QuerySet.update``, admin
+edits of sessions) can be repaired with ``manage.py reconcile_subject_counters``.
+"""
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import ArchivedStudyDay, Subject, Topic, StudySession
+
+
+def _bump(subject_id, **deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if subject_id is not None and changes:
+        Subject.objects.filter(pk=subject_id).update(**changes)
+
+
+def topics_added(subject_id, count=1, mastered=0):
+    _bump(subject_id, topic_count=count, mastered_count=mastered)
+
+
+def topic_saved(topic, created):
+    """Apply a topic create, status change or move between subjects."""
+    is_mastered = int(topic.status == 'mastered')
+    if created:
+        topics_added(topic.subject_id, mastered=is_mastered)
+    else:
+        loaded_status = getattr(topic, 'loaded_status', topic.status)
+        loaded_subject_id = getattr(topic, 'loaded_subject_id', topic.subject_id)
+        was_mastered = int(loaded_status == 'mastered')
+        if loaded_subject_id != topic.subject_id:
+            _bump(loaded_subject_id, topic_count=-1, mastered_count=-was_mastered)
+            topics_added(topic.subject_id, mastered=is_mastered)
+        else:
+            _bump(topic.subject_id, mastered_count=is_mastered - was_mastered)
+    topic.loaded_status, topic.loaded_subject_id = topic.status, topic.subject_id
+
+
+def topic_deleted(topic):
+    _bump(topic.subject_id, topic_count=-1, mastered_count=-int(topic.status == 'mastered'))
+
+
+def session_added(session):
+    _bump(session.subject_id, total_study_seconds=session.duration_seconds)
+
+
+def session_deleted(session):
+    _bump(session.subject_id, total_study_seconds=-session.duration_seconds)
+
+
+def actual_counts():
+    """Subquery annotations recounting each subject's counters from the source tables."""
+    topics = Topic.objects.filter(subject=OuterRef('pk')).order_by().values('subject')
+    sessions = StudySession.objects.filter(subject=OuterRef('pk')).order_by().values('subject')
+    # Archived sessions (archive.py) still count towards a subject's study time
+    archived = ArchivedStudyDay.objects.filter(subject=OuterRef('pk')).order_by().values('subject')
+    return {
+        'actual_topic_count': Coalesce(
+            Subquery(topics.annotate(n=Count('id')).values('n'), output_field=IntegerField()), Value(0)),
+        'actual_mastered_count': Coalesce(
+            Subquery(topics.annotate(n=Count('id', filter=Q(status='mastered'))).values('n'),
+                     output_field=IntegerField()), Value(0)),
+        'actual_total_study_seconds': Coalesce(
+            Subquery(sessions.annotate(n=Sum('duration_seconds')).values('n'),
+                     output_field=IntegerField()), Value(0),
+        ) + Coalesce(
+            Subquery(archived.annotate(n=Sum('total_seconds')).values('n'),
+                     output_field=IntegerField()), Value(0),
+        ),
+    }
+
+
+def reconcile_subject_counters(queryset=None, dry_run=False):
+    """Recount drifted subjects; return the subjects that were (or would be) fixed."""
+    queryset = Subject.objects.all() if queryset is None else queryset
+    drifted = list(
+        queryset.annotate(**actual_counts())
+        .exclude(
+            topic_count=F('actual_topic_count'),
+            mastered_count=F('actual_mastered_count'),
+            total_study_seconds=F('actual_total_study_seconds'),
+        )
+    )
+    for subject in drifted:
+        subject.topic_count = subject.actual_topic_count
+        subject.mastered_count = subject.actual_mastered_count
+        subject.total_study_seconds = subject.actual_total_study_seconds
+    if drifted and not dry_run:
+        Subject.objects.bulk_update(
+            drifted, ['topic_count', 'mastered_count', 'total_study_seconds'], batch_size=500,
+        )
+    return drifted
@@ -0,0 +1,141 @@
+"""
+fast_lists.py — Fast path for the hot list endpoints (topics, sessions).
+
+``ValuesRows`` builds the same dicts a ModelSerializer would, straight from
+``values_list()`` tuples: the serializer's fields are inspected once into a
+column list plus a converter per field (only datetimes need one), so a row
+costs one ``zip`` instead of a model instance and a ``to_representation``
+call per field. ``FastJSONRenderer`` renders with orjson and produces the
+same bytes as DRF's ``JSONRenderer`` for these payloads (compact separators,
+raw UTF-8, escaped U+2028/U+2029, DRF's encoder for anything orjson doesn't
+handle natively). It falls back to ``JSONRenderer`` for indented output
+and for values orjson rejects. One known difference: floats in exponent
+form (``1e16`` vs ``1e+16``). Neither payload carries floats.
+
+``python -m benchmarks.serializers`` compares both paths per 1,000 rows.
+"""
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .metrics import serializer_timer
+
+# Fields whose to_representation returns the database value unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ChoiceField, serializers.PrimaryKeyRelatedField,
+)
+
+
+def _iso_datetime(value, tz):
+    # DateTimeField.to_representation with the ISO-8601 format
+    value = value.astimezone(tz).isoformat() if tz is not None else value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+class ValuesRows:
+    """
+    Serializer-compatible output for ``serializer_class`` from ``values_list()``.
+
+    ``sources`` maps fields that aren't plain model columns (e.g. a
+    SerializerMethodField) to the lookup that yields their value.
+    """
+
+    def __init__(self, serializer_class, sources=None):
+        self.serializer_class = serializer_class
+        self.sources = sources or {}
+        self._plan = None
+
+    def _build_plan(self):
+        keys, lookups, converters = [], [], {}
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            keys.append(name)
+            lookups.append(self.sources.get(name, field.source))
+            if name in self.sources or isinstance(field, PASSTHROUGH_FIELDS):
+                continue
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            if isinstance(field, serializers.DateTimeField) and output_format == ISO_8601:
+                converters[len(keys) - 1] = _iso_datetime
+            else:
+                converters[len(keys) - 1] = lambda value, tz, field=field: field.to_representation(value)
+        return tuple(keys), lookups, tuple(converters.items())
+
+    @property
+    def plan(self):
+        if self._plan is None:
+            self._plan = self._build_plan()
+        return self._plan
+
+    def values(self, queryset):
+        return queryset.values_list(*self.plan[1])
+
+    def rows(self, tuples):
+        keys, _, converters = self.plan
+        tz = timezone.get_current_timezone()
+        with serializer_timer():
+            if not converters:
+                return [dict(zip(keys, row)) for row in tuples]
+            out = []
+            for row in tuples:
+                row = list(row)
+                for i, convert in converters:
+                    if row[i] is not None:
+                        row[i] = convert(row[i], tz)
+                out.append(dict(zip(keys, row)))
+            return out
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` output, rendered by orjson."""
+
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=self.OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastListMixin:
+    """
+    ``list()`` via ``ValuesRows``; set ``list_rows`` on the viewset. Filtering,
+    pagination and the response envelope are the viewset's own.
+    """
+    list_rows = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.list_rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.list_rows.rows(page))
+        return Response(self.list_rows.rows(queryset))
+
+
+class AsyncFastListMixin:
+    """``FastListMixin`` for adrf's async viewsets."""
+    list_rows = None
+
+    async def list(self, request, *args, **kwargs):
+        queryset = self.list_rows.values(await self.afilter_queryset(self.get_queryset()))
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return await self.get_apaginated_response(self.list_rows.rows(page))
+        rows = await sync_to_async(lambda: self.list_rows.rows(queryset))()
+        return Response(rows)
@@ -0,0 +1,46 @@
+"""
+idempotency.py — At-most-once session creation for retried writes.
+
+A client generates a UUID once per recorded session and sends it with every
+attempt to create it, as ``client_id`` in the body or as the
+``Idempotency-Key`` header of ``POST /api/sessions/`` (or per session in a
+``POST /api/sync/`` batch). ``(user, client_id)`` has a unique index, so a
+retry, sequential or racing the original in parallel, fails its INSERT and
+gets the existing session back from one index lookup instead of creating a
+duplicate. The retry's body is not compared with the original's.
+
+Sessions without a key are created as before.
+"""
+
+import uuid
+
+from django.db import IntegrityError, transaction
+
+from .models import StudySession
+
+HEADER = 'Idempotency-Key'
+
+
+def header_key(request):
+    """The request's ``Idempotency-Key`` as a UUID, None without one; ValueError if malformed."""
+    key = request.headers.get(HEADER)
+    return uuid.UUID(key) if key else None
+
+
+def save_session(serializer, user, client_id=None):
+    """
+    Save the validated ``serializer``'s session for ``user`` unless one with
+    the same client id exists. Returns ``(session, created)``.
+    """
+    client_id = client_id or serializer.validated_data.get('client_id')
+    if client_id is None:
+        return serializer.save(user=user), True
+    try:
+        with transaction.atomic():
+            return serializer.save(user=user, client_id=client_id), True
+    except IntegrityError:
+        existing = StudySession.objects.filter(user=user, client_id=client_id).first()
+        if existing is None:
+            raise
+        serializer.instance = existing
+        return existing, False
@@ -0,0 +1,35 @@
+"""
+lazy_imports.py — Heavy optional dependencies, imported on first use.
+
+``pypdf`` and the Groq SDK (with its pydantic/httpx models) are only needed
+by the AI syllabus upload, yet importing them at module load would make
+every worker, and every management command, pay for them at startup.
+``LazyImport`` stands in for the imported object: the module is imported
+the first time the stand-in is called or an attribute is read from it,
+and the name can still be patched in tests like a normal import.
+"""
+
+from importlib import import_module
+
+
+class LazyImport:
+    """``LazyImport('pypdf', 'PdfReader')`` behaves like ``from pypdf import PdfReader``, on first use."""
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            self._target = getattr(import_module(self._module), self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f'<lazy {self._module}.{self._name}>'
@@ -0,0 +1,193 @@
+"""
+leaderboard.py — Study groups and their weekly leaderboards.
+
+``GroupWeeklyScore`` holds one row per group, member and week: the
+member's study seconds and session count that week. Each session create
+or delete adds to or subtracts from the rows for every group its owner is
+in (``session_added`` / ``session_deleted``, called from ``signals.py``)
+with ``UPDATE ... SET col = col + n`` statements, so concurrent writers
+never lose an increment. A leaderboard is then one read of the
+``(group, week, -total_seconds, user)`` index, already in rank order,
+however many members the group has: no session is scanned at read time.
+
+A week is the Monday of the sessions' ``local_date``, i.e. weeks in each
+member's own home timezone (see local_dates.py). Joining a group scores
+the member's history (``join``); changing the home timezone rescores it
+(``rebuild_scores``). Archived time still counts, like subject counters.
+
+Writes that bypass signals (bulk loads, raw SQL) leave scores stale until
+``manage.py rebuild_group_scores``.
+"""
+
+import secrets
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest
+
+from .local_dates import home_timezone, session_day
+from .models import ArchivedStudyDay, GroupWeeklyScore, StudyGroup, StudyGroupMembership, StudySession
+from .rollups import week_monday
+
+
+def new_invite_code():
+    return secrets.token_urlsafe(9)
+
+
+def _session_week(session):
+    day = session.local_date or session.created_at.astimezone(home_timezone(session.user)).date()
+    return week_monday(day)
+
+
+def _group_ids(user_id):
+    return list(StudyGroupMembership.objects.filter(user_id=user_id).values_list('group_id', flat=True))
+
+
+def session_added(session):
+    group_ids = _group_ids(session.user_id)
+    if not group_ids:
+        return
+    week = _session_week(session)
+    with transaction.atomic(savepoint=False):
+        GroupWeeklyScore.objects.bulk_create(
+            [GroupWeeklyScore(group_id=group_id, user_id=session.user_id, week=week) for group_id in group_ids],
+            ignore_conflicts=True,
+        )
+        GroupWeeklyScore.objects.filter(group_id__in=group_ids, user_id=session.user_id, week=week).update(
+            total_seconds=F('total_seconds') + session.duration_seconds,
+            session_count=F('session_count') + 1,
+        )
+
+
+def session_deleted(session):
+    group_ids = _group_ids(session.user_id)
+    if not group_ids:
+        return
+    GroupWeeklyScore.objects.filter(
+        group_id__in=group_ids, user_id=session.user_id, week=_session_week(session),
+    ).update(
+        total_seconds=Greatest(F('total_seconds') - session.duration_seconds, 0),
+        session_count=Greatest(F('session_count') - 1, 0),
+    )
+
+
+def weekly_totals(user):
+    """``{monday: (seconds, session count)}`` for all of ``user``'s sessions and archived days."""
+    home = home_timezone(user)
+    totals = defaultdict(lambda: [0, 0])
+    for day, seconds, count in (
+        StudySession.objects.filter(user=user).order_by()
+        .values_list(session_day(home, home)).annotate(Sum('duration_seconds'), Count('id'))
+    ):
+        week = totals[week_monday(day)]
+        week[0] += seconds
+        week[1] += count
+    for day, seconds, count in (
+        ArchivedStudyDay.objects.filter(user=user).order_by()
+        .values_list('day').annotate(Sum('total_seconds'), Sum('session_count'))
+    ):
+        week = totals[week_monday(day)]
+        week[0] += seconds
+        week[1] += count
+    return {monday: tuple(values) for monday, values in totals.items()}
+
+
+def _score_rows(user, group_ids):
+    return [
+        GroupWeeklyScore(group_id=group_id, user=user, week=monday, total_seconds=seconds, session_count=count)
+        for monday, (seconds, count) in weekly_totals(user).items()
+        for group_id in group_ids
+    ]
+
+
+def create_group(owner, serializer):
+    """Save the validated ``serializer``'s group with ``owner`` as its first member."""
+    with transaction.atomic():
+        group = serializer.save(owner=owner, invite_code=new_invite_code())
+        join(group, owner)
+    group.refresh_from_db(fields=['member_count'])
+    return group
+
+
+def join(group, user):
+    """Add ``user`` to ``group`` with their past weeks scored. False if already a member."""
+    with transaction.atomic():
+        _, created = StudyGroupMembership.objects.get_or_create(group=group, user=user)
+        if not created:
+            return False
+        StudyGroup.objects.filter(pk=group.pk).update(member_count=F('member_count') + 1)
+        GroupWeeklyScore.objects.bulk_create(_score_rows(user, [group.pk]), batch_size=500)
+    return True
+
+
+def leave(group, user):
+    """Remove ``user`` and their scores from ``group``. False if they weren't a member."""
+    with transaction.atomic():
+        removed, _ = StudyGroupMembership.objects.filter(group=group, user=user).delete()
+        if not removed:
+            return False
+        StudyGroup.objects.filter(pk=group.pk).update(member_count=F('member_count') - 1)
+        GroupWeeklyScore.objects.filter(group=group, user=user).delete()
+    return True
+
+
+def leaderboard(group, monday, user):
+    """
+    The members of ``group`` who studied in the week starting ``monday``,
+    ranked by study time (ties share a rank), and ``user``'s own entry.
+    """
+    entries = []
+    rank = 0
+    previous = None
+    for position, row in enumerate(
+        GroupWeeklyScore.objects.filter(group=group, week=monday, total_seconds__gt=0)
+        .order_by('-total_seconds', 'user_id')
+        .values('user_id', 'user__username', 'total_seconds', 'session_count'),
+        start=1,
+    ):
+        if row['total_seconds'] != previous:
+            rank, previous = position, row['total_seconds']
+        entries.append({
+            'rank': rank,
+            'user_id': row['user_id'],
+            'username': row['user__username'],
+            'total_seconds': row['total_seconds'],
+            'session_count': row['session_count'],
+        })
+    me = next(
+        (entry for entry in entries if entry['user_id'] == user.id),
+        {'rank': None, 'user_id': user.id, 'username': user.username, 'total_seconds': 0, 'session_count': 0},
+    )
+    return {
+        'group': {'id': group.id, 'name': group.name, 'member_count': group.member_count},
+        'week_start': monday.isoformat(),
+        'week_end': (monday + timedelta(days=6)).isoformat(),
+        'entries': entries,
+        'me': me,
+    }
+
+
+def rebuild_scores(user_ids=None):
+    """
+    Recompute the scores of every group member (or of ``user_ids``) from
+    their sessions and archived days. Returns the number of rows written.
+    """
+    memberships = StudyGroupMembership.objects.select_related('user').order_by('user_id')
+    if user_ids is not None:
+        memberships = memberships.filter(user_id__in=user_ids)
+    groups_by_user = defaultdict(list)
+    users = {}
+    for membership in memberships:
+        groups_by_user[membership.user_id].append(membership.group_id)
+        users[membership.user_id] = membership.user
+
+    written = 0
+    for user_id, group_ids in groups_by_user.items():
+        rows = _score_rows(users[user_id], group_ids)
+        with transaction.atomic():
+            GroupWeeklyScore.objects.filter(user_id=user_id, group_id__in=group_ids).delete()
+            GroupWeeklyScore.objects.bulk_create(rows, batch_size=500)
+        written += len(rows)
+    return written
@@ -0,0 +1,103 @@
+"""
+local_dates.py — Home timezones and the stored local date of each session.
+
+Every user has a home timezone (``UserProfile.timezone``, UTC until set),
+and every session stores ``local_date``: its creation date in that
+timezone, stamped whenever it is saved (``stamp``, called from
+``signals.py``). Streaks, today's total and weekly reports default to the
+home timezone, so they no longer shift with whatever timezone the browser
+is in, and in the home timezone they filter and group on the indexed
+``(user, local_date)`` column. Reports for another timezone (an explicit
+``?tz=``) truncate ``created_at`` in SQL instead; neither path converts
+rows in Python.
+
+Changing the home timezone re-dates the user's sessions with one UPDATE
+(``redate``). Sessions written without a date (``bulk_create``, rows older
+than the column) fall back to the SQL truncation until
+``manage.py backfill_local_dates`` stores it; a ``QuerySet.update`` of
+``created_at`` must set ``local_date`` too.
+"""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db.models import Q
+from django.db.models.functions import Coalesce, TruncDate
+
+from .auth_cache import get_profile
+from .models import StudySession, UserProfile
+
+
+def resolve_tz(tz_name):
+    """Return a ZoneInfo for ``tz_name``, falling back to UTC if unknown."""
+    try:
+        return ZoneInfo(tz_name or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo('UTC')
+
+
+def local_day_bounds(day, tz):
+    """Return the aware [start, end) datetimes covering ``day`` in ``tz``."""
+    start = datetime.combine(day, datetime.min.time(), tzinfo=tz)
+    end = datetime.combine(day + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+    return start, end
+
+
+def home_timezone(user):
+    return resolve_tz(get_profile(user)['timezone'])
+
+
+def stamp(session):
+    """Set ``session.local_date`` from its creation time (now, if unsaved) in the owner's home timezone."""
+    created = session.created_at or datetime.now(ZoneInfo('UTC'))
+    session.local_date = created.astimezone(home_timezone(session.user)).date()
+
+
+def request_tz(request):
+    """The timezone named by ``?tz=``, or the requesting user's home timezone."""
+    tz_name = request.query_params.get('tz')
+    return resolve_tz(tz_name) if tz_name else home_timezone(request.user)
+
+
+def session_day(tz, home):
+    """Expression for a session's date in ``tz``; the stored one if ``tz`` is the ``home`` timezone."""
+    truncated = TruncDate('created_at', tzinfo=tz)
+    if tz.key != home.key:
+        return truncated
+    return Coalesce('local_date', truncated)
+
+
+def on_days(first, last, tz, home):
+    """Filter for sessions whose date in ``tz`` is within ``first``..``last``."""
+    start, _ = local_day_bounds(first, tz)
+    _, end = local_day_bounds(last, tz)
+    by_time = Q(created_at__gte=start, created_at__lt=end)
+    if tz.key != home.key:
+        return by_time
+    return Q(local_date__gte=first, local_date__lte=last) | Q(by_time, local_date__isnull=True)
+
+
+def redate(user_ids=None, missing_only=False):
+    """
+    Store every session's date in its owner's current home timezone, one
+    UPDATE per timezone; ``missing_only`` leaves dated sessions alone.
+    Returns the number of sessions updated.
+    """
+    sessions = StudySession.objects.all()
+    profiles = UserProfile.objects.exclude(timezone='')
+    if user_ids is not None:
+        sessions = sessions.filter(user_id__in=user_ids)
+        profiles = profiles.filter(user_id__in=user_ids)
+    if missing_only:
+        sessions = sessions.filter(local_date__isnull=True)
+
+    updated = 0
+    for tz_name in profiles.order_by().values_list('timezone', flat=True).distinct():
+        updated += sessions.filter(user__profile__timezone=tz_name).update(
+            local_date=TruncDate('created_at', tzinfo=resolve_tz(tz_name)),
+        )
+    # Everyone else is on UTC
+    updated += sessions.exclude(user__profile__timezone__gt='').update(
+        local_date=TruncDate('created_at', tzinfo=ZoneInfo('UTC')),
+    )
+    return updated
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.archive import BATCH_SIZE, archive_sessions, cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold sessions older than SESSION_RETENTION_DAYS into per-user, per-subject, "
+        "per-day aggregates and delete the raw rows. Meant to run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='count what would be archived')
+        parser.add_argument(
+            '--export-dir', default=settings.ARCHIVE_EXPORT_DIR,
+            help='also write the raw sessions here as gzipped JSON lines (default: ARCHIVE_EXPORT_DIR)',
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, dry_run=False, export_dir=None, batch_size=BATCH_SIZE, **options):
+        before = cutoff()
+        result = archive_sessions(before, export_dir=export_dir, batch_size=batch_size, dry_run=dry_run)
+        verb = 'would archive' if dry_run else 'archived'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.sessions} session(s) created before {before:%Y-%m-%d %H:%M} '
+            f'into {result.days} day row(s)'
+        ))
+        if result.export_path:
+            self.stdout.write(f'exported to {result.export_path}')
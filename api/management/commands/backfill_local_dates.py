@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api.local_dates import redate
+
+
+class Command(BaseCommand):
+    help = (
+        "Store each session's local date (its creation date in the owner's home timezone) "
+        "where it is missing, e.g. after upgrading or after bulk loads; --all recomputes every date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='recompute dates that are already stored too')
+        parser.add_argument(
+            '--user', action='append', type=int, dest='users', metavar='ID',
+            help='only this user\'s sessions (repeatable)',
+        )
+
+    def handle(self, *args, all=False, users=None, **options):
+        updated = redate(user_ids=users, missing_only=not all)
+        self.stdout.write(self.style.SUCCESS(f'dated {updated} session(s)'))
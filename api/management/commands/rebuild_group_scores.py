@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.leaderboard import rebuild_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute study group leaderboard scores from the session and archive tables, "
+        "e.g. after bulk loads or raw SQL that bypassed the session signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', action='append', type=int, dest='users', metavar='ID',
+            help='only this member\'s scores (repeatable)',
+        )
+
+    def handle(self, *args, users=None, **options):
+        written = rebuild_scores(user_ids=users)
+        self.stdout.write(self.style.SUCCESS(f'wrote {written} group score row(s)'))
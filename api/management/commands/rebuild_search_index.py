@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api.search import install_sqlite_index, rebuild_sqlite_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the SQLite full-text search index (api_search) from topics, subjects "
+        "and session notes. PostgreSQL's generated search columns need no rebuild."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, database=DEFAULT_DB_ALIAS, **options):
+        connection = connections[database]
+        if connection.vendor != 'sqlite':
+            self.stdout.write(f'{connection.vendor}: search vectors are generated columns, nothing to rebuild')
+            return
+        install_sqlite_index(connection)
+        rows = rebuild_sqlite_index(connection)
+        self.stdout.write(self.style.SUCCESS(f'indexed {rows} row(s)'))
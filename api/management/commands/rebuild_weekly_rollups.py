@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.local_dates import resolve_tz
+from api.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the weekly report rollups from the session and archive tables: every "
+        "user/timezone already rolled up, plus all users in each --tz given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tz', action='append', default=[], metavar='ZONE',
+            help='also build every user\'s weeks in this timezone (repeatable), e.g. Asia/Kolkata',
+        )
+
+    def handle(self, *args, tz=(), **options):
+        for name in tz:
+            if resolve_tz(name).key != name:
+                raise CommandError(f'Unknown timezone: {name}')
+        written = rebuild_rollups(tz)
+        self.stdout.write(self.style.SUCCESS(f'wrote {written} weekly rollup row(s)'))
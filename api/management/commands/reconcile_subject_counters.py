@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api.counters import reconcile_subject_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount each subject's topic_count, mastered_count and total_study_seconds "
+        "from its topics and sessions, fixing any that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='report drift without fixing it')
+
+    def handle(self, *args, dry_run=False, **options):
+        drifted = reconcile_subject_counters(dry_run=dry_run)
+        for subject in drifted:
+            self.stdout.write(
+                f'subject {subject.pk}: topics={subject.topic_count} '
+                f'mastered={subject.mastered_count} seconds={subject.total_study_seconds}'
+            )
+        verb = 'would fix' if dry_run else 'fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(drifted)} subject(s)'))
@@ -0,0 +1,46 @@
+"""
+mastery.py — The topic status log behind "topics mastered" in reports.
+
+Every status transition of a topic appends a ``TopicStatusChange`` row
+(``record_status_change``, called from ``signals.py``), with the user and
+the topic's subject at that moment. A week's mastery is then a range read
+on the ``(user, changed_at)`` index: the distinct topics that reached
+``mastered`` in the window, overall and per subject. Renaming a topic or
+changing its difficulty no longer moves it into another week. A topic that
+is mastered, reopened and mastered again counts once per week it was
+mastered in.
+
+Status changes that bypass ``Topic.save`` (``QuerySet.update``, raw SQL)
+aren't logged.
+"""
+
+from collections import defaultdict
+
+from .models import TopicStatusChange
+
+
+def record_status_change(topic, created):
+    """Log ``topic``'s status if it was just created with one or just changed."""
+    loaded_status = '' if created else getattr(topic, 'loaded_status', topic.status)
+    if topic.status == loaded_status or (created and topic.status == 'not_started'):
+        return
+    TopicStatusChange.objects.create(
+        user_id=topic.subject.user_id, topic=topic, subject_id=topic.subject_id,
+        from_status=loaded_status, to_status=topic.status,
+    )
+
+
+def mastery_events(user, start, end):
+    """``(changed_at, topic_id, subject_id)`` of every mastery in [start, end)."""
+    return TopicStatusChange.objects.filter(
+        user=user, to_status='mastered', changed_at__gte=start, changed_at__lt=end,
+    ).order_by().values_list('changed_at', 'topic_id', 'subject_id')
+
+
+def summarize_mastery(events):
+    """``(topics mastered, {subject_id: topics mastered})`` from ``mastery_events`` rows."""
+    by_subject = defaultdict(set)
+    for _, topic_id, subject_id in events:
+        by_subject[subject_id].add(topic_id)
+    total = len({topic_id for _, topic_id, _ in events})
+    return total, {subject_id: len(topics) for subject_id, topics in by_subject.items()}
@@ -0,0 +1,238 @@
+"""
+metrics.py — Per-endpoint request metrics: DB query count, DB time,
+serializer time and total latency, keyed by resolved URL name.
+
+``RequestMetricsMiddleware`` opens a ``RequestMetrics`` for each request in a
+context variable. Queries are counted by an execute wrapper installed on
+every DB connection, and serializer time by ``TimedRepresentationMixin``. The
+context variable follows the request through ``sync_to_async``, so async
+views are measured too.
+
+Each finished request is added to in-process histograms (rendered in the
+Prometheus text format by ``/api/metrics/``) and summarised in a
+``Server-Timing`` header. Every worker process keeps its own histograms;
+Prometheus sums them across scrape targets.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    db_seconds: float = 0.0
+    serializer_seconds: float = 0.0
+    in_serializer: bool = False
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+# ── Collection ────────────────────────────────────────────────────────────────
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@contextmanager
+def serializer_timer():
+    """Count the enclosed time as serializer time (outermost call only)."""
+    metrics = _current.get()
+    if metrics is None or metrics.in_serializer:
+        yield
+        return
+    metrics.in_serializer = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_seconds += time.perf_counter() - started
+        metrics.in_serializer = False
+
+
+class TimedRepresentationMixin:
+    """Serializer mixin: time spent in ``to_representation`` counts as serializer time."""
+
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
+
+
+# ── Histograms ────────────────────────────────────────────────────────────────
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, Prometheus style."""
+
+    def __init__(self, name, help_text, buckets):
+        self.name, self.help_text, self.buckets = name, help_text, buckets
+        self._series = {}  # labels → [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self, label_names):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            base = ','.join(f'{k}="{v}"' for k, v in zip(label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{base}}} {series[-1]:.6f}')
+            lines.append(f'{self.name}_count{{{base}}} {cumulative}')
+        return lines
+
+
+class Registry:
+    LABELS = ('view', 'method')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency = Histogram(
+                'studytracker_request_duration_seconds', 'Total request latency.', LATENCY_BUCKETS)
+            self.db_time = Histogram(
+                'studytracker_db_duration_seconds', 'Time spent in DB queries per request.', LATENCY_BUCKETS)
+            self.serializer_time = Histogram(
+                'studytracker_serializer_duration_seconds', 'Time spent serializing responses.', LATENCY_BUCKETS)
+            self.queries = Histogram(
+                'studytracker_db_queries', 'DB queries per request.', QUERY_BUCKETS)
+            self.responses = {}  # (view, method, status) → count
+
+    def observe(self, view, method, status, metrics, total_seconds):
+        labels = (view, method)
+        with self._lock:
+            self.latency.observe(labels, total_seconds)
+            self.db_time.observe(labels, metrics.db_seconds)
+            self.serializer_time.observe(labels, metrics.serializer_seconds)
+            self.queries.observe(labels, metrics.queries)
+            key = (view, method, status)
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def render(self):
+        with self._lock:
+            lines = [
+                '# HELP studytracker_responses_total Responses by view, method and status.',
+                '# TYPE studytracker_responses_total counter',
+            ]
+            for (view, method, status), count in sorted(self.responses.items()):
+                lines.append(
+                    f'studytracker_responses_total{{view="{view}",method="{method}",status="{status}"}} {count}'
+                )
+            for histogram in (self.latency, self.db_time, self.serializer_time, self.queries):
+                lines += histogram.render(self.LABELS)
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+# ── Middleware ────────────────────────────────────────────────────────────────
+
+def server_timing(metrics, total_seconds):
+    """``Server-Timing`` header value (durations in ms)."""
+    return (
+        f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries", '
+        f'ser;dur={metrics.serializer_seconds * 1000:.1f}, '
+        f'total;dur={total_seconds * 1000:.1f}'
+    )
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures each request; disable with ``REQUEST_METRICS_ENABLED = False``.
+    Sync and async capable, so under ASGI the chain stays async.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics, time.perf_counter() - started)
+
+    def finish(self, request, response, metrics, total):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        registry.observe(view, request.method, response.status_code, metrics, total)
+        response['Server-Timing'] = server_timing(metrics, total)
+        return response
+
+
+def metrics_view(request):
+    """
+    GET /api/metrics/ — Prometheus text exposition of this worker's histograms.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>`` when METRICS_TOKEN is
+    set, otherwise a logged-in staff user.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        allowed = constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    else:
+        allowed = request.user.is_authenticated and request.user.is_staff
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,56 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:03
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    Subject = apps.get_model('api', 'Subject')
+    Topic = apps.get_model('api', 'Topic')
+    StudySession = apps.get_model('api', 'StudySession')
+
+    topics = {
+        row['subject_id']: row
+        for row in Topic.objects.order_by().values('subject_id').annotate(
+            total=Count('id'), mastered=Count('id', filter=Q(status='mastered')),
+        )
+    }
+    seconds = dict(
+        StudySession.objects.exclude(subject=None).order_by().values('subject_id')
+        .annotate(total=Sum('duration_seconds')).values_list('subject_id', 'total')
+    )
+    subjects = list(Subject.objects.all())
+    for subject in subjects:
+        counts = topics.get(subject.id, {})
+        subject.topic_count = counts.get('total', 0)
+        subject.mastered_count = counts.get('mastered', 0)
+        subject.total_study_seconds = seconds.get(subject.id) or 0
+    Subject.objects.bulk_update(
+        subjects, ['topic_count', 'mastered_count', 'total_study_seconds'], batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_daily_goal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='mastered_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='topic_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='total_study_seconds',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+GAP = 1024
+
+
+def number_topics(apps, schema_editor):
+    # Existing topics keep their creation order, GAP apart within each subject
+    Topic = apps.get_model('api', 'Topic')
+    topics, subject_id, position = [], None, 0
+    for topic in Topic.objects.order_by('subject_id', 'created_at', 'id').only('id', 'subject_id').iterator():
+        position = position + GAP if topic.subject_id == subject_id else GAP
+        subject_id = topic.subject_id
+        topic.position = position
+        topics.append(topic)
+    Topic.objects.bulk_update(topics, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_subject_counters'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='topic',
+            options={'ordering': ['subject_id', 'position', 'id']},
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='position',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(number_topics, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(fields=['subject', 'position', 'id'], name='api_topic_subject_position'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:05
+
+from django.db import migrations
+
+# PostgreSQL full-text search (api/search.py): a generated tsvector column and
+# GIN index per searchable table. On SQLite the FTS5 index is installed by
+# api/search.py after migrate instead, because SQLite table rebuilds in later
+# migrations would drop its triggers.
+SEARCH_VECTORS = {
+    'api_topic': "setweight(to_tsvector('english', coalesce(name, '')), 'A')",
+    'api_subject': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ),
+    'api_studysession': "setweight(to_tsvector('english', coalesce(notes, '')), 'B')",
+}
+
+
+def add_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, expression in SEARCH_VECTORS.items():
+        schema_editor.execute(
+            f'ALTER TABLE {table} ADD COLUMN search_vector tsvector '
+            f'GENERATED ALWAYS AS ({expression}) STORED'
+        )
+        schema_editor.execute(f'CREATE INDEX {table}_search ON {table} USING gin (search_vector)')
+
+
+def drop_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_VECTORS:
+        schema_editor.execute(f'ALTER TABLE {table} DROP COLUMN search_vector')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_topic_position'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vectors, drop_search_vectors),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_archived_study_day'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tz', models.CharField(max_length=64)),
+                ('week', models.DateField()),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('total_duration_seconds', models.PositiveBigIntegerField(default=0)),
+                ('unique_subjects_count', models.PositiveIntegerField(default=0)),
+                ('days_studied', models.PositiveSmallIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['user_id', 'tz', 'week'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'tz', 'week'), name='weekly_rollup_user_tz_week')],
+            },
+        ),
+    ]
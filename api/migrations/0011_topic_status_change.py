@@ -0,0 +1,52 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_mastery(apps, schema_editor):
+    # The best record of when today's mastered topics were mastered is their
+    # last edit; history from here on is exact
+    Topic = apps.get_model('api', 'Topic')
+    TopicStatusChange = apps.get_model('api', 'TopicStatusChange')
+    TopicStatusChange.objects.bulk_create(
+        [
+            TopicStatusChange(
+                user_id=user_id, topic_id=topic_id, subject_id=subject_id,
+                from_status='', to_status='mastered', changed_at=updated_at,
+            )
+            for topic_id, subject_id, user_id, updated_at in Topic.objects.filter(status='mastered')
+            .order_by().values_list('id', 'subject_id', 'subject__user_id', 'updated_at').iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_weekly_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, max_length=20)),
+                ('to_status', models.CharField(choices=[('not_started', 'Not Started'), ('in_progress', 'In Progress'), ('mastered', 'Mastered')], max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='topic_status_changes', to='api.subject')),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='api.topic')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='topic_status_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-changed_at'],
+                'indexes': [models.Index(fields=['user', 'changed_at'], name='status_change_user_time_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_mastery, migrations.RunPython.noop),
+    ]
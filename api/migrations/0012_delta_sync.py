@@ -0,0 +1,52 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_topic_status_change'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCursor',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sync_cursor', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SyncBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_id', models.UUIDField()),
+                ('response', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_batches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'batch_id'), name='sync_batch_user_batch')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('subject', 'Subject'), ('topic', 'Topic'), ('session', 'Session')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('version', models.PositiveBigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'version'], name='sync_change_user_version_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='sync_change_object')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_session_client_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studysession',
+            name='local_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='timezone',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['user', 'local_date'], name='session_user_local_date_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_study_groups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['created_at'], name='session_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weeklyrollup',
+            index=models.Index(fields=['tz', 'week'], name='weekly_rollup_tz_week_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_admin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='syncchange',
+            name='sync_change_object',
+        ),
+        migrations.AddConstraint(
+            model_name='syncchange',
+            constraint=models.UniqueConstraint(fields=('user', 'kind', 'object_id'), name='sync_change_user_object'),
+        ),
+    ]
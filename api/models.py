@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class Subject(models.Model):
@@ -11,15 +12,30 @@ class Subject(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, default='')
     color = models.CharField(max_length=7, default='#2563EB')
+    # Denormalized counters, maintained by api/counters.py
+    topic_count = models.PositiveIntegerField(default=0, editable=False)
+    mastered_count = models.PositiveIntegerField(default=0, editable=False)
+    total_study_seconds = models.PositiveBigIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    COUNTER_FIELDS = ('topic_count', 'mastered_count', 'total_study_seconds')
+
     class Meta:
         ordering = ['-created_at']
 
     def __str__(self):
         return f"{self.user.username} — {self.name}"
 
+    def save(self, *args, **kwargs):
+        # Counters only move through F() updates — never write back a stale copy
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class Topic(models.Model):
     STATUS_CHOICES = [
@@ -51,15 +67,75 @@ class Topic(models.Model):
         default='medium',
         blank=True,
     )
+    # Syllabus order within the subject, numbered POSITION_GAP apart (see topic_order.py)
+    position = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    POSITION_GAP = 1024
+
     class Meta:
-        ordering = ['created_at']
+        ordering = ['subject_id', 'position', 'id']
+        indexes = [
+            models.Index(fields=['subject', 'position', 'id'], name='api_topic_subject_position'),
+        ]
 
     def __str__(self):
         return f"{self.subject.name} — {self.name}"
 
+    def save(self, *args, **kwargs):
+        # New topics, and topics moved to another subject, go to the end of the syllabus
+        moved = self.subject_id != getattr(self, 'loaded_subject_id', self.subject_id)
+        if (self._state.adding and not self.position) or moved:
+            last = Topic.objects.filter(subject_id=self.subject_id).aggregate(last=models.Max('position'))
+            self.position = (last['last'] or 0) + self.POSITION_GAP
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'position'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember what was loaded so counter updates know what changed on save
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_status = instance.__dict__.get('status')
+        instance.loaded_subject_id = instance.__dict__.get('subject_id')
+        return instance
+
+
+class TopicStatusChange(models.Model):
+    """
+    Append-only log of topic status transitions, written on every status
+    change (see mastery.py). Reports count mastery from here instead of
+    from ``Topic.updated_at``, which any later edit moves.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='topic_status_changes',
+    )
+    topic = models.ForeignKey(
+        Topic,
+        on_delete=models.CASCADE,
+        related_name='status_changes',
+    )
+    subject = models.ForeignKey(  # the topic's subject at the time of the change
+        Subject,
+        on_delete=models.CASCADE,
+        related_name='topic_status_changes',
+    )
+    from_status = models.CharField(max_length=20, blank=True)  # '' when created with a status
+    to_status = models.CharField(max_length=20, choices=Topic.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-changed_at']
+        indexes = [
+            models.Index(fields=['user', 'changed_at'], name='status_change_user_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic_id}: {self.from_status or '—'} → {self.to_status} at {self.changed_at}"
+
 
 class StudySession(models.Model):
     user = models.ForeignKey(
@@ -85,11 +161,243 @@ class StudySession(models.Model):
     end_time = models.DateTimeField()
     duration_seconds = models.PositiveIntegerField()
     notes = models.TextField(blank=True, default='')
+    # Generated by the client once per recorded session, so retries of the
+    # same create are deduplicated (see idempotency.py)
+    client_id = models.UUIDField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # created_at's date in the owner's home timezone (see local_dates.py)
+    local_date = models.DateField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serves every per-user date-window query (today's total, week reports)
+            models.Index(fields=['user', 'created_at'], name='session_user_created_idx'),
+            # Date-bucketed queries in the home timezone (streaks, today, weeks)
+            models.Index(fields=['user', 'local_date'], name='session_user_local_date_idx'),
+            # The admin changelist's default order and date hierarchy, across users
+            models.Index(fields=['created_at'], name='session_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], name='session_user_client_id'),
+        ]
 
     def __str__(self):
         mins = self.duration_seconds // 60
         return f"{self.user.username} — {mins}m — {self.created_at.date()}"
+
+
+class ArchivedStudyDay(models.Model):
+    """
+    Sessions older than the retention window, folded into one row per user,
+    subject and day (see archive.py). Reports and streaks read these
+    alongside the raw sessions that are still in ``StudySession``.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_days',
+    )
+    subject = models.ForeignKey(
+        Subject,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_days',
+    )
+    day = models.DateField()  # date of created_at in TIME_ZONE
+    session_count = models.PositiveIntegerField(default=0)
+    total_seconds = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        indexes = [
+            models.Index(fields=['user', 'day'], name='archived_day_user_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} — {self.day} — {self.session_count} session(s)"
+
+
+class WeeklyRollup(models.Model):
+    """
+    A user's session totals for one local Mon–Sun week in one timezone,
+    kept current on every session write (see rollups.py).
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='weekly_rollups',
+    )
+    tz = models.CharField(max_length=64)
+    week = models.DateField()  # local Monday
+    session_count = models.PositiveIntegerField(default=0)
+    total_duration_seconds = models.PositiveBigIntegerField(default=0)
+    unique_subjects_count = models.PositiveIntegerField(default=0)
+    days_studied = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['user_id', 'tz', 'week']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'tz', 'week'], name='weekly_rollup_user_tz_week'),
+        ]
+        indexes = [
+            # Platform-wide weekly totals (usage.py)
+            models.Index(fields=['tz', 'week'], name='weekly_rollup_tz_week_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} — week of {self.week} ({self.tz})"
+
+
+class UserProfile(models.Model):
+    """Per-user settings that must follow the user across devices."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='profile',
+    )
+    daily_goal_minutes = models.PositiveIntegerField(null=True, blank=True)
+    # IANA name; blank means UTC. Sessions are dated in it (see local_dates.py)
+    timezone = models.CharField(max_length=64, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} — profile"
+
+
+class SyncCursor(models.Model):
+    """The last version handed out to a user's ``SyncChange`` rows (see sync.py)."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='sync_cursor',
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user.username} — v{self.version}"
+
+
+class SyncChange(models.Model):
+    """
+    The latest change to one subject, topic or session, for delta sync
+    (see sync.py). One row per object and owner, rewritten on every change
+    with the next version from the owner's ``SyncCursor``; ``deleted`` rows
+    are tombstones. The owner is part of the key so one user's write can
+    never rewrite another user's row.
+    """
+    KIND_CHOICES = [
+        ('subject', 'Subject'),
+        ('topic', 'Topic'),
+        ('session', 'Session'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='sync_changes',
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    version = models.PositiveBigIntegerField()
+    deleted = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'kind', 'object_id'], name='sync_change_user_object'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'version'], name='sync_change_user_version_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} v{self.version}{' (deleted)' if self.deleted else ''}"
+
+
+class SyncBatch(models.Model):
+    """An applied ``POST /api/sync/`` batch and its response, replayed on retry."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='sync_batches',
+    )
+    batch_id = models.UUIDField()
+    response = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'batch_id'], name='sync_batch_user_batch'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} — batch {self.batch_id}"
+
+
+class StudyGroup(models.Model):
+    """A cohort whose members compare weekly study time (see leaderboard.py)."""
+    name = models.CharField(max_length=200)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='owned_study_groups',
+    )
+    invite_code = models.CharField(max_length=16, unique=True, editable=False)
+    # Denormalized, maintained by api/leaderboard.py
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.member_count} member(s))"
+
+
+class StudyGroupMembership(models.Model):
+    group = models.ForeignKey(StudyGroup, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='study_group_memberships',
+    )
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['group', 'user'], name='study_group_member'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} in {self.group.name}"
+
+
+class GroupWeeklyScore(models.Model):
+    """
+    A member's study time for one week (the Monday of their home-timezone
+    dates) in one group, incremented on every session write (see
+    leaderboard.py). The (group, week, -total_seconds, user) index serves the
+    ranked leaderboard without sorting.
+    """
+    group = models.ForeignKey(StudyGroup, on_delete=models.CASCADE, related_name='weekly_scores')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='group_weekly_scores',
+    )
+    week = models.DateField()  # local Monday
+    total_seconds = models.PositiveBigIntegerField(default=0)
+    session_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['group', 'week', 'user'], name='group_score_group_week_user'),
+        ]
+        indexes = [
+            models.Index(fields=['group', 'week', '-total_seconds', 'user'], name='group_score_ranking_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} — {self.group.name} — week of {self.week}"
@@ -0,0 +1,42 @@
+"""
+realtime.py — Fan-out of "your stats changed" events to live WebSocket clients.
+
+Writes (sessions, topics, syllabus imports) call ``notify_stats_changed`` with
+the owning user's id. Once the surrounding transaction commits, a message is
+sent to that user's channel-layer group, and every connected
+``StatsConsumer`` recomputes its snapshot and pushes the delta.
+"""
+
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def stats_group_name(user_id):
+    """Channel-layer group that every socket of ``user_id`` joins."""
+    return f'stats.user.{user_id}'
+
+
+def _send_stats_changed(user_id):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(
+            stats_group_name(user_id),
+            {'type': 'stats.changed'},
+        )
+    except Exception as exc:
+        # Live updates are best-effort — never fail the write that triggered them
+        logger.warning("Could not publish stats change for user %s: %s", user_id, exc)
+
+
+def notify_stats_changed(user_id):
+    """Tell ``user_id``'s live clients to refresh, after the current transaction commits."""
+    if user_id is None:
+        return
+    transaction.on_commit(lambda: _send_stats_changed(user_id))
@@ -0,0 +1,191 @@
+"""
+rollups.py — Precomputed weekly totals behind the multi-week report.
+
+``WeeklyRollup`` holds one row per user, timezone and local week: session
+count, seconds, distinct subjects and days studied, i.e. the session half
+of the weekly report. ``range_report`` serves a span of weeks from these
+rows, computing (and storing) only the weeks that have no row yet, with a
+single query over their span. A semester report after the first view costs
+one indexed read instead of one session scan per week.
+
+Every session save or delete recomputes the stored weeks that contain it
+(``session_changed``, called from ``signals.py``), in the writer's
+transaction and with those rows locked, so concurrent writes to the same
+week serialize instead of overwriting each other's totals. The session's
+week in ``TIME_ZONE`` is always stored, which keeps the platform usage
+dashboard (usage.py) complete. Writes that bypass signals (bulk loads, raw
+SQL) leave rollups stale until ``manage.py rebuild_weekly_rollups``.
+
+Topics mastered per week come from the status log (mastery.py) at read time.
+"""
+
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import TruncDate
+
+from .archive import archived_through
+from .mastery import mastery_events, summarize_mastery
+from .models import ArchivedStudyDay, StudySession, WeeklyRollup
+from .stats import current_monday, summarize_week, week_bounds
+
+ROLLUP_FIELDS = ('session_count', 'total_duration_seconds', 'unique_subjects_count', 'days_studied')
+
+MAX_WEEKS = 104
+
+# UTC offsets span -12:00 to +14:00: a session's local week starts on one of
+# the Mondays of its UTC date shifted this far either way
+MAX_UTC_OFFSET = timedelta(hours=14)
+
+
+def week_monday(day):
+    return day - timedelta(days=day.weekday())
+
+
+def compute_weeks(user_id, mondays, tz):
+    """``{monday: rollup field values}`` for ``mondays``, from one scan of their span."""
+    first, last = min(mondays), max(mondays)
+    start, _ = week_bounds(first, tz)
+    _, end = week_bounds(last, tz)
+    sessions = defaultdict(list)
+    for row in (
+        StudySession.objects.filter(user_id=user_id, created_at__gte=start, created_at__lt=end)
+        .order_by().annotate(day=TruncDate('created_at', tzinfo=tz))
+        .values_list('day', 'duration_seconds', 'subject_id')
+    ):
+        sessions[week_monday(row[0])].append(row)
+    archived = defaultdict(list)
+    if first <= archived_through():
+        for row in (
+            ArchivedStudyDay.objects.filter(user_id=user_id, day__gte=first, day__lt=last + timedelta(days=7))
+            .order_by().values_list('day', 'session_count', 'total_seconds', 'subject_id')
+        ):
+            archived[week_monday(row[0])].append(row)
+
+    weeks = {}
+    for monday in mondays:
+        summary = summarize_week(monday, sessions[monday], (), archived[monday])
+        weeks[monday] = {field: summary[field] for field in ROLLUP_FIELDS}
+    return weeks
+
+
+def session_changed(session):
+    """Recompute the stored weeks, in every timezone, that contain ``session``, storing its ``TIME_ZONE`` week."""
+    created = session.created_at.astimezone(dt_timezone.utc)
+    candidates = {
+        week_monday((created + shift).date()) for shift in (-MAX_UTC_OFFSET, timedelta(), MAX_UTC_OFFSET)
+    }
+    platform_tz = ZoneInfo(settings.TIME_ZONE)
+    with transaction.atomic():
+        # Zeros until the loop below recomputes it
+        WeeklyRollup.objects.bulk_create(
+            [WeeklyRollup(user_id=session.user_id, tz=platform_tz.key,
+                          week=week_monday(session.created_at.astimezone(platform_tz).date()))],
+            ignore_conflicts=True,
+        )
+        rollups = WeeklyRollup.objects.select_for_update().filter(
+            user_id=session.user_id, week__in=candidates,
+        ).order_by()
+        for rollup in rollups:
+            tz = ZoneInfo(rollup.tz)
+            if week_monday(session.created_at.astimezone(tz).date()) != rollup.week:
+                continue
+            for field, value in compute_weeks(rollup.user_id, [rollup.week], tz)[rollup.week].items():
+                setattr(rollup, field, value)
+            rollup.save(update_fields=ROLLUP_FIELDS)
+
+
+def mastered_by_week(user, first, last, tz):
+    """``{monday: mastery_events rows}`` for the weeks ``first``..``last``, from one range read."""
+    start, _ = week_bounds(first, tz)
+    _, end = week_bounds(last, tz)
+    events = defaultdict(list)
+    for event in mastery_events(user, start, end):
+        events[week_monday(event[0].astimezone(tz).date())].append(event)
+    return events
+
+
+def range_report(user, first, last, tz):
+    """Weekly report payloads for the local weeks starting ``first`` through ``last``, plus totals."""
+    mondays = [first + timedelta(weeks=i) for i in range((last - first).days // 7 + 1)]
+    stored = {
+        row.pop('week'): row
+        for row in WeeklyRollup.objects.filter(
+            user=user, tz=tz.key, week__gte=first, week__lte=last,
+        ).values('week', *ROLLUP_FIELDS)
+    }
+    missing = [monday for monday in mondays if monday not in stored]
+    if missing:
+        computed = compute_weeks(user.id, missing, tz)
+        WeeklyRollup.objects.bulk_create(
+            [WeeklyRollup(user=user, tz=tz.key, week=monday, **values)
+             for monday, values in computed.items()],
+            batch_size=500, ignore_conflicts=True,
+        )
+        stored.update(computed)
+
+    mastered = mastered_by_week(user, first, last, tz)
+    weeks = []
+    for monday in mondays:
+        mastered_count, mastered_by_subject = summarize_mastery(mastered[monday])
+        weeks.append({
+            'week_start': monday.isoformat(),
+            'week_end': (monday + timedelta(days=6)).isoformat(),
+            **stored[monday],
+            'topics_mastered_count': mastered_count,
+            'topics_mastered_by_subject': mastered_by_subject,
+        })
+    return {
+        'from_week': first.isoformat(),
+        'to_week': (last + timedelta(days=6)).isoformat(),
+        'weeks': weeks,
+        'totals': {
+            'total_duration_seconds': sum(w['total_duration_seconds'] for w in weeks),
+            'session_count': sum(w['session_count'] for w in weeks),
+            'topics_mastered_count': sum(w['topics_mastered_count'] for w in weeks),
+            'days_studied': sum(w['days_studied'] for w in weeks),
+            'weeks_studied': sum(1 for w in weeks if w['session_count']),
+        },
+    }
+
+
+def rebuild_rollups(tz_names=()):
+    """
+    Recreate the rollups from the session and archive tables: every
+    user/timezone pair already stored, plus every user with sessions in each
+    of ``tz_names``, from the user's first session through the current week.
+    Returns the number of rows written.
+    """
+    pairs = set(WeeklyRollup.objects.order_by().values_list('user_id', 'tz').distinct())
+    if tz_names:
+        users = set(StudySession.objects.order_by().values_list('user_id', flat=True).distinct())
+        users.update(ArchivedStudyDay.objects.order_by().values_list('user_id', flat=True).distinct())
+        pairs.update((user_id, tz_name) for user_id in users for tz_name in tz_names)
+
+    written = 0
+    for user_id, tz_name in sorted(pairs):
+        tz = ZoneInfo(tz_name)
+        first_dates = [
+            created.astimezone(tz).date() for created in
+            StudySession.objects.filter(user_id=user_id).order_by('created_at')
+            .values_list('created_at', flat=True)[:1]
+        ]
+        first_dates += (
+            ArchivedStudyDay.objects.filter(user_id=user_id).order_by('day').values_list('day', flat=True)[:1]
+        )
+        last = current_monday(tz)
+        first = week_monday(min(first_dates, default=last))
+        mondays = [first + timedelta(weeks=i) for i in range((last - first).days // 7 + 1)]
+        with transaction.atomic():
+            WeeklyRollup.objects.filter(user_id=user_id, tz=tz_name).delete()
+            computed = compute_weeks(user_id, mondays, tz)
+            WeeklyRollup.objects.bulk_create(
+                [WeeklyRollup(user_id=user_id, tz=tz_name, week=monday, **values)
+                 for monday, values in computed.items()],
+                batch_size=500,
+            )
+        written += len(computed)
+    return written
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .consumers import StatsConsumer
+
+websocket_urlpatterns = [
+    path('ws/stats/', StatsConsumer.as_asgi(), name='ws-stats'),
+]
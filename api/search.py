@@ -0,0 +1,195 @@
+"""
+search.py — Full-text search over a user's topics, subjects and session notes.
+
+PostgreSQL: each table has a generated ``search_vector`` tsvector column
+(names weighted above descriptions/notes) with a GIN index, added by
+migration 0008; the database keeps it current on every write.
+
+SQLite: one FTS5 table, ``api_search``, holds a row per topic, subject and
+session with notes, kept current by triggers on the three tables. Each row's
+rowid encodes its kind and id so triggers update it by rowid, and an indexed
+``owner`` token (``u<user id>``) lets the MATCH itself narrow to one user.
+Django rebuilds SQLite tables on many schema changes, which drops their
+triggers, so the table and triggers are (re)installed after every
+``migrate`` and the index is rebuilt whenever triggers had to be recreated.
+``manage.py rebuild_search_index`` rebuilds it by hand.
+
+Queries match every word as a prefix (``alg lin`` finds "Linear Algebra")
+and are ranked with ``ts_rank`` / ``bm25``.
+"""
+
+import re
+
+from django.db import connection as default_connection
+
+from .models import Subject
+
+MAX_RESULTS = 50
+MAX_TERMS = 8
+
+# rowid = object id * KIND_SLOTS + kind code
+KIND_SLOTS = 4
+KIND_CODES = {'topic': 1, 'subject': 2, 'session': 3}
+
+# column weights for bm25(): kind, owner, subject_id, title, body
+BM25_WEIGHTS = '0, 0, 0, 10.0, 1.0'
+
+SQLITE_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS api_search USING fts5(
+    kind UNINDEXED, owner, subject_id UNINDEXED, title, body,
+    tokenize = 'porter unicode61'
+)
+"""
+
+# Per kind: source table, indexed columns (owner, subject_id, title, body) as
+# expressions over the row alias ``{row}``, and an optional join and filter
+SQLITE_SOURCES = {
+    'topic': (
+        'api_topic',
+        "'u' || s.user_id, {row}.subject_id, {row}.name, ''",
+        'api_subject s', 's.id = {row}.subject_id',
+    ),
+    'subject': (
+        'api_subject',
+        "'u' || {row}.user_id, {row}.id, {row}.name, {row}.description",
+        None, None,
+    ),
+    'session': (
+        'api_studysession',
+        "'u' || {row}.user_id, {row}.subject_id, '', {row}.notes",
+        None, "{row}.notes <> ''",
+    ),
+}
+# Columns whose update re-indexes the row
+SQLITE_WATCHED = {'topic': 'name, subject_id', 'subject': 'name, description', 'session': 'notes, subject_id'}
+
+SQLITE_INSERT = 'INSERT INTO api_search (rowid, kind, owner, subject_id, title, body) '
+
+
+def _sqlite_rows(kind, row, from_table=False):
+    """SELECT producing api_search rows for a trigger's NEW row, or every row of the table."""
+    table, columns, join, condition = SQLITE_SOURCES[kind]
+    sql = f"SELECT {row}.id * {KIND_SLOTS} + {KIND_CODES[kind]}, '{kind}', {columns.format(row=row)}"
+    if from_table:
+        sql += f' FROM {table} {row}'
+        if join:
+            return sql + f' JOIN {join} ON {condition.format(row=row)}'
+    elif join:
+        sql += f' FROM {join}'
+    if condition:
+        sql += f' WHERE {condition.format(row=row)}'
+    return sql
+
+
+def sqlite_triggers():
+    """``{trigger name: CREATE TRIGGER statement}`` keeping api_search in sync."""
+    triggers = {}
+    for kind, (table, *_) in SQLITE_SOURCES.items():
+        insert_new = SQLITE_INSERT + _sqlite_rows(kind, 'NEW')
+        delete_old = f'DELETE FROM api_search WHERE rowid = OLD.id * {KIND_SLOTS} + {KIND_CODES[kind]}'
+        triggers[f'api_search_{kind}_insert'] = f'AFTER INSERT ON {table} BEGIN {insert_new}; END'
+        triggers[f'api_search_{kind}_update'] = (
+            f'AFTER UPDATE OF {SQLITE_WATCHED[kind]} ON {table} BEGIN {delete_old}; {insert_new}; END'
+        )
+        triggers[f'api_search_{kind}_delete'] = f'AFTER DELETE ON {table} BEGIN {delete_old}; END'
+    return {name: f'CREATE TRIGGER {name} {body}' for name, body in triggers.items()}
+
+
+def install_sqlite_index(connection=default_connection):
+    """Create api_search and any missing triggers; rebuild the index if any were missing."""
+    with connection.cursor() as cursor:
+        cursor.execute(SQLITE_TABLE)
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'api_search_%'")
+        existing = {name for (name,) in cursor.fetchall()}
+        missing = [name for name in sqlite_triggers() if name not in existing]
+        for name in missing:
+            cursor.execute(sqlite_triggers()[name])
+    if missing:
+        rebuild_sqlite_index(connection)
+    return missing
+
+
+def rebuild_sqlite_index(connection=default_connection):
+    """Repopulate api_search from the source tables; returns the number of rows indexed."""
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM api_search')
+        for kind in SQLITE_SOURCES:
+            cursor.execute(SQLITE_INSERT + _sqlite_rows(kind, 'r', from_table=True))
+        cursor.execute('SELECT count(*) FROM api_search')
+        return cursor.fetchone()[0]
+
+
+# ── Querying ──────────────────────────────────────────────────────────────────
+
+def search_terms(query):
+    """Words of ``query`` to match as prefixes, at most MAX_TERMS."""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def _search_sqlite(user_id, terms, limit, connection):
+    match = f'owner:u{user_id} AND ' + ' AND '.join(f'"{term}"*' for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT kind, rowid / {KIND_SLOTS}, subject_id, title, body, '
+            f'-bm25(api_search, {BM25_WEIGHTS}) AS score '
+            'FROM api_search WHERE api_search MATCH %s ORDER BY score DESC LIMIT %s',
+            [match, limit],
+        )
+        return cursor.fetchall()
+
+
+POSTGRES_QUERY = """
+SELECT 'topic', t.id, t.subject_id, t.name, '', ts_rank(t.search_vector, q.query) AS score
+  FROM api_topic t JOIN api_subject s ON s.id = t.subject_id, q
+ WHERE s.user_id = %(user)s AND t.search_vector @@ q.query
+UNION ALL
+SELECT 'subject', s.id, s.id, s.name, s.description, ts_rank(s.search_vector, q.query)
+  FROM api_subject s, q
+ WHERE s.user_id = %(user)s AND s.search_vector @@ q.query
+UNION ALL
+SELECT 'session', ss.id, ss.subject_id, '', ss.notes, ts_rank(ss.search_vector, q.query)
+  FROM api_studysession ss, q
+ WHERE ss.user_id = %(user)s AND ss.search_vector @@ q.query
+ORDER BY score DESC
+LIMIT %(limit)s
+"""
+
+
+def _search_postgres(user_id, terms, limit, connection):
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "WITH q AS (SELECT to_tsquery('english', %(tsquery)s) AS query) " + POSTGRES_QUERY,
+            {'tsquery': tsquery, 'user': user_id, 'limit': limit},
+        )
+        return cursor.fetchall()
+
+
+def search(user, query, limit=20, connection=default_connection):
+    """
+    Ranked matches for ``query`` among ``user``'s topics, subjects and
+    session notes, best first.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    limit = max(1, min(limit, MAX_RESULTS))
+    run = _search_postgres if connection.vendor == 'postgresql' else _search_sqlite
+    rows = run(user.pk, terms, limit, connection)
+
+    subject_names = dict(
+        Subject.objects.filter(pk__in={row[2] for row in rows if row[2] is not None})
+        .values_list('pk', 'name')
+    ) if rows else {}
+    return [
+        {
+            'type': kind,
+            'id': object_id,
+            'subject': subject_id,
+            'subject_name': subject_names.get(subject_id),
+            'title': title,
+            'text': body,
+            'rank': round(score, 4),
+        }
+        for kind, object_id, subject_id, title, body, score in rows
+    ]
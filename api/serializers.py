@@ -1,41 +1,32 @@
 from rest_framework import serializers
-from .models import Subject, Topic, StudySession
+from .local_dates import resolve_tz
+from .metrics import TimedRepresentationMixin
+from .models import Subject, Topic, StudySession, StudyGroup, UserProfile
 
 
-class SubjectSerializer(serializers.ModelSerializer):
-    topic_count = serializers.SerializerMethodField()
-    mastered_count = serializers.SerializerMethodField()
-
+class SubjectSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = Subject
         fields = [
             'id', 'name', 'description', 'color',
-            'topic_count', 'mastered_count',
+            # Denormalized counters, kept current by api/counters.py
+            'topic_count', 'mastered_count', 'total_study_seconds',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = [
+            'id', 'topic_count', 'mastered_count', 'total_study_seconds',
             'created_at', 'updated_at',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
-
-    def get_topic_count(self, obj):
-        try:
-            return obj.topics.count()
-        except Exception:
-            return 0
-
-    def get_mastered_count(self, obj):
-        try:
-            return obj.topics.filter(status='mastered').count()
-        except Exception:
-            return 0
 
 
-class TopicSerializer(serializers.ModelSerializer):
+class TopicSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = Topic
-        fields = ['id', 'subject', 'name', 'status', 'difficulty', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'subject', 'name', 'status', 'difficulty', 'position', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'position', 'created_at', 'updated_at']
 
 
-class StudySessionSerializer(serializers.ModelSerializer):
+class StudySessionSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     # Read-only denormalized fields so frontend doesn't need extra lookups
     subject_name = serializers.SerializerMethodField()
     topic_name = serializers.SerializerMethodField()
@@ -46,12 +37,52 @@ class StudySessionSerializer(serializers.ModelSerializer):
             'id', 'subject', 'topic',
             'subject_name', 'topic_name',
             'start_time', 'end_time', 'duration_seconds',
-            'notes', 'created_at',
+            'notes', 'client_id', 'created_at',
         ]
         read_only_fields = ['id', 'subject_name', 'topic_name', 'created_at']
 
+    def get_fields(self):
+        # Only the requesting user's subjects and topics can be referenced:
+        # a session writes to its subject's counters, scores and sync log
+        fields = super().get_fields()
+        request = self.context.get('request')
+        user = request.user if request is not None else None
+        fields['subject'].queryset = Subject.objects.filter(user=user) if user else Subject.objects.none()
+        fields['topic'].queryset = Topic.objects.filter(subject__user=user) if user else Topic.objects.none()
+        return fields
+
     def get_subject_name(self, obj):
         return obj.subject.name if obj.subject else None
 
     def get_topic_name(self, obj):
         return obj.topic.name if obj.topic else None
+
+
+class DailyGoalSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    daily_goal_minutes = serializers.IntegerField(
+        min_value=1, max_value=24 * 60, allow_null=True,
+    )
+
+    class Meta:
+        model = UserProfile
+        fields = ['daily_goal_minutes']
+
+
+class HomeTimezoneSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    timezone = serializers.CharField(max_length=64)
+
+    class Meta:
+        model = UserProfile
+        fields = ['timezone']
+
+    def validate_timezone(self, value):
+        if resolve_tz(value).key != value:
+            raise serializers.ValidationError('Unknown timezone; use an IANA name such as "Asia/Kolkata".')
+        return value
+
+
+class StudyGroupSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    class Meta:
+        model = StudyGroup
+        fields = ['id', 'name', 'owner', 'invite_code', 'member_count', 'created_at']
+        read_only_fields = ['id', 'owner', 'invite_code', 'member_count', 'created_at']
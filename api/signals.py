@@ -0,0 +1,128 @@
+"""
+Signal receivers that keep subject counters, weekly rollups, study group
+scores, the topic status log, the sync change log, session local dates,
+live dashboards, the auth cache and the SQLite search index in sync.
+
+Bulk operations (``bulk_create``/``update``) bypass these — callers that use
+them must update ``counters`` and ``sync`` and call ``notify_stats_changed``
+themselves.
+"""
+
+from allauth.account.signals import user_logged_in
+from allauth.socialaccount.models import SocialAccount
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from . import counters, leaderboard, local_dates, mastery, rollups, sync
+from .auth_cache import invalidate_user, refresh_profile
+from .models import Subject, Topic, StudySession, UserProfile
+from .realtime import notify_stats_changed
+from .search import install_sqlite_index
+
+
+@receiver(pre_save, sender=StudySession)
+def session_dated(sender, instance, **kwargs):
+    local_dates.stamp(instance)
+
+
+@receiver(post_save, sender=StudySession)
+def session_saved(sender, instance, created, **kwargs):
+    if created:
+        counters.session_added(instance)
+        leaderboard.session_added(instance)
+    rollups.session_changed(instance)
+    sync.record(instance.user_id, {'session': [instance.pk], 'subject': [instance.subject_id]})
+    notify_stats_changed(instance.user_id)
+
+
+def _cascades_from(origin, *models):
+    """Whether a delete started at one of ``models``: an instance, or a queryset as admin bulk actions delete."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(post_delete, sender=StudySession)
+def session_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting the account — the counters, scores, rollups and change log
+    # this would update go with the user
+    if _cascades_from(origin, User):
+        return
+    counters.session_deleted(instance)
+    leaderboard.session_deleted(instance)
+    rollups.session_changed(instance)
+    sync.record(instance.user_id, {'subject': [instance.subject_id]}, {'session': [instance.pk]})
+
+
+@receiver(post_save, sender=Topic)
+def topic_saved(sender, instance, created, **kwargs):
+    mastery.record_status_change(instance, created)  # before counters resets loaded_status
+    subject_ids = {instance.subject_id, getattr(instance, 'loaded_subject_id', instance.subject_id)}
+    counters.topic_saved(instance, created)
+    sync.record(instance.subject.user_id, {'topic': [instance.pk], 'subject': subject_ids})
+    notify_stats_changed(instance.subject.user_id)
+
+
+@receiver(post_delete, sender=Topic)
+def topic_deleted(sender, instance, origin=None, **kwargs):
+    # Cascading from a subject delete — the counters go with the subject, and
+    # subject_deleted sends one event for all; or from the account's
+    if _cascades_from(origin, Subject, User):
+        return
+    counters.topic_deleted(instance)
+    sync.record(instance.subject.user_id, {'subject': [instance.subject_id]}, {'topic': [instance.pk]})
+    notify_stats_changed(instance.subject.user_id)
+
+
+@receiver(post_save, sender=Subject)
+def subject_saved(sender, instance, **kwargs):
+    sync.record(instance.user_id, {'subject': [instance.pk]})
+
+
+@receiver(post_delete, sender=Subject)
+def subject_deleted(sender, instance, origin=None, **kwargs):
+    if _cascades_from(origin, User):
+        return
+    sync.record(instance.user_id, deleted={'subject': [instance.pk]})
+    notify_stats_changed(instance.user_id)
+
+
+# ── Auth cache ────────────────────────────────────────────────────────────────
+
+@receiver(user_logged_in)
+def warm_profile_on_login(sender, request, user, **kwargs):
+    refresh_profile(user)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.id)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    # Home timezone
+    invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=SocialAccount)
+@receiver(post_delete, sender=SocialAccount)
+def social_account_changed(sender, instance, **kwargs):
+    # New avatar or disconnected GitHub account
+    invalidate_user(instance.user_id)
+
+
+# ── Search index ──────────────────────────────────────────────────────────────
+
+@receiver(post_migrate)
+def search_index_installed(sender, app_config, using='default', **kwargs):
+    # Re-create the FTS5 table and triggers that SQLite table rebuilds drop
+    connection = connections[using]
+    if app_config.label != 'api' or connection.vendor != 'sqlite':
+        return
+    if Topic._meta.db_table in connection.introspection.table_names():  # not migrated to zero
+        install_sqlite_index(connection)
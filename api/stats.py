@@ -0,0 +1,212 @@
+"""
+stats.py — Per-user study statistics shared by the REST views and the
+live stats WebSocket.
+
+Every function takes the user and the timezone the caller wants local dates
+computed in, so the HTTP endpoints (``?tz=``, by default the user's home
+timezone) and socket connections agree. Sessions are bucketed into dates in
+SQL, on the stored ``local_date`` in the home timezone (see local_dates.py).
+
+Sessions past the retention window live on as ``ArchivedStudyDay`` rows
+(see archive.py). Streaks and weekly reports only read that tier when they
+reach back to a day that may have been archived.
+"""
+
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.db.models import Sum
+
+from .archive import archived_through
+from .local_dates import home_timezone, local_day_bounds, on_days, session_day
+from .mastery import mastery_events, summarize_mastery
+from .models import ArchivedStudyDay, Subject, StudySession, UserProfile
+
+
+def streak_from_dates(local_dates, today):
+    """
+    Return ``(streak, studied_today)`` from the set of local dates with a session.
+
+    The streak is still alive if the user studied yesterday but not yet today.
+    """
+    studied_today = today in local_dates
+
+    streak = 0
+    check = today if studied_today else today - timedelta(days=1)
+    for d in sorted(local_dates, reverse=True):
+        if d == check:
+            streak += 1
+            check -= timedelta(days=1)
+        elif d < check:
+            break
+    return streak, studied_today
+
+
+def _archived_dates(user):
+    return ArchivedStudyDay.objects.filter(user=user).order_by().values_list('day', flat=True).distinct()
+
+
+def _streak_reaches_archive(streak, studied_today, today):
+    # The first day without a session, going back from the streak's start
+    gap = (today if studied_today else today - timedelta(days=1)) - timedelta(days=streak)
+    return gap <= archived_through()
+
+
+def _session_dates(user, tz, home):
+    return (
+        StudySession.objects.filter(user=user).order_by()
+        .annotate(day=session_day(tz, home)).values_list('day', flat=True).distinct()
+    )
+
+
+def compute_streak(user, tz):
+    """Return ``(streak, studied_today)`` for ``user``; a day counts if it has any session."""
+    local_dates = set(_session_dates(user, tz, home_timezone(user)))
+    today = datetime.now(tz).date()
+    streak, studied_today = streak_from_dates(local_dates, today)
+    if _streak_reaches_archive(streak, studied_today, today):
+        local_dates.update(_archived_dates(user))
+        streak, studied_today = streak_from_dates(local_dates, today)
+    return streak, studied_today
+
+
+async def acompute_streak(user, tz):
+    """Async-ORM twin of ``compute_streak`` for views served under ASGI."""
+    home = await sync_to_async(home_timezone)(user)
+    local_dates = {day async for day in _session_dates(user, tz, home)}
+    today = datetime.now(tz).date()
+    streak, studied_today = streak_from_dates(local_dates, today)
+    if _streak_reaches_archive(streak, studied_today, today):
+        local_dates.update([day async for day in _archived_dates(user)])
+        streak, studied_today = streak_from_dates(local_dates, today)
+    return streak, studied_today
+
+
+def today_seconds(user, tz):
+    """Total seconds studied by ``user`` on today's local date."""
+    today = datetime.now(tz).date()
+    total = StudySession.objects.filter(
+        on_days(today, today, tz, home_timezone(user)), user=user,
+    ).aggregate(total=Sum('duration_seconds'))['total']
+    return total or 0
+
+
+def week_bounds(monday, tz):
+    """Aware [start, end) datetimes from Monday 00:00 to the next Monday 00:00 in ``tz``."""
+    start, _ = local_day_bounds(monday, tz)
+    _, end = local_day_bounds(monday + timedelta(days=6), tz)
+    return start, end
+
+
+def _week_querysets(user, monday, tz, home):
+    start, end = week_bounds(monday, tz)
+    sessions = (
+        StudySession.objects.filter(on_days(monday, monday + timedelta(days=6), tz, home), user=user)
+        .order_by().annotate(day=session_day(tz, home)).values_list('day', 'duration_seconds', 'subject_id')
+    )
+    # Topics that reached 'mastered' within this week (local date)
+    mastered = mastery_events(user, start, end)
+    archived = ArchivedStudyDay.objects.none()
+    if monday <= archived_through():
+        archived = ArchivedStudyDay.objects.filter(
+            user=user, day__gte=monday, day__lte=monday + timedelta(days=6),
+        ).order_by().values_list('day', 'session_count', 'total_seconds', 'subject_id')
+    return sessions, mastered, archived
+
+
+def summarize_week(monday, sessions, mastered, archived=()):
+    """
+    Weekly report payload from ``(local date, duration_seconds, subject_id)``
+    session rows, ``mastery_events`` rows and ``(day, session_count,
+    total_seconds, subject_id)`` archived rows.
+    """
+    subjects = {subject_id for _, _, subject_id in sessions if subject_id}
+    subjects.update(subject_id for _, _, _, subject_id in archived if subject_id)
+    days = {day for day, _, _ in sessions}
+    days.update(day for day, _, _, _ in archived)
+    mastered_count, mastered_by_subject = summarize_mastery(mastered)
+    return {
+        'week_start': monday.isoformat(),
+        'week_end': (monday + timedelta(days=6)).isoformat(),
+        'total_duration_seconds': (
+            sum(duration for _, duration, _ in sessions)
+            + sum(seconds for _, _, seconds, _ in archived)
+        ),
+        'session_count': len(sessions) + sum(count for _, count, _, _ in archived),
+        'unique_subjects_count': len(subjects),
+        'topics_mastered_count': mastered_count,
+        'topics_mastered_by_subject': mastered_by_subject,
+        'days_studied': len(days),
+    }
+
+
+def weekly_report(user, monday, tz):
+    """Stats for the local Mon–Sun week starting ``monday``."""
+    sessions, mastered, archived = _week_querysets(user, monday, tz, home_timezone(user))
+    return summarize_week(monday, list(sessions), list(mastered), list(archived))
+
+
+async def aweekly_report(user, monday, tz):
+    """Async-ORM twin of ``weekly_report``."""
+    home = await sync_to_async(home_timezone)(user)
+    sessions, mastered, archived = _week_querysets(user, monday, tz, home)
+    rows = [row async for row in sessions]
+    mastered_rows = [row async for row in mastered]
+    archived_rows = [row async for row in archived]
+    return summarize_week(monday, rows, mastered_rows, archived_rows)
+
+
+def parse_week(week_str):
+    """Monday of ISO week ``'YYYY-WW'``; raises ValueError/TypeError if malformed."""
+    return datetime.strptime(f'{week_str}-1', '%G-%V-%u').date()
+
+
+def current_monday(tz):
+    """Monday of the current local week."""
+    local_today = datetime.now(tz).date()
+    return local_today - timedelta(days=local_today.weekday())
+
+
+def goal_percent(seconds, goal_minutes):
+    """Progress towards a daily goal, 0–999 (capped so overachievers don't overflow the UI)."""
+    if not goal_minutes:
+        return 0
+    return min(round(seconds / (goal_minutes * 60) * 100), 999)
+
+
+def daily_goal_progress(user, tz):
+    """Today's goal progress: goal, seconds studied, percent and whether it's met."""
+    goal_minutes = (
+        UserProfile.objects.filter(user=user)
+        .values_list('daily_goal_minutes', flat=True)
+        .first()
+    )
+    seconds = today_seconds(user, tz)
+    return {
+        'goal_minutes': goal_minutes,
+        'today_seconds': seconds,
+        'percent': goal_percent(seconds, goal_minutes),
+        'goal_achieved': goal_minutes is not None and seconds >= goal_minutes * 60,
+    }
+
+
+def mastery_counts(user):
+    """Return ``(topic_count, mastered_count)`` across all of the user's subjects."""
+    counts = Subject.objects.filter(user=user).aggregate(
+        total=Sum('topic_count'),
+        mastered=Sum('mastered_count'),
+    )
+    return counts['total'] or 0, counts['mastered'] or 0
+
+
+def stats_snapshot(user, tz):
+    """Dashboard stats pushed over the live stats socket."""
+    streak, studied_today = compute_streak(user, tz)
+    topic_count, mastered_count = mastery_counts(user)
+    return {
+        'today_seconds': today_seconds(user, tz),
+        'streak': streak,
+        'studied_today': studied_today,
+        'topic_count': topic_count,
+        'mastered_count': mastered_count,
+    }
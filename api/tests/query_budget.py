@@ -0,0 +1,60 @@
+"""
+Query budgets for API endpoints.
+
+Decorate a test with ``@query_budget(n)``. The test receives a row count,
+creates that much data, logs in and returns a zero-argument callable that
+makes the request:
+
+    @query_budget(3)
+    def test_list_query_budget(self, rows):
+        Topic.objects.bulk_create([...rows topics...])
+        self.client.force_login(self.user)
+        return lambda: self.client.get('/api/topics/')
+
+The test runs at 1 and at 100 rows, each inside a rolled-back savepoint. It
+fails if either run takes more than ``n`` queries, or if the count changes
+with the amount of data (an N+1). Each request is made once before
+counting so the cached session/user lookups don't count against the
+endpoint.
+"""
+
+from functools import wraps
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+ROW_COUNTS = (1, 100)
+
+
+def count_queries(request):
+    """Return ``(queries, response)`` for a warm call of ``request``."""
+    request()
+    with CaptureQueriesContext(connection) as ctx:
+        response = request()
+    return ctx.captured_queries, response
+
+
+def query_budget(max_queries, rows=ROW_COUNTS):
+    def decorator(test):
+        @wraps(test)
+        def wrapper(self):
+            counts = {}
+            for n in rows:
+                with transaction.atomic():
+                    queries, response = count_queries(test(self, n))
+                    transaction.set_rollback(True)
+                # The login was rolled back with the data; start the next run logged out
+                self.client.cookies.clear()
+                self.assertLess(response.status_code, 400, f'{n} rows: HTTP {response.status_code}')
+                counts[n] = len(queries)
+                sql = '\n'.join(q['sql'] for q in queries)
+                self.assertLessEqual(
+                    len(queries), max_queries,
+                    f'{n} rows: {len(queries)} queries, budget is {max_queries}\n{sql}',
+                )
+            self.assertEqual(
+                len(set(counts.values())), 1,
+                f'Query count grows with data size: {counts}',
+            )
+        return wrapper
+    return decorator
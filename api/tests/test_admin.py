@@ -0,0 +1,121 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.admin import EstimatedCountPaginator
+from api.models import Subject, StudySession, Topic, TopicStatusChange, WeeklyRollup
+from api.rollups import week_monday
+from api.tests.query_budget import query_budget
+
+
+# Admin pages link static files, which aren't collected for tests
+@override_settings(STORAGES={'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})
+class AdminTests(APITestCase):
+    """Changelists for large tables, and the platform usage dashboard."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='pass')
+        self.user = User.objects.create_user(username='student', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Maths')
+        self.topic = Topic.objects.create(subject=self.subject, name='Limits')
+
+    def _bulk_sessions(self, rows):
+        now = timezone.now()
+        StudySession.objects.bulk_create([
+            StudySession(
+                user=self.user, subject=self.subject, topic=self.topic,
+                start_time=now, end_time=now, duration_seconds=600, local_date=now.date(),
+            )
+            for _ in range(rows)
+        ])
+
+    @query_budget(6)
+    def test_session_changelist_query_budget(self, rows):
+        """AC: The session changelist doesn't look up users, subjects or topics per row."""
+        self._bulk_sessions(rows)
+        self.client.force_login(self.admin)
+        return lambda: self.client.get('/admin/api/studysession/')
+
+    @query_budget(5)
+    def test_status_change_changelist_query_budget(self, rows):
+        TopicStatusChange.objects.bulk_create([
+            TopicStatusChange(user=self.user, topic=self.topic, subject=self.subject, to_status='mastered')
+            for _ in range(rows)
+        ])
+        self.client.force_login(self.admin)
+        return lambda: self.client.get('/admin/api/topicstatuschange/')
+
+    def test_large_unfiltered_lists_use_estimate(self):
+        """AC: Unfiltered changelists of large tables read the statistics estimate instead of COUNT(*)."""
+        self._bulk_sessions(30)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.client.force_login(self.admin)
+
+        with mock.patch.object(EstimatedCountPaginator, 'estimate_above', 10):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get('/admin/api/studysession/')
+            self.assertContains(response, '30 study sessions')
+            self.assertFalse([q for q in ctx.captured_queries if 'COUNT(*)' in q['sql'].upper()])
+
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get('/admin/api/studysession/', {'q': 'student'})
+            self.assertTrue([q for q in ctx.captured_queries if 'COUNT(*)' in q['sql'].upper()])
+
+        # Small tables are counted exactly
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/admin/api/studysession/')
+        self.assertTrue([q for q in ctx.captured_queries if 'COUNT(*)' in q['sql'].upper()])
+
+    def test_usage_dashboard(self):
+        """AC: Platform-wide weekly usage comes from the rollups, not the session table."""
+        monday = week_monday(timezone.now().date())
+        WeeklyRollup.objects.bulk_create([
+            WeeklyRollup(user=self.user, tz='UTC', week=monday, session_count=3, total_duration_seconds=5400,
+                         days_studied=2),
+            WeeklyRollup(user=self.admin, tz='UTC', week=monday, session_count=1, total_duration_seconds=600,
+                         days_studied=1),
+            WeeklyRollup(user=self.admin, tz='UTC', week=monday - timedelta(weeks=1)),
+            WeeklyRollup(user=self.admin, tz='Asia/Kolkata', week=monday, session_count=7),
+        ])
+        self.client.force_login(self.admin)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/admin/api/weeklyrollup/usage/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in ctx.captured_queries if 'api_studysession' in q['sql']])
+        usage = response.context['usage']
+        self.assertEqual(len(usage['weeks']), 12)
+        self.assertEqual(usage['weeks'][-1], {
+            'week_start': monday.isoformat(), 'active_users': 2, 'session_count': 4,
+            'total_duration_seconds': 6000, 'days_studied': 3, 'average_seconds_per_active_user': 3000,
+        })
+        self.assertEqual(usage['weeks'][-2]['active_users'], 0)
+        self.assertEqual((usage['totals']['users'], usage['totals']['topics']), (2, 1))
+
+        self.client.force_login(self.user)
+        response = self.client.get('/admin/api/weeklyrollup/usage/')
+        self.assertEqual(response.status_code, 302)  # to the admin login
+
+    def test_usage_counts_users_without_reports(self):
+        """AC: Sessions of a user who never requested a report are counted, still without reading sessions."""
+        self.assertFalse(WeeklyRollup.objects.exists())
+        now = timezone.now()
+        for duration in (600, 1200):
+            StudySession.objects.create(
+                user=self.user, subject=self.subject, start_time=now, end_time=now, duration_seconds=duration,
+            )
+        self.client.force_login(self.admin)
+
+        with CaptureQueriesContext(connection) as ctx:
+            usage = self.client.get('/admin/api/weeklyrollup/usage/').context['usage']
+        self.assertFalse([q for q in ctx.captured_queries if 'api_studysession' in q['sql']])
+        this_week = usage['weeks'][-1]
+        self.assertEqual((this_week['active_users'], this_week['session_count']), (1, 2))
+        self.assertEqual(this_week['total_duration_seconds'], 1800)
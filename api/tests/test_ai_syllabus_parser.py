@@ -81,7 +81,7 @@ class AIParseSyllabusTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        data = response.json()
+        data = response.json()['topics']
         self.assertEqual(len(data), 3)
         names = [t['name'] for t in data]
         self.assertIn('Introduction', names)
@@ -0,0 +1,123 @@
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.archive import archive_sessions
+from api.counters import reconcile_subject_counters
+from api.models import ArchivedStudyDay, Subject, StudySession, UserProfile
+
+
+@override_settings(SESSION_RETENTION_DAYS=30)
+class ArchiveTests(APITestCase):
+    """Old sessions move to the aggregate tier; reports and streaks read both tiers."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='archive_user', password='pass')
+        self.maths = Subject.objects.create(user=self.user, name='Maths')
+        self.physics = Subject.objects.create(user=self.user, name='Physics')
+        self.client.force_login(self.user)
+
+    def _session(self, days_ago, duration=1800, subject=None, notes=''):
+        created = timezone.now().replace(hour=12) - timedelta(days=days_ago)
+        session = StudySession.objects.create(
+            user=self.user, subject=subject or self.maths, notes=notes,
+            start_time=created - timedelta(seconds=duration), end_time=created,
+            duration_seconds=duration,
+        )
+        StudySession.objects.filter(pk=session.pk).update(created_at=created, local_date=created.date())
+        return session
+
+    def _week_of(self, days_ago):
+        return f"{(timezone.now() - timedelta(days=days_ago)).date():%G-%V}"
+
+    def test_old_sessions_folded(self):
+        """AC: Sessions past retention become per-user/day/subject rows; recent ones stay."""
+        self._session(60, 1800)
+        self._session(60, 600)
+        self._session(60, 300, subject=self.physics)
+        recent = self._session(2)
+
+        result = archive_sessions()
+        self.assertEqual(result.sessions, 3)
+        self.assertEqual(list(StudySession.objects.values_list('pk', flat=True)), [recent.pk])
+        rows = {(a.subject_id, a.session_count, a.total_seconds) for a in ArchivedStudyDay.objects.all()}
+        self.assertEqual(rows, {(self.maths.id, 2, 2400), (self.physics.id, 1, 300)})
+
+        # Archived time still counts towards the subject counters
+        self.maths.refresh_from_db()
+        self.assertEqual(self.maths.total_study_seconds, 4200)
+        self.assertEqual(reconcile_subject_counters(), [])
+
+    def test_rerun_merges_into_existing_days(self):
+        self._session(60, 1800)
+        archive_sessions()
+        self._session(60, 600)  # e.g. a late import
+        archive_sessions()
+        aggregate = ArchivedStudyDay.objects.get()
+        self.assertEqual((aggregate.session_count, aggregate.total_seconds), (2, 2400))
+
+    def test_weekly_report_unchanged_by_archival(self):
+        """AC: The weekly report combines archived days with raw sessions."""
+        for days_ago in (58, 59, 60):
+            self._session(days_ago, 1200, subject=self.physics if days_ago == 59 else self.maths)
+        url = f'/api/reports/weekly/?week={self._week_of(59)}'
+        before = self.client.get(url).json()
+        archive_sessions()
+        self.assertEqual(StudySession.objects.count(), 0)
+        self.assertEqual(self.client.get(url).json(), before)
+        self.assertGreater(before['session_count'], 0)
+
+    def test_streak_spans_both_tiers(self):
+        """AC: A streak continues from recent sessions into archived days."""
+        for days_ago in range(40):
+            self._session(days_ago, 600)
+        before = self.client.get('/api/sessions/streak/').json()
+        archive_sessions()
+        self.assertLess(StudySession.objects.count(), 40)
+        self.assertEqual(self.client.get('/api/sessions/streak/').json(), before)
+        self.assertEqual(before['streak'], 40)
+
+    def test_days_are_home_timezone_dates(self):
+        """AC: Sessions near midnight are archived on the local date that streaks and reports use."""
+        UserProfile.objects.create(user=self.user, timezone='Asia/Kolkata')  # UTC+05:30
+        late = timezone.now().replace(hour=20, minute=0) - timedelta(days=60)
+        session = StudySession.objects.create(
+            user=self.user, subject=self.maths, start_time=late, end_time=late, duration_seconds=600,
+        )
+        local_day = late.date() + timedelta(days=1)  # 01:30 in Kolkata
+        StudySession.objects.filter(pk=session.pk).update(created_at=late, local_date=local_day)
+
+        archive_sessions()
+        self.assertEqual(ArchivedStudyDay.objects.get().day, local_day)
+
+    def test_export_and_command(self):
+        """AC: Archived rows can be exported to a compressed file first."""
+        self._session(60, 1800, notes='Integrals')
+        export_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_dir)
+
+        out = StringIO()
+        call_command('archive_sessions', '--dry-run', stdout=out)
+        self.assertIn('would archive 1 session(s)', out.getvalue())
+        self.assertEqual(StudySession.objects.count(), 1)
+
+        out = StringIO()
+        call_command('archive_sessions', '--export-dir', export_dir, stdout=out)
+        self.assertIn('archived 1 session(s)', out.getvalue())
+        result = archive_sessions(export_dir=export_dir)  # nothing left: no empty file
+        self.assertIsNone(result.export_path)
+
+        (path,) = Path(export_dir).iterdir()
+        with gzip.open(path, 'rt') as fh:
+            rows = [json.loads(line) for line in fh]
+        self.assertEqual([(r['notes'], r['duration_seconds']) for r in rows], [('Integrals', 1800)])
@@ -1,7 +1,13 @@
+from allauth.account.signals import user_logged_in
+from allauth.socialaccount.models import SocialAccount
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 
+from api.auth_cache import cache_timeout
+
 
 class UserDetailViewTests(APITestCase):
     """Tests for GET /api/auth/user/"""
@@ -85,3 +91,63 @@ class LogoutViewTests(APITestCase):
         self.client.force_login(self.user)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class AuthCacheTests(APITestCase):
+    """Cached session, user and profile lookups for authenticated requests"""
+
+    def setUp(self):
+        self.url = '/api/auth/user/'
+        self.user = User.objects.create_user(username='cached_user', password='testpass123')
+        cache.clear()
+
+    def test_warm_cache_costs_no_queries(self):
+        """AC: Once warm, an authenticated API call runs zero queries for auth."""
+        self.client.force_login(self.user)
+        self.client.get(self.url)  # warms user + profile
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json()['username'], 'cached_user')
+
+    def test_login_signal_populates_profile(self):
+        """AC: allauth's login signal fills the profile cache, avatar included."""
+        SocialAccount.objects.create(
+            user=self.user, provider='github', uid='42',
+            extra_data={'avatar_url': 'https://avatars.example/42.png'},
+        )
+        user_logged_in.send(sender=User, request=RequestFactory().get('/'), user=self.user)
+
+        self.client.force_login(self.user)
+        self.client.get(self.url)  # warms the user row only
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json()['avatar_url'], 'https://avatars.example/42.png')
+
+    def test_user_change_invalidates_cache(self):
+        """Renaming the user shows up on the next request."""
+        self.client.force_login(self.user)
+        self.client.get(self.url)
+        self.user.first_name = 'Ada'
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).json()['name'], 'Ada')
+
+    def test_deactivated_user_is_logged_out(self):
+        """A cached user doesn't outlive deactivation."""
+        self.client.force_login(self.user)
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_per_process_cache_uses_short_timeout(self):
+        """AC: Without a shared cache, a change made on another worker is seen within seconds."""
+        self.assertEqual(cache_timeout(), 5)
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+            self.assertEqual(cache_timeout(), 3600)
+
+        with override_settings(AUTH_CACHE_LOCAL_TIMEOUT=0):
+            self.client.force_login(self.user)
+            self.client.get(self.url)
+            # Another worker's change: no signal clears this process's cache
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
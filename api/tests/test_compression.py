@@ -0,0 +1,128 @@
+import gzip
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api import compression
+from api.models import StudySession
+from backend.frontend import FrontendWhiteNoiseMiddleware
+
+
+class CompressionMiddlewareTests(APITestCase):
+    """Large JSON responses are compressed; small ones and non-accepting clients are not."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='gzip_user', password='pass')
+        now = timezone.now()
+        StudySession.objects.bulk_create([
+            StudySession(user=self.user, start_time=now, end_time=now, duration_seconds=60, notes=f'note {i}')
+            for i in range(40)
+        ])
+        self.client.force_login(self.user)
+
+    def test_large_list_gzipped(self):
+        """AC: The sessions list is sent gzip-encoded and decodes to the same JSON."""
+        plain = self.client.get('/api/sessions/')
+        response = self.client.get('/api/sessions/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content) // 4)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_identity_when_not_accepted(self):
+        for header in ('', 'identity', 'gzip;q=0'):
+            response = self.client.get('/api/sessions/', HTTP_ACCEPT_ENCODING=header)
+            self.assertFalse(response.has_header('Content-Encoding'), header)
+            self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_response_untouched(self):
+        """AC: Responses under COMPRESSION_MIN_SIZE are sent as-is."""
+        response = self.client.get('/api/subjects/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertLess(len(response.content), 1024)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_async_chain_stays_async(self):
+        """AC: Under ASGI no middleware forces a thread hop, and async responses are still compressed."""
+        async def handler(request):
+            return HttpResponse(b'[' + b'1,' * 1000 + b'1]', content_type='application/json')
+
+        middleware = compression.CompressionMiddleware(handler)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().get('/api/sessions/', HTTP_ACCEPT_ENCODING='gzip')
+        response = async_to_sync(middleware)(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+        with override_settings(DEBUG=True), self.assertNoLogs('django.request', 'DEBUG'):
+            ASGIHandler()  # logs every middleware it has to adapt
+
+    def test_choose_encoding(self):
+        self.assertEqual(compression.choose_encoding('gzip;q=0.5, *;q=0.1'), 'gzip')
+        self.assertIsNone(compression.choose_encoding('*;q=0'))
+        self.assertIsNone(compression.choose_encoding('deflate'))
+
+    @unittest.skipIf(compression.brotli is None, 'Brotli not installed')
+    def test_brotli_preferred(self):
+        plain = self.client.get('/api/sessions/')
+        response = self.client.get('/api/sessions/', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), plain.content)
+
+
+class FrontendServingTests(APITestCase):
+    """The Vite build is served precompressed, with immutable hashed assets."""
+
+    def setUp(self):
+        self.dist = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dist)
+        (self.dist / 'assets').mkdir()
+        (self.dist / 'index.html').write_text('<script src="/assets/index-AbC12_-9.js"></script>')
+        script = b'console.log("study tracker");\n' * 100
+        (self.dist / 'assets' / 'index-AbC12_-9.js').write_bytes(script)
+        (self.dist / 'assets' / 'index-AbC12_-9.js.gz').write_bytes(gzip.compress(script))
+        settings = override_settings(FRONTEND_DIST=self.dist, WHITENOISE_ROOT=self.dist)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = Client()  # middleware is built with the overridden settings
+
+    def test_hashed_asset_immutable_and_precompressed(self):
+        """AC: Hashed assets are cached for a year and served from the .gz file."""
+        response = self.client.get('/assets/index-AbC12_-9.js', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+
+    def test_index_revalidated(self):
+        for path in ('/', '/dashboard/subjects/3'):  # file and client-side route
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(response['Cache-Control'], 'no-cache', path)
+            self.assertIn(b'/assets/index-AbC12_-9.js', b''.join(response))
+            response.close()
+
+    def test_api_routes_not_shadowed(self):
+        self.assertEqual(self.client.get('/api/does-not-exist/').status_code, 404)
+
+    def test_async_serves_files_and_passes_through(self):
+        """AC: Under ASGI files are served directly and other paths reach the app."""
+        async def handler(request):
+            return HttpResponse(b'app')
+
+        middleware = FrontendWhiteNoiseMiddleware(handler)
+        self.assertTrue(iscoroutinefunction(middleware))
+        factory = RequestFactory()
+        response = async_to_sync(middleware)(factory.get('/assets/index-AbC12_-9.js', HTTP_ACCEPT_ENCODING='gzip'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+        self.assertEqual(async_to_sync(middleware)(factory.get('/api/subjects/')).content, b'app')
@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Subject, Topic, StudySession
+
+
+class SubjectCounterTests(APITestCase):
+    """Denormalized Subject.topic_count / mastered_count / total_study_seconds"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='counter_user', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Maths')
+        self.client.force_login(self.user)
+
+    def _counters(self, subject=None):
+        subject = subject or self.subject
+        subject.refresh_from_db()
+        return subject.topic_count, subject.mastered_count, subject.total_study_seconds
+
+    # ── Topics ────────────────────────────────────────────────────────────────
+
+    def test_topic_create_and_delete(self):
+        """AC: Creating and deleting topics through the API moves the counters."""
+        response = self.client.post('/api/topics/', {'subject': self.subject.id, 'name': 'Algebra'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.client.post('/api/topics/', {'subject': self.subject.id, 'name': 'Calculus', 'status': 'mastered'}, format='json')
+        self.assertEqual(self._counters(), (2, 1, 0))
+
+        mastered = Topic.objects.get(name='Calculus')
+        self.client.delete(f'/api/topics/{mastered.id}/')
+        self.assertEqual(self._counters(), (1, 0, 0))
+
+    def test_status_change(self):
+        """AC: Mastering / un-mastering a topic adjusts mastered_count only."""
+        topic = Topic.objects.create(subject=self.subject, name='Algebra')
+        self.client.patch(f'/api/topics/{topic.id}/', {'status': 'mastered'}, format='json')
+        self.assertEqual(self._counters(), (1, 1, 0))
+        # Re-saving the same status is not counted twice
+        self.client.patch(f'/api/topics/{topic.id}/', {'status': 'mastered'}, format='json')
+        self.assertEqual(self._counters(), (1, 1, 0))
+        self.client.patch(f'/api/topics/{topic.id}/', {'status': 'in_progress'}, format='json')
+        self.assertEqual(self._counters(), (1, 0, 0))
+
+    def test_topic_moved_between_subjects(self):
+        other = Subject.objects.create(user=self.user, name='Physics')
+        topic = Topic.objects.create(subject=self.subject, name='Vectors', status='mastered')
+        self.client.patch(f'/api/topics/{topic.id}/', {'subject': other.id}, format='json')
+        self.assertEqual(self._counters(), (0, 0, 0))
+        self.assertEqual(self._counters(other), (1, 1, 0))
+
+    def test_syllabus_import(self):
+        """AC: Bulk syllabus imports add to topic_count."""
+        self.client.post(
+            f'/api/subjects/{self.subject.id}/parse-syllabus/',
+            {'topics': ['Sets', 'Relations', 'Functions']}, format='json',
+        )
+        self.assertEqual(self._counters(), (3, 0, 0))
+
+    def test_subject_edit_keeps_counters(self):
+        """Saving a subject never writes back stale counter values."""
+        stale = Subject.objects.get(pk=self.subject.pk)
+        Topic.objects.create(subject=self.subject, name='Algebra')
+        stale.name = 'Mathematics'
+        stale.save()
+        self.assertEqual(self._counters(), (1, 0, 0))
+
+    # ── Sessions ──────────────────────────────────────────────────────────────
+
+    def test_session_create_adds_seconds(self):
+        """AC: Logging a session adds its duration to the subject."""
+        now = timezone.now()
+        response = self.client.post('/api/sessions/', {
+            'subject': self.subject.id,
+            'start_time': (now - timezone.timedelta(minutes=25)).isoformat(),
+            'end_time': now.isoformat(),
+            'duration_seconds': 1500,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._counters(), (0, 0, 1500))
+
+    # ── Reads ─────────────────────────────────────────────────────────────────
+
+    def test_list_reads_counter_columns(self):
+        """AC: The subject list is a plain column fetch."""
+        Topic.objects.create(subject=self.subject, name='Algebra', status='mastered')
+        self.client.get('/api/subjects/')  # warm the auth cache
+        with self.assertNumQueries(2):  # page count + rows
+            data = self.client.get('/api/subjects/').json()['results'][0]
+        self.assertEqual((data['topic_count'], data['mastered_count']), (1, 1))
+        self.assertIn('total_study_seconds', data)
+
+    # ── Reconcile ─────────────────────────────────────────────────────────────
+
+    def test_reconcile_command_fixes_drift(self):
+        """AC: reconcile_subject_counters repairs counters changed behind its back."""
+        now = timezone.now()
+        Topic.objects.bulk_create([Topic(subject=self.subject, name=f'T{i}', status='mastered') for i in range(4)])
+        StudySession.objects.bulk_create([
+            StudySession(user=self.user, subject=self.subject, start_time=now, end_time=now, duration_seconds=600)
+        ])
+        self.assertEqual(self._counters(), (0, 0, 0))
+
+        out = StringIO()
+        call_command('reconcile_subject_counters', '--dry-run', stdout=out)
+        self.assertIn('would fix 1 subject(s)', out.getvalue())
+        self.assertEqual(self._counters(), (0, 0, 0))
+
+        call_command('reconcile_subject_counters', stdout=StringIO())
+        self.assertEqual(self._counters(), (4, 4, 600))
+        out = StringIO()
+        call_command('reconcile_subject_counters', stdout=out)
+        self.assertIn('fixed 0 subject(s)', out.getvalue())
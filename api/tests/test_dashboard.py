@@ -0,0 +1,99 @@
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from api.counters import reconcile_subject_counters
+from api.models import Subject, Topic, StudySession, UserProfile
+
+
+class DashboardAPITests(APITestCase):
+    """Tests for GET /api/dashboard/"""
+
+    # subjects, recent sessions, open topics, streak dates, goal, today SUM,
+    # week sessions, week mastered — session, user and profile come from cache
+    EXPECTED_QUERIES = 8
+
+    def setUp(self):
+        self.url = '/api/dashboard/'
+        self.user = User.objects.create_user(username='dash_user', password='pass')
+        self.other = User.objects.create_user(username='dash_other', password='pass')
+        UserProfile.objects.create(user=self.user, daily_goal_minutes=60)
+
+    def _seed(self, subjects, topics_per_subject, sessions):
+        now = timezone.now()
+        for i in range(subjects):
+            subject = Subject.objects.create(user=self.user, name=f'Subject {i}')
+            Topic.objects.bulk_create([
+                Topic(subject=subject, name=f'Topic {j}', status='mastered' if j == 0 else 'not_started')
+                for j in range(topics_per_subject)
+            ])
+            StudySession.objects.bulk_create([
+                StudySession(
+                    user=self.user, subject=subject,
+                    start_time=now - timezone.timedelta(minutes=10), end_time=now,
+                    duration_seconds=600,
+                )
+                for _ in range(sessions)
+            ])
+        reconcile_subject_counters()  # bulk_create skips the counter signals
+
+    def test_dashboard_payload(self):
+        """AC: One response carries user, subjects, sessions, streak, goal, week and recommendations."""
+        self._seed(subjects=2, topics_per_subject=3, sessions=2)
+        done = Subject.objects.create(user=self.user, name='Done')
+        Topic.objects.create(subject=done, name='Only', status='mastered')
+
+        self.client.force_login(self.user)
+        response = self.client.get(f'{self.url}?tz=UTC')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+
+        self.assertEqual(data['user']['username'], 'dash_user')
+        self.assertEqual(len(data['subjects']), 3)
+        maths = next(s for s in data['subjects'] if s['name'] == 'Subject 0')
+        self.assertEqual(maths['topic_count'], 3)
+        self.assertEqual(maths['mastered_count'], 1)
+        self.assertEqual(len(data['recent_sessions']), 4)
+        self.assertEqual(data['streak'], {'streak': 1, 'studied_today': True})
+        self.assertEqual(data['daily_goal']['today_seconds'], 2400)
+        self.assertEqual(data['daily_goal']['goal_minutes'], 60)
+        self.assertEqual(data['weekly_report']['session_count'], 4)
+        # Recommendation skips the mastered first topic; fully mastered subject → null
+        self.assertEqual(data['recommendations'][str(maths['id'])]['name'], 'Topic 1')
+        self.assertIsNone(data['recommendations'][str(done.id)])
+
+    def test_dashboard_matches_recommend_endpoint(self):
+        """The dashboard's pick is the same topic /recommend-topic/ returns."""
+        subject = Subject.objects.create(user=self.user, name='Physics')
+        Topic.objects.create(subject=subject, name='Optics', difficulty='hard')
+        Topic.objects.create(subject=subject, name='Units', difficulty='easy')
+        Topic.objects.create(subject=subject, name='Waves', status='in_progress', difficulty='medium')
+
+        self.client.force_login(self.user)
+        dashboard = self.client.get(self.url).json()
+        single = self.client.get(f'/api/subjects/{subject.id}/recommend-topic/').json()
+        self.assertEqual(dashboard['recommendations'][str(subject.id)], single)
+
+    def test_dashboard_query_count_is_fixed(self):
+        """AC: Query count doesn't grow with subjects, topics or sessions."""
+        self.client.force_login(self.user)
+        self.client.get(self.url)  # warms the auth cache
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            self.client.get(self.url)
+
+        self._seed(subjects=10, topics_per_subject=20, sessions=15)
+        with self.assertNumQueries(self.EXPECTED_QUERIES):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.json()['subjects']), 10)
+
+    def test_dashboard_scoped_to_user(self):
+        """Data isolation: another user's subjects never appear."""
+        Subject.objects.create(user=self.other, name='Secret')
+        self.client.force_login(self.user)
+        names = [s['name'] for s in self.client.get(self.url).json()['subjects']]
+        self.assertNotIn('Secret', names)
+
+    def test_unauthenticated_cannot_access_dashboard(self):
+        """AC: Unauthenticated access returns 403."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from api.fast_lists import FastJSONRenderer
+from api.models import Subject, Topic, StudySession
+from api.serializers import StudySessionSerializer, TopicSerializer
+
+
+class FastListTests(APITestCase):
+    """The values()/orjson list path renders exactly what ModelSerializer + JSONRenderer did."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='fast_user', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Mathématiques 数学')
+        self.topic = Topic.objects.create(
+            subject=self.subject, name='Line\u2028separator "quoted" \\ and \x01 control', status='mastered',
+        )
+        Topic.objects.create(subject=self.subject, name='😀 emoji', difficulty='hard')
+        start = timezone.now().replace(microsecond=123456)
+        StudySession.objects.create(
+            user=self.user, subject=self.subject, topic=self.topic,
+            start_time=start, end_time=start + timezone.timedelta(minutes=30),
+            duration_seconds=1800, notes='Tab\there, newline\nthere, para end',
+        )
+        StudySession.objects.create(  # no subject, no topic, whole seconds
+            user=self.user, start_time=start.replace(microsecond=0), end_time=start.replace(microsecond=0),
+            duration_seconds=0,
+        )
+        self.client.force_login(self.user)
+
+    def _expected(self, serializer_class, queryset):
+        return JSONRenderer().render({
+            'count': len(queryset), 'next': None, 'previous': None,
+            'results': serializer_class(queryset, many=True).data,
+        })
+
+    def test_session_list_bytes(self):
+        """AC: Session list output is byte-for-byte unchanged."""
+        response = self.client.get('/api/sessions/')
+        sessions = StudySession.objects.filter(user=self.user).select_related('subject', 'topic')
+        self.assertEqual(response.content, self._expected(StudySessionSerializer, sessions))
+
+    def test_topic_list_bytes(self):
+        """AC: Topic list output is byte-for-byte unchanged."""
+        response = self.client.get(f'/api/topics/?subject={self.subject.id}')
+        topics = Topic.objects.filter(subject=self.subject)
+        self.assertEqual(response.content, self._expected(TopicSerializer, topics))
+
+    def test_renderer_matches_json_renderer(self):
+        data = {'a': [' ', '\x7f', 'é', None, True, 10 ** 12], 1: {'nested': []}}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        # Indented output and values orjson can't encode use the stock renderer
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+        self.assertEqual(FastJSONRenderer().render({'n': 2 ** 70}), JSONRenderer().render({'n': 2 ** 70}))
@@ -0,0 +1,103 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from api.models import Subject, StudySession, UserProfile
+
+
+class DailyGoalAPITests(APITestCase):
+    """Tests for GET/PUT /api/goals/ and GET /api/goals/today/"""
+
+    def setUp(self):
+        self.url = '/api/goals/'
+        self.today_url = '/api/goals/today/'
+        self.user = User.objects.create_user(username='goal_user', password='pass')
+        self.other = User.objects.create_user(username='other_goal', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Maths')
+
+    def _make_session(self, user=None, days_ago=0, duration=1800):
+        now = timezone.now()
+        s = StudySession.objects.create(
+            user=user or self.user, subject=self.subject,
+            start_time=now - timezone.timedelta(days=days_ago, seconds=duration),
+            end_time=now - timezone.timedelta(days=days_ago),
+            duration_seconds=duration,
+        )
+        if days_ago:
+            s.created_at = now - timezone.timedelta(days=days_ago)
+            s.save()
+        return s
+
+    # ── Goal setting ──────────────────────────────────────────────────────────
+
+    def test_goal_defaults_to_null(self):
+        """AC: A user who never set a goal gets null, without a profile row being created."""
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.json()['daily_goal_minutes'])
+        self.assertFalse(UserProfile.objects.filter(user=self.user).exists())
+
+    def test_set_and_clear_goal(self):
+        """AC: PUT stores the goal server-side; null clears it."""
+        self.client.force_login(self.user)
+        response = self.client.put(self.url, {'daily_goal_minutes': 90}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(UserProfile.objects.get(user=self.user).daily_goal_minutes, 90)
+        self.assertEqual(self.client.get(self.url).json()['daily_goal_minutes'], 90)
+
+        response = self.client.put(self.url, {'daily_goal_minutes': None}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(UserProfile.objects.get(user=self.user).daily_goal_minutes)
+
+    def test_goal_must_be_positive(self):
+        """Zero or negative goals are rejected."""
+        self.client.force_login(self.user)
+        response = self.client.put(self.url, {'daily_goal_minutes': 0}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ── Today progress ────────────────────────────────────────────────────────
+
+    def test_today_progress(self):
+        """AC: Returns goal, seconds studied today and percent — older sessions excluded."""
+        UserProfile.objects.create(user=self.user, daily_goal_minutes=60)
+        self._make_session(duration=1800)
+        self._make_session(days_ago=2, duration=3600)
+        self._make_session(user=self.other, duration=3600)
+
+        self.client.force_login(self.user)
+        response = self.client.get(f'{self.today_url}?tz=UTC')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'goal_minutes': 60,
+            'today_seconds': 1800,
+            'percent': 50,
+            'goal_achieved': False,
+        })
+
+    def test_today_progress_without_goal(self):
+        """No goal → percent 0, but today's seconds are still reported."""
+        self._make_session(duration=600)
+        self.client.force_login(self.user)
+        data = self.client.get(self.today_url).json()
+        self.assertIsNone(data['goal_minutes'])
+        self.assertEqual(data['today_seconds'], 600)
+        self.assertEqual(data['percent'], 0)
+
+    def test_today_progress_is_one_sum_query(self):
+        """AC: Today's total comes from a single SUM, not by loading sessions."""
+        for _ in range(5):
+            self._make_session(duration=60)
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.today_url)
+        session_queries = [q['sql'] for q in ctx.captured_queries if 'api_studysession' in q['sql']]
+        self.assertEqual(len(session_queries), 1)
+        self.assertIn('SUM(', session_queries[0])
+
+    def test_unauthenticated_cannot_access_goals(self):
+        """AC: Unauthenticated access returns 403."""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.today_url).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,157 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import GroupWeeklyScore, StudyGroup, StudyGroupMembership, Subject, StudySession
+
+
+class StudyGroupTests(APITestCase):
+    """Tests for /api/groups/ and the incrementally maintained leaderboard."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass')
+        self.client.force_login(self.owner)
+        response = self.client.post('/api/groups/', {'name': 'Calculus cohort'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.group = response.json()
+        self.board_url = f"/api/groups/{self.group['id']}/leaderboard/"
+
+    def _member(self, username):
+        user = User.objects.create_user(username=username, password='pass')
+        self.client.force_login(user)
+        response = self.client.post('/api/groups/join/', {'invite_code': self.group['invite_code']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.client.force_login(self.owner)
+        return user
+
+    def _session(self, user, duration, created=None):
+        subject = Subject.objects.get_or_create(user=user, name='Maths')[0]
+        now = timezone.now()
+        session = StudySession.objects.create(
+            user=user, subject=subject, start_time=now, end_time=now, duration_seconds=duration,
+        )
+        if created is not None:
+            StudySession.objects.filter(pk=session.pk).update(created_at=created, local_date=created.date())
+        return session
+
+    def _week(self, weeks_ago=0):
+        return f"{(timezone.now() - timedelta(weeks=weeks_ago)).date():%G-%V}"
+
+    def test_create_and_join(self):
+        """AC: Groups are joined by invite code; members see the group, others don't."""
+        self.assertEqual(self.group['member_count'], 1)
+        self.assertEqual(self.group['owner'], self.owner.id)
+        member = self._member('member')
+
+        self.client.force_login(member)
+        again = self.client.post('/api/groups/join/', {'invite_code': self.group['invite_code']}, format='json')
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.json()['member_count'], 2)
+        self.assertEqual([g['id'] for g in self.client.get('/api/groups/').json()['results']], [self.group['id']])
+
+        self.client.force_login(User.objects.create_user(username='outsider', password='pass'))
+        self.assertEqual(self.client.get('/api/groups/').json()['results'], [])
+        self.assertEqual(self.client.get(self.board_url).status_code, status.HTTP_404_NOT_FOUND)
+        bad = self.client.post('/api/groups/join/', {'invite_code': 'nope'}, format='json')
+        self.assertEqual(bad.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_leaderboard_ranks_weekly_time(self):
+        """AC: Session writes update the ranking; ties share a rank."""
+        alice, bob = self._member('alice'), self._member('bob')
+        self._session(alice, 3600)
+        self._session(bob, 1200)
+        self._session(bob, 600)
+        extra = self._session(self.owner, 1800)
+        self._session(self.owner, 1800)
+
+        board = self.client.get(self.board_url).json()
+        self.assertEqual(
+            [(e['rank'], e['username'], e['total_seconds']) for e in board['entries']],
+            [(1, 'owner', 3600), (1, 'alice', 3600), (3, 'bob', 1800)],
+        )
+        self.assertEqual(board['me']['rank'], 1)
+        self.assertEqual(board['group']['member_count'], 3)
+
+        extra.delete()
+        board = self.client.get(self.board_url).json()
+        self.assertEqual(
+            [(e['rank'], e['username'], e['session_count']) for e in board['entries']],
+            [(1, 'alice', 1), (2, 'owner', 1), (2, 'bob', 2)],
+        )
+
+    def test_join_scores_history(self):
+        """AC: Joining counts the member's earlier weeks; the rebuild command recomputes the same rows."""
+        late = User.objects.create_user(username='late', password='pass')
+        self._session(late, 900, created=timezone.now() - timedelta(weeks=1))
+        self.client.force_login(late)
+        self.client.post('/api/groups/join/', {'invite_code': self.group['invite_code']}, format='json')
+        self.client.force_login(self.owner)
+
+        board = self.client.get(self.board_url, {'week': self._week(1)}).json()
+        self.assertEqual([(e['username'], e['total_seconds']) for e in board['entries']], [('late', 900)])
+        self.assertEqual(board['me'], {
+            'rank': None, 'user_id': self.owner.id, 'username': 'owner', 'total_seconds': 0, 'session_count': 0,
+        })
+
+        scores = GroupWeeklyScore.objects.order_by('user_id', 'week')
+        before = list(scores.values_list('user_id', 'week', 'total_seconds', 'session_count'))
+        out = StringIO()
+        call_command('rebuild_group_scores', stdout=out)
+        self.assertIn('wrote 1 group score row(s)', out.getvalue())
+        self.assertEqual(list(scores.values_list('user_id', 'week', 'total_seconds', 'session_count')), before)
+
+    def test_leaderboard_is_one_query(self):
+        """AC: A large group's leaderboard is one indexed read of the score table."""
+        users = User.objects.bulk_create([User(username=f'student{i}') for i in range(1000)])
+        group = StudyGroup.objects.get(pk=self.group['id'])
+        StudyGroupMembership.objects.bulk_create([StudyGroupMembership(group=group, user=u) for u in users])
+        monday = timezone.now().date() - timedelta(days=timezone.now().weekday())
+        GroupWeeklyScore.objects.bulk_create([
+            GroupWeeklyScore(group=group, user=u, week=monday, total_seconds=60 * (i % 100 + 1), session_count=1)
+            for i, u in enumerate(users)
+        ])
+        week = f'{monday:%G-%V}'
+        self.client.get('/api/auth/user/')  # warm the auth cache
+
+        # the membership check and the ranked scores
+        with self.assertNumQueries(2):
+            board = self.client.get(self.board_url, {'week': week}).json()
+        self.assertEqual(len(board['entries']), 1000)
+        self.assertEqual(board['entries'][0]['total_seconds'], 6000)
+        self.assertEqual([e['rank'] for e in board['entries'][:11]], [1] * 10 + [11])
+
+    def test_leave_and_delete(self):
+        member = self._member('member')
+        self._session(member, 600)
+
+        self.client.force_login(member)
+        delete = self.client.delete(f"/api/groups/{self.group['id']}/")
+        self.assertEqual(delete.status_code, status.HTTP_403_FORBIDDEN)
+        leave = self.client.post(f"/api/groups/{self.group['id']}/leave/")
+        self.assertEqual(leave.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(GroupWeeklyScore.objects.filter(user=member).exists())
+        self.assertEqual(StudyGroup.objects.get().member_count, 1)
+
+        self.client.force_login(self.owner)
+        leave = self.client.post(f"/api/groups/{self.group['id']}/leave/")
+        self.assertEqual(leave.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.board_url, {'week': 'bad'}).status_code, status.HTTP_400_BAD_REQUEST)
+        delete = self.client.delete(f"/api/groups/{self.group['id']}/")
+        self.assertEqual(delete.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(StudyGroup.objects.exists())
+
+    def test_home_timezone_change_rescores(self):
+        """AC: Scores follow the member's home-timezone weeks."""
+        monday = timezone.now().date() - timedelta(days=timezone.now().weekday())
+        sunday_night = datetime.combine(monday, datetime.min.time(), tzinfo=dt_timezone.utc)
+        self._session(self.owner, 600, created=sunday_night - timedelta(hours=1))  # 23:00 UTC Sunday
+        call_command('rebuild_group_scores', stdout=StringIO())
+        self.assertEqual(GroupWeeklyScore.objects.get().week, monday - timedelta(days=7))
+
+        self.client.put('/api/profile/timezone/', {'timezone': 'Asia/Kolkata'}, format='json')  # 04:30 Monday
+        self.assertEqual(GroupWeeklyScore.objects.get().week, monday)
@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Subject, StudySession
+
+
+class LocalDateTests(APITestCase):
+    """Home timezones, and sessions dated in them at write time."""
+
+    def setUp(self):
+        self.url = '/api/profile/timezone/'
+        self.user = User.objects.create_user(username='tz_user', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Maths')
+        self.client.force_login(self.user)
+
+    def _session(self, created, duration=1800):
+        session = StudySession.objects.create(
+            user=self.user, subject=self.subject,
+            start_time=created - timedelta(seconds=duration), end_time=created, duration_seconds=duration,
+        )
+        session.created_at = created
+        session.save()
+        return session
+
+    def _set_home(self, tz_name):
+        response = self.client.put(self.url, {'timezone': tz_name}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_sessions_dated_in_home_timezone(self):
+        """AC: local_date is the creation date in the user's home timezone, stored at write time."""
+        late_evening = datetime(2026, 3, 1, 20, 0, tzinfo=dt_timezone.utc)  # 01:30 next day in Kolkata
+        session = self._session(late_evening)
+        self.assertEqual(session.local_date, date(2026, 3, 1))  # no home timezone yet: UTC
+
+        self._set_home('Asia/Kolkata')
+        session.refresh_from_db()
+        self.assertEqual(session.local_date, date(2026, 3, 2))  # re-dated with the new timezone
+        self.assertEqual(self._session(late_evening).local_date, date(2026, 3, 2))
+        self.assertEqual(self.client.get('/api/auth/user/').json()['timezone'], 'Asia/Kolkata')
+
+    def test_reports_default_to_home_timezone(self):
+        """AC: Without ?tz= streaks and reports use the home timezone, whatever the client's."""
+        self._set_home('Asia/Kolkata')
+        now = timezone.now()
+        for days_ago in range(3):
+            self._session(now - timedelta(days=days_ago))
+
+        for path in ('/api/sessions/streak/', '/api/reports/weekly/', '/api/goals/today/'):
+            self.assertEqual(
+                self.client.get(path).json(), self.client.get(path, {'tz': 'Asia/Kolkata'}).json(), path,
+            )
+        self.assertEqual(self.client.get('/api/sessions/streak/').json()['streak'], 3)
+
+    def test_home_timezone_queries_use_stored_date(self):
+        """AC: Date-bucketed queries in the home timezone group and filter on local_date in SQL."""
+        self._session(timezone.now())
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/sessions/streak/')
+            self.client.get('/api/goals/today/')
+        session_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "api_studysession"' in q['sql']]
+        self.assertEqual(len(session_queries), 2)
+        self.assertTrue(all('local_date' in sql for sql in session_queries))
+        self.assertIn('DISTINCT', session_queries[0])
+
+    def test_invalid_timezone_rejected(self):
+        for name in ('Mars/Olympus', '', '../etc/passwd'):
+            response = self.client.put(self.url, {'timezone': name}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, name)
+        self.assertEqual(self.client.get(self.url).json(), {'timezone': ''})
+
+    def test_backfill_command(self):
+        """AC: Sessions without a stored date still report correctly and can be backfilled."""
+        self._set_home('America/New_York')
+        created = datetime(2026, 3, 2, 3, 0, tzinfo=dt_timezone.utc)  # 22:00 on Mar 1 in New York
+        StudySession.objects.bulk_create([
+            StudySession(user=self.user, subject=self.subject, start_time=created, end_time=created,
+                         duration_seconds=600, created_at=created),
+        ])
+        StudySession.objects.filter(user=self.user).update(created_at=created)
+        self.assertIsNone(StudySession.objects.get().local_date)
+        report = self.client.get('/api/reports/weekly/', {'week': '2026-09'}).json()  # Feb 23 – Mar 1
+        self.assertEqual(report['session_count'], 1)
+
+        out = StringIO()
+        call_command('backfill_local_dates', stdout=out)
+        self.assertIn('dated 1 session(s)', out.getvalue())
+        self.assertEqual(StudySession.objects.get().local_date, created.astimezone(ZoneInfo('America/New_York')).date())
+        self.assertEqual(self.client.get('/api/reports/weekly/', {'week': '2026-09'}).json(), report)
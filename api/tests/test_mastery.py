@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import Subject, Topic, TopicStatusChange
+
+
+class MasteryLogTests(APITestCase):
+    """Status transitions are logged, and reports count mastery from the log."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='mastery_user', password='pass')
+        self.maths = Subject.objects.create(user=self.user, name='Maths')
+        self.physics = Subject.objects.create(user=self.user, name='Physics')
+        self.topic = Topic.objects.create(subject=self.maths, name='Limits')
+        self.client.force_login(self.user)
+
+    def _patch(self, topic, **data):
+        response = self.client.patch(f'/api/topics/{topic.id}/', data)
+        self.assertEqual(response.status_code, 200)
+
+    def _week(self, weeks_ago=0):
+        return self.client.get('/api/reports/weekly/', {
+            'week': f'{(timezone.now() - timedelta(weeks=weeks_ago)).date():%G-%V}',
+        }).json()
+
+    def test_transitions_logged(self):
+        """AC: Every status transition appends an event; other edits don't."""
+        self._patch(self.topic, status='in_progress')
+        self._patch(self.topic, name='Limits and continuity', difficulty='hard')
+        self._patch(self.topic, status='mastered')
+        Topic.objects.create(subject=self.physics, name='Optics', status='mastered')
+        Topic.objects.create(subject=self.physics, name='Waves')  # not_started: nothing to log
+        events = list(TopicStatusChange.objects.order_by('id').values_list('from_status', 'to_status'))
+        self.assertEqual(events, [('not_started', 'in_progress'), ('in_progress', 'mastered'), ('', 'mastered')])
+        self.assertTrue(all(e.user_id == self.user.id for e in TopicStatusChange.objects.all()))
+
+    def test_later_edit_keeps_mastery_week(self):
+        """AC: Renaming a topic mastered in an earlier week doesn't move it into this week."""
+        self._patch(self.topic, status='mastered')
+        TopicStatusChange.objects.update(changed_at=timezone.now() - timedelta(weeks=2))
+        self._patch(self.topic, name='Limits (revised)')
+
+        self.assertEqual(self._week()['topics_mastered_count'], 0)
+        self.assertEqual(self._week(2)['topics_mastered_count'], 1)
+
+    def test_per_subject_counts(self):
+        """AC: Mastery is counted per subject, and once per topic per week."""
+        optics = Topic.objects.create(subject=self.physics, name='Optics')
+        waves = Topic.objects.create(subject=self.physics, name='Waves')
+        for topic in (self.topic, optics, waves):
+            self._patch(topic, status='mastered')
+        self._patch(waves, status='in_progress')
+        self._patch(waves, status='mastered')
+
+        report = self._week()
+        self.assertEqual(report['topics_mastered_count'], 3)
+        self.assertEqual(report['topics_mastered_by_subject'], {str(self.maths.id): 1, str(self.physics.id): 2})
+        week = self.client.get('/api/reports/range/').json()['weeks'][-1]
+        self.assertEqual(week['topics_mastered_by_subject'], report['topics_mastered_by_subject'])
+
+    def test_deleting_topic_removes_its_history(self):
+        self._patch(self.topic, status='mastered')
+        self.topic.delete()
+        self.assertFalse(TopicStatusChange.objects.exists())
+        self.assertEqual(self._week()['topics_mastered_count'], 0)
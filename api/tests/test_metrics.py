@@ -0,0 +1,89 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.metrics import RequestMetricsMiddleware, registry
+from api.models import Subject, Topic
+
+
+class RequestMetricsTests(APITestCase):
+    """Tests for the request metrics middleware and GET /api/metrics/"""
+
+    def setUp(self):
+        self.url = '/api/metrics/'
+        self.user = User.objects.create_user(username='metrics_user', password='pass')
+        self.staff = User.objects.create_user(username='metrics_staff', password='pass', is_staff=True)
+        subject = Subject.objects.create(user=self.user, name='Maths')
+        Topic.objects.create(subject=subject, name='Algebra')
+        self.subject = subject
+        registry.reset()
+
+    def _metric_lines(self, prefix):
+        self.client.force_login(self.staff)
+        body = self.client.get(self.url).content.decode()
+        return [line for line in body.splitlines() if line.startswith(prefix)]
+
+    # ── Server-Timing ─────────────────────────────────────────────────────────
+
+    def test_server_timing_header(self):
+        """AC: Responses carry db (with query count), serializer and total timings."""
+        self.client.force_login(self.user)
+        response = self.client.get('/api/topics/')
+        header = response['Server-Timing']
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertRegex(header, r'ser;dur=[\d.]+')
+        self.assertRegex(header, r'total;dur=[\d.]+')
+
+    def test_async_chain_stays_async(self):
+        """AC: Under ASGI the middleware awaits the async handler instead of forcing the chain to sync."""
+        async def handler(request):
+            return HttpResponse('{}', content_type='application/json')
+
+        middleware = RequestMetricsMiddleware(handler)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(RequestFactory().get('/api/topics/'))
+        self.assertRegex(response['Server-Timing'], r'total;dur=[\d.]+')
+        self.assertFalse(iscoroutinefunction(RequestMetricsMiddleware(lambda request: HttpResponse())))
+
+    def test_query_count_matches_executed_queries(self):
+        """The counted queries are the ones the request actually ran."""
+        self.client.force_login(self.user)
+        self.client.get(f'/api/subjects/{self.subject.id}/recommend-topic/')  # warm auth cache
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/subjects/{self.subject.id}/recommend-topic/')
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+
+    # ── Prometheus endpoint ───────────────────────────────────────────────────
+
+    def test_histograms_keyed_by_url_name(self):
+        """AC: Histograms are labelled with the resolved URL name and method."""
+        self.client.force_login(self.user)
+        self.client.get('/api/sessions/streak/')
+        self.client.get('/api/sessions/streak/')
+
+        lines = self._metric_lines('studytracker_request_duration_seconds_count')
+        self.assertIn('studytracker_request_duration_seconds_count{view="session-streak",method="GET"} 2', lines)
+        buckets = self._metric_lines('studytracker_db_queries_bucket{view="session-streak"')
+        self.assertTrue(buckets[-1].endswith(' 2'))  # +Inf bucket holds every request
+
+    def test_responses_counted_by_status(self):
+        self.client.get('/api/subjects/')  # anonymous → 403
+        lines = self._metric_lines('studytracker_responses_total')
+        self.assertIn('studytracker_responses_total{view="subject-list",method="GET",status="403"} 1', lines)
+
+    def test_metrics_requires_staff(self):
+        """Non-staff users can't read the metrics."""
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_bearer_token(self):
+        """AC: Prometheus authenticates with the METRICS_TOKEN bearer token."""
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,182 @@
+"""
+Tests for the live stats WebSocket (/ws/stats/).
+
+Runs the real ASGI application against the in-memory channel layer, so no
+Redis or other outside service is needed.
+"""
+
+import json
+import runpy
+from types import SimpleNamespace
+
+from asgiref.testing import ApplicationCommunicator
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from api.models import Subject, Topic, StudySession
+from backend.asgi import application
+
+ORIGIN = settings.CORS_ALLOWED_ORIGINS[0]
+
+
+class WebsocketCommunicator(ApplicationCommunicator):
+    """
+    Minimal WebSocket test client on top of asgiref's ApplicationCommunicator.
+    (channels.testing pulls in daphne, which we don't otherwise need.)
+    """
+
+    def __init__(self, app, path, headers):
+        path, _, query = path.partition('?')
+        super().__init__(app, {
+            'type': 'websocket',
+            'path': path,
+            'query_string': query.encode(),
+            'headers': headers,
+            'subprotocols': [],
+        })
+
+    async def connect(self, timeout=1):
+        await self.send_input({'type': 'websocket.connect'})
+        response = await self.receive_output(timeout)
+        if response['type'] == 'websocket.close':
+            return False, response.get('code', 1000)
+        return True, None
+
+    async def receive_json_from(self, timeout=1):
+        response = await self.receive_output(timeout)
+        return json.loads(response['text'])
+
+    async def disconnect(self, code=1000, timeout=1):
+        await self.send_input({'type': 'websocket.disconnect', 'code': code})
+        await self.wait(timeout)
+
+
+class StatsSocketTests(TransactionTestCase):
+    """Tests for WS /ws/stats/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='live_user', password='pass')
+        self.other = User.objects.create_user(username='other_live', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Maths')
+        self.topic = Topic.objects.create(subject=self.subject, name='Calculus')
+        # Log in synchronously; the async tests reuse the session cookie
+        self.client.force_login(self.user)
+        self.session_cookie = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def _communicator(self, logged_in=True, origin=ORIGIN):
+        headers = [(b'origin', origin.encode())]
+        if logged_in:
+            cookie = f'{settings.SESSION_COOKIE_NAME}={self.session_cookie}'
+            headers.append((b'cookie', cookie.encode()))
+        return WebsocketCommunicator(application, '/ws/stats/?tz=UTC', headers=headers)
+
+    # ── Connect ───────────────────────────────────────────────────────────────
+
+    async def test_connect_sends_snapshot(self):
+        """AC: A new connection receives the full stats snapshot."""
+        comm = self._communicator()
+        connected, _ = await comm.connect()
+        self.assertTrue(connected)
+
+        message = await comm.receive_json_from()
+        self.assertEqual(message['type'], 'snapshot')
+        self.assertEqual(message['stats']['today_seconds'], 0)
+        self.assertEqual(message['stats']['streak'], 0)
+        self.assertEqual(message['stats']['topic_count'], 1)
+        self.assertEqual(message['stats']['mastered_count'], 0)
+        await comm.disconnect()
+
+    async def test_anonymous_connection_rejected(self):
+        """AC: Unauthenticated sockets are closed."""
+        comm = self._communicator(logged_in=False)
+        connected, code = await comm.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4403)
+
+    async def test_foreign_origin_rejected(self):
+        """Sockets from origins outside CORS_ALLOWED_ORIGINS are refused."""
+        comm = self._communicator(origin='https://evil.example')
+        connected, _ = await comm.connect()
+        self.assertFalse(connected)
+
+    # ── Deltas ────────────────────────────────────────────────────────────────
+
+    async def test_session_create_pushes_delta(self):
+        """AC: Logging a session pushes today's seconds and the new streak."""
+        comm = self._communicator()
+        await comm.connect()
+        await comm.receive_json_from()
+
+        @database_sync_to_async
+        def log_session():
+            now = timezone.now()
+            StudySession.objects.create(
+                user=self.user, subject=self.subject,
+                start_time=now - timezone.timedelta(minutes=30), end_time=now,
+                duration_seconds=1800,
+            )
+
+        await log_session()
+        message = await comm.receive_json_from()
+        self.assertEqual(message['type'], 'delta')
+        self.assertEqual(message['changes']['today_seconds'], 1800)
+        self.assertEqual(message['changes']['streak'], 1)
+        self.assertTrue(message['changes']['studied_today'])
+        # Unchanged fields are not resent
+        self.assertNotIn('topic_count', message['changes'])
+        await comm.disconnect()
+
+    async def test_topic_mastered_pushes_delta(self):
+        """AC: Mastering a topic pushes the new mastered count."""
+        comm = self._communicator()
+        await comm.connect()
+        await comm.receive_json_from()
+
+        @database_sync_to_async
+        def master_topic():
+            self.topic.status = 'mastered'
+            self.topic.save()
+
+        await master_topic()
+        message = await comm.receive_json_from()
+        self.assertEqual(message, {'type': 'delta', 'changes': {'mastered_count': 1}})
+        await comm.disconnect()
+
+    async def test_other_users_changes_not_pushed(self):
+        """Data isolation: another user's writes never reach this socket."""
+        comm = self._communicator()
+        await comm.connect()
+        await comm.receive_json_from()
+
+        @database_sync_to_async
+        def other_user_topic():
+            subject = Subject.objects.create(user=self.other, name='Physics')
+            Topic.objects.create(subject=subject, name='Optics')
+
+        await other_user_topic()
+        self.assertTrue(await comm.receive_nothing())
+        await comm.disconnect()
+
+
+class ChannelLayerStartupTests(SimpleTestCase):
+    """gunicorn.conf.py won't fan out across workers over the in-memory layer."""
+
+    def on_starting(self, worker_class, workers):
+        hooks = runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+        cfg = SimpleNamespace(worker_class_str=worker_class, workers=workers)
+        return hooks['on_starting'](SimpleNamespace(cfg=cfg))
+
+    def test_several_asgi_workers_need_shared_layer(self):
+        """AC: Several ASGI workers on the in-memory layer fail at startup."""
+        with self.assertRaisesMessage(RuntimeError, 'CHANNEL_LAYER_BACKEND'):
+            self.on_starting('uvicorn_worker.UvicornWorker', 4)
+
+    def test_allowed_configurations(self):
+        self.on_starting('uvicorn_worker.UvicornWorker', 1)
+        self.on_starting('sync', 4)  # WSGI serves no sockets
+        layers = {'default': {'BACKEND': 'channels_redis.core.RedisChannelLayer'}}
+        with override_settings(CHANNEL_LAYERS=layers):
+            self.on_starting('uvicorn_worker.UvicornWorker', 4)
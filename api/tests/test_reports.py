@@ -3,6 +3,7 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from api.models import Subject, Topic, StudySession
+from api.tests.query_budget import query_budget
 
 
 class WeeklyReportAPITests(APITestCase):
@@ -69,6 +70,45 @@ class WeeklyReportAPITests(APITestCase):
         self.assertEqual(data['session_count'], 1)
         self.assertEqual(data['total_duration_seconds'], 3600)
 
+    # ── Timezone week boundary ───────────────────────────────────────────────
+
+    def test_weekly_report_uses_local_week_bounds(self):
+        """Sunday 20:00 UTC is already Monday in Asia/Kolkata — it belongs to the next week."""
+        from datetime import datetime, timezone as dt_timezone
+        self.client.force_login(self.user)
+        s = self._make_session(duration=1200)
+        s.created_at = datetime(2026, 1, 4, 20, 0, tzinfo=dt_timezone.utc)  # Sun, ISO week 2026-01
+        s.save()
+
+        utc_week = self.client.get(f'{self.url}?week=2026-01&tz=UTC').json()
+        self.assertEqual(utc_week['session_count'], 1)
+
+        ist_week = self.client.get(f'{self.url}?week=2026-01&tz=Asia/Kolkata').json()
+        self.assertEqual(ist_week['session_count'], 0)
+        ist_next = self.client.get(f'{self.url}?week=2026-02&tz=Asia/Kolkata').json()
+        self.assertEqual(ist_next['session_count'], 1)
+        self.assertEqual(ist_next['total_duration_seconds'], 1200)
+
+    # ── Query budget ──────────────────────────────────────────────────────────
+
+    @query_budget(2)
+    def test_weekly_report_query_budget(self, rows):
+        """AC: The weekly report runs a fixed number of queries."""
+        now = timezone.now()
+        StudySession.objects.bulk_create([
+            StudySession(
+                user=self.user, subject=self.subject,
+                start_time=now - timezone.timedelta(minutes=30), end_time=now,
+                duration_seconds=1800,
+            )
+            for _ in range(rows)
+        ])
+        Topic.objects.bulk_create([
+            Topic(subject=self.subject, name=f'Topic {i}', status='mastered') for i in range(rows)
+        ])
+        self.client.force_login(self.user)
+        return lambda: self.client.get(f'{self.url}?tz=UTC')
+
     # ── Auth ──────────────────────────────────────────────────────────────────
 
     def test_unauthenticated_cannot_access_weekly_report(self):
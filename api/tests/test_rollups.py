@@ -0,0 +1,109 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import Subject, StudySession, WeeklyRollup
+from api.rollups import ROLLUP_FIELDS
+
+
+class RangeReportTests(APITestCase):
+    """Tests for GET /api/reports/range/ and the weekly rollup behind it."""
+
+    def setUp(self):
+        self.url = '/api/reports/range/'
+        self.user = User.objects.create_user(username='range_user', password='pass')
+        self.maths = Subject.objects.create(user=self.user, name='Maths')
+        self.physics = Subject.objects.create(user=self.user, name='Physics')
+        self.client.force_login(self.user)
+
+    def _session(self, days_ago, duration=1800, subject=None):
+        created = timezone.now() - timedelta(days=days_ago)
+        session = StudySession.objects.create(
+            user=self.user, subject=subject or self.maths,
+            start_time=created - timedelta(seconds=duration), end_time=created, duration_seconds=duration,
+        )
+        StudySession.objects.filter(pk=session.pk).update(created_at=created, local_date=created.date())
+        # Backdating skips the signals: drop the row stored for the session's original week
+        WeeklyRollup.objects.filter(user=self.user).delete()
+        return session
+
+    def _week(self, weeks_ago):
+        return f"{(timezone.now() - timedelta(weeks=weeks_ago)).date():%G-%V}"
+
+    def _range(self, weeks_back=3, **params):
+        return self.client.get(self.url, {'from_week': self._week(weeks_back), 'to_week': self._week(0), **params})
+
+    def test_matches_weekly_reports(self):
+        """AC: One response carries the same per-week stats as the weekly endpoint."""
+        for days_ago, subject in ((0, self.maths), (1, self.physics), (8, self.maths), (20, self.maths)):
+            self._session(days_ago, subject=subject)
+        response = self._range()
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['weeks']), 4)
+        for weeks_ago, week in zip(range(3, -1, -1), data['weeks']):
+            weekly = self.client.get('/api/reports/weekly/', {'week': self._week(weeks_ago)}).json()
+            self.assertEqual(week, weekly)
+        self.assertEqual(data['totals']['session_count'], 4)
+        self.assertEqual(data['totals']['total_duration_seconds'], 4 * 1800)
+
+    def test_stored_weeks_skip_session_scan(self):
+        """AC: Repeat requests read the rollup table, not the sessions."""
+        self._session(3)
+        first = self._range(weeks_back=15).json()
+        self.assertEqual(WeeklyRollup.objects.filter(user=self.user).count(), 16)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._range(weeks_back=15).json(), first)
+        self.assertFalse([q for q in ctx.captured_queries if 'api_studysession' in q['sql']])
+
+    def test_session_writes_update_rollup(self):
+        """AC: Creating or deleting a session updates the stored week."""
+        self._range()
+        session = self.client.post('/api/sessions/', {
+            'subject': self.maths.id, 'duration_seconds': 600,
+            'start_time': timezone.now().isoformat(), 'end_time': timezone.now().isoformat(),
+        }).json()
+        rollup = WeeklyRollup.objects.get(user=self.user, week=self._monday(0))
+        self.assertEqual((rollup.session_count, rollup.total_duration_seconds, rollup.days_studied), (1, 600, 1))
+
+        StudySession.objects.get(pk=session['id']).delete()
+        rollup.refresh_from_db()
+        self.assertEqual((rollup.session_count, rollup.total_duration_seconds), (0, 0))
+
+    def _monday(self, weeks_ago):
+        day = (timezone.now() - timedelta(weeks=weeks_ago)).date()
+        return day - timedelta(days=day.weekday())
+
+    def test_timezones_roll_up_separately(self):
+        self._session(0)
+        self._range(tz='Asia/Kolkata')
+        self._range(tz='UTC')
+        self.assertEqual(set(WeeklyRollup.objects.values_list('tz', flat=True)), {'Asia/Kolkata', 'UTC'})
+
+    def test_invalid_ranges(self):
+        self.assertEqual(self.client.get(self.url, {'from_week': 'nope'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'from_week': '2026-10', 'to_week': '2026-01'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'from_week': '2020-01', 'to_week': '2026-01'}).status_code, 400)
+        data = self.client.get(self.url).json()  # default: the last 16 weeks
+        self.assertEqual(len(data['weeks']), 16)
+
+    def test_rebuild_command(self):
+        """AC: The rollup can be rebuilt from scratch."""
+        self._session(0)
+        self._session(10)
+        expected = self._range().json()
+        WeeklyRollup.objects.update(session_count=99)  # drift, e.g. from a bulk load
+
+        out = StringIO()
+        call_command('rebuild_weekly_rollups', '--tz', 'Asia/Kolkata', stdout=out)
+        self.assertIn('weekly rollup row(s)', out.getvalue())
+        self.assertEqual(self._range().json(), expected)
+        self.assertTrue(WeeklyRollup.objects.filter(tz='Asia/Kolkata').exists())
+        for row in WeeklyRollup.objects.filter(tz='UTC').values(*ROLLUP_FIELDS):
+            self.assertLess(row['session_count'], 99)
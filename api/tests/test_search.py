@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Subject, Topic, StudySession
+
+
+class SearchTests(APITestCase):
+    """Tests for GET /api/search/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='pass')
+        self.other = User.objects.create_user(username='other', password='pass')
+        self.maths = Subject.objects.create(
+            user=self.user, name='Mathematics', description='Linear algebra and calculus',
+        )
+        self.algebra = Topic.objects.create(subject=self.maths, name='Linear Algebra')
+        self.limits = Topic.objects.create(subject=self.maths, name='Limits')
+        now = timezone.now()
+        self.session = StudySession.objects.create(
+            user=self.user, subject=self.maths, start_time=now, end_time=now,
+            duration_seconds=600, notes='Worked through eigenvalues of symmetric matrices',
+        )
+        other_subject = Subject.objects.create(user=self.other, name='Algebra II')
+        Topic.objects.create(subject=other_subject, name='Abstract algebra')
+        self.client.force_login(self.user)
+
+    def _search(self, q):
+        response = self.client.get('/api/search/', {'q': q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(r['type'], r['id']) for r in response.json()['results']]
+
+    # ── Matching ──────────────────────────────────────────────────────────────
+
+    def test_ranked_across_topics_subjects_and_notes(self):
+        """AC: Name matches rank above description matches; other users never match."""
+        self.assertEqual(
+            self._search('algebra'),
+            [('topic', self.algebra.id), ('subject', self.maths.id)],
+        )
+        self.assertEqual(self._search('eigenvalue'), [('session', self.session.id)])
+
+    def test_words_match_as_prefixes(self):
+        self.assertEqual(self._search('lin alg'), [('topic', self.algebra.id), ('subject', self.maths.id)])
+        self.assertEqual(self._search('lim'), [('topic', self.limits.id)])
+
+    def test_result_fields(self):
+        result = self.client.get('/api/search/', {'q': 'eigenvalues'}).json()['results'][0]
+        self.assertEqual(result['subject'], self.maths.id)
+        self.assertEqual(result['subject_name'], 'Mathematics')
+        self.assertIn('eigenvalues', result['text'])
+
+    def test_blank_query_returns_nothing(self):
+        self.assertEqual(self._search('  ?! '), [])
+
+    # ── Kept in sync on writes ────────────────────────────────────────────────
+
+    def test_index_follows_writes(self):
+        """AC: Creates, renames, bulk imports and deletes are searchable immediately."""
+        self.client.patch(f'/api/topics/{self.limits.id}/', {'name': 'Taylor series'}, format='json')
+        self.assertEqual(self._search('limits'), [])
+        self.assertEqual(self._search('taylor'), [('topic', self.limits.id)])
+
+        self.client.post(
+            f'/api/subjects/{self.maths.id}/parse-syllabus/', {'topics': ['Fourier series']}, format='json',
+        )
+        self.assertEqual(len(self._search('series')), 2)
+
+        self.session.notes = ''
+        self.session.save()
+        self.assertEqual(self._search('eigenvalues'), [])
+
+        self.client.delete(f'/api/subjects/{self.maths.id}/')
+        self.assertEqual(self._search('algebra'), [])
+
+    def test_rebuild_command(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite FTS5 index only')
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM api_search')
+        self.assertEqual(self._search('algebra'), [])
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('indexed 6 row(s)', out.getvalue())
+        self.assertEqual(len(self._search('algebra')), 2)
+
+    def test_unauthenticated(self):
+        self.client.logout()
+        response = self.client.get('/api/search/', {'q': 'algebra'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
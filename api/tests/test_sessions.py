@@ -1,3 +1,5 @@
+import uuid
+
 from django.contrib.auth.models import User
 from datetime import datetime, timedelta, timezone as dt_timezone
 from django.urls import reverse
@@ -5,6 +7,7 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from api.models import Subject, Topic, StudySession
+from api.tests.query_budget import query_budget
 
 
 class SessionAPITests(APITestCase):
@@ -48,6 +51,61 @@ class SessionAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertIsNone(StudySession.objects.get(user=self.user_a).topic)
 
+    # ── Idempotent retries ─────────────────────────────────────────────────────
+
+    def test_cannot_log_time_to_other_users_subject_or_topic(self):
+        """AC: A session can't reference another user's subject or topic, nor change its counters."""
+        self.client.force_login(self.user_b)
+        own = Subject.objects.create(user=self.user_b, name='Art')
+        for payload in (
+            {**self.valid_payload, 'topic': None},
+            {**self.valid_payload, 'subject': own.id},
+        ):
+            response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(StudySession.objects.exists())
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.total_study_seconds, 0)
+
+    def test_retry_with_idempotency_key_returns_first_session(self):
+        """AC: Retrying a create with the same Idempotency-Key doesn't duplicate the session."""
+        self.client.force_login(self.user_a)
+        key = str(uuid.uuid4())
+        first = self.client.post(self.url, self.valid_payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+        retry = self.client.post(self.url, self.valid_payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(first.json()['client_id'], key)
+        self.assertEqual(StudySession.objects.filter(user=self.user_a).count(), 1)
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.total_study_seconds, 1800)
+
+    def test_client_id_in_body_and_per_user(self):
+        """AC: A client_id field dedupes the same way, per user."""
+        client_id = str(uuid.uuid4())
+        payload = {**self.valid_payload, 'client_id': client_id}
+        self.client.force_login(self.user_a)
+        self.assertEqual(self.client.post(self.url, payload, format='json').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.post(self.url, payload, format='json').status_code, status.HTTP_200_OK)
+
+        other = Subject.objects.create(user=self.user_b, name='Art')
+        self.client.force_login(self.user_b)
+        response = self.client.post(self.url, {**payload, 'subject': other.id, 'topic': None}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(StudySession.objects.filter(client_id=client_id).count(), 2)
+
+    def test_invalid_idempotency_keys(self):
+        self.client.force_login(self.user_a)
+        response = self.client.post(self.url, self.valid_payload, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            self.url, {**self.valid_payload, 'client_id': str(uuid.uuid4())}, format='json',
+            HTTP_IDEMPOTENCY_KEY=str(uuid.uuid4()),
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(StudySession.objects.exists())
+
     # ── Data isolation ─────────────────────────────────────────────────────────
 
     def test_list_sessions_scoped_to_user(self):
@@ -182,6 +240,33 @@ class SessionAPITests(APITestCase):
         # Let's at least verify it doesn't crash and returns the streak.
         self.assertIn('streak', response_tz.json())
 
+    # ── Query budget ──────────────────────────────────────────────────────────
+
+    def _bulk_sessions(self, rows):
+        now = timezone.now()
+        StudySession.objects.bulk_create([
+            StudySession(
+                user=self.user_a, subject=self.subject, topic=self.topic,
+                start_time=now - timedelta(hours=i, minutes=30), end_time=now - timedelta(hours=i),
+                duration_seconds=1800,
+            )
+            for i in range(rows)
+        ])
+
+    @query_budget(2)
+    def test_list_query_budget(self, rows):
+        """AC: Session list doesn't look up subject/topic names per session."""
+        self._bulk_sessions(rows)
+        self.client.force_login(self.user_a)
+        return lambda: self.client.get(self.url)
+
+    @query_budget(1)
+    def test_streak_query_budget(self, rows):
+        """Streak is one query however long the history."""
+        self._bulk_sessions(rows)
+        self.client.force_login(self.user_a)
+        return lambda: self.client.get('/api/sessions/streak/')
+
     # ── Filters ───────────────────────────────────────────────────────────────
 
     def test_filter_sessions_by_subject(self):
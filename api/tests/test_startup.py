@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from unittest.mock import patch
+
+from django.conf import settings
+from rest_framework.test import APITestCase
+
+from api.lazy_imports import LazyImport
+
+
+class LazyImportTests(APITestCase):
+    """Heavy optional dependencies stay out of worker start-up."""
+
+    def test_urlconf_import_skips_heavy_dependencies(self):
+        """AC: Loading every view imports neither pypdf nor the Groq SDK."""
+        probe = (
+            'import sys, django; django.setup(); '
+            'from django.urls import get_resolver; get_resolver().url_patterns; '
+            'print(sorted(m for m in ("pypdf", "groq") if m in sys.modules))'
+        )
+        out = subprocess.run(
+            [sys.executable, '-c', probe], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(out.strip().splitlines()[-1], '[]')
+
+    def test_lazy_import_resolves_on_first_use(self):
+        lazy = LazyImport('json', 'dumps')
+        with patch('api.lazy_imports.import_module', wraps=__import__('importlib').import_module) as importer:
+            self.assertEqual(lazy([1]), '[1]')
+            self.assertEqual(lazy.__name__, 'dumps')
+        importer.assert_called_once_with('json')
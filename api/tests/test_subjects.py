@@ -1,7 +1,8 @@
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from rest_framework import status
-from api.models import Subject
+from api.models import Subject, Topic
+from api.tests.query_budget import query_budget
 
 
 class SubjectAPITests(APITestCase):
@@ -35,6 +36,13 @@ class SubjectAPITests(APITestCase):
         self.assertIn('Mathematics', names)
         self.assertNotIn('Physics', names)
 
+    def test_list_subjects_newest_first(self):
+        """Subjects keep their newest-first order alongside the annotated counts."""
+        newer = Subject.objects.create(user=self.user_a, name='Chemistry')
+        self.client.force_login(self.user_a)
+        results = self.client.get(self.url).json()['results']
+        self.assertEqual([s['id'] for s in results], [newer.id, self.subject_a.id])
+
     # ─── Create ───────────────────────────────────────────────────────────────
 
     def test_create_subject_sets_user_automatically(self):
@@ -94,6 +102,27 @@ class SubjectAPITests(APITestCase):
         response = self.client.delete(detail_url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    # ─── Query budget ─────────────────────────────────────────────────────────
+
+    @query_budget(2)
+    def test_list_query_budget(self, rows):
+        """AC: Listing subjects with topic counts doesn't query per subject."""
+        subjects = Subject.objects.bulk_create([
+            Subject(user=self.user_a, name=f'Subject {i}') for i in range(rows)
+        ])
+        Topic.objects.bulk_create([Topic(subject=s, name='Intro', status='mastered') for s in subjects])
+        self.client.force_login(self.user_a)
+        return lambda: self.client.get(self.url)
+
+    @query_budget(1)
+    def test_detail_query_budget(self, rows):
+        """Subject detail counts topics in SQL, whatever the syllabus size."""
+        Topic.objects.bulk_create([
+            Topic(subject=self.subject_a, name=f'Topic {i}') for i in range(rows)
+        ])
+        self.client.force_login(self.user_a)
+        return lambda: self.client.get(f'{self.url}{self.subject_a.id}/')
+
     # ─── Auth ─────────────────────────────────────────────────────────────────
 
     def test_unauthenticated_cannot_access_subjects(self):
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 from api.models import Subject, Topic
@@ -29,7 +31,7 @@ class ParseSyllabusTests(APITestCase):
         response = self.client.post(self.url, {'topics': topics}, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        names = [t['name'] for t in response.json()]
+        names = [t['name'] for t in response.json()['topics']]
         self.assertListEqual(sorted(names), sorted(topics))
 
     def test_parse_syllabus_rejects_other_users_subject(self):
@@ -58,8 +60,9 @@ class ParseSyllabusTests(APITestCase):
         response = self.client.post(self.url, payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(len(response.json()), 1)
-        self.assertEqual(response.json()[0]['name'], 'Valid Topic')
+        data = response.json()
+        self.assertEqual((data['created'], data['skipped']), (1, 3))
+        self.assertEqual(data['topics'][0]['name'], 'Valid Topic')
 
     def test_topic_count_updates_after_parse(self):
         """AC: topic_count on subject reflects real count after bulk create."""
@@ -69,6 +72,50 @@ class ParseSyllabusTests(APITestCase):
         response = self.client.get(f'/api/subjects/{self.subject.id}/')
         self.assertEqual(response.json()['topic_count'], 3)
 
+    # ── De-duplication ────────────────────────────────────────────────────────
+
+    def test_reimport_skips_existing_topics(self):
+        """AC: Re-importing a syllabus only creates the topics the subject lacks."""
+        self.client.force_login(self.user)
+        Topic.objects.create(subject=self.subject, name='Linear Algebra')
+        payload = {'topics': ['Calculus', '  linear   ALGEBRA ', 'Statistics', 'calculus']}
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.json()
+        self.assertEqual((data['created'], data['skipped']), (2, 2))
+        self.assertEqual([t['name'] for t in data['topics']], ['Calculus', 'Statistics'])
+
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.json()['created'], response.json()['skipped']), (0, 4))
+        self.assertEqual(Topic.objects.filter(subject=self.subject).count(), 3)
+
+    def test_names_are_normalized(self):
+        """Surrounding and repeated whitespace is collapsed before saving."""
+        self.client.force_login(self.user)
+        self.client.post(self.url, {'topics': ['  Partial \t  fractions\n']}, format='json')
+        self.assertEqual(Topic.objects.get(subject=self.subject).name, 'Partial fractions')
+
+    def test_duplicates_in_other_subjects_are_kept(self):
+        """De-duplication is per subject."""
+        other = Subject.objects.create(user=self.user, name='Physics')
+        Topic.objects.create(subject=other, name='Calculus')
+        self.client.force_login(self.user)
+        response = self.client.post(self.url, {'topics': ['Calculus']}, format='json')
+        self.assertEqual(response.json()['created'], 1)
+
+    def test_large_import_keeps_order(self):
+        """AC: Thousands of lines import in order, in batched inserts."""
+        self.client.force_login(self.user)
+        names = [f'Topic {i}' for i in range(3000)]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, {'topics': names}, format='json')
+        self.assertEqual(response.json()['created'], 3000)
+        self.assertLess(len(ctx.captured_queries), 50)
+        saved = list(Topic.objects.filter(subject=self.subject).order_by('id').values_list('name', flat=True))
+        self.assertEqual(saved, names)
+
     def test_unauthenticated_cannot_parse(self):
         """Unauthenticated access returns 403."""
         response = self.client.post(self.url, {'topics': ['X']}, format='json')
@@ -0,0 +1,181 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api import sync
+from api.models import Subject, StudySession, SyncChange, Topic
+
+
+class SyncTests(APITestCase):
+    """Tests for GET/POST /api/sync/ and the change cursor behind them."""
+
+    def setUp(self):
+        self.url = '/api/sync/'
+        self.user = User.objects.create_user(username='sync_user', password='pass')
+        self.maths = Subject.objects.create(user=self.user, name='Maths')
+        self.limits = Topic.objects.create(subject=self.maths, name='Limits')
+        self.client.force_login(self.user)
+
+    def _sync(self, since=None):
+        response = self.client.get(self.url, {'since': since} if since is not None else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def _session_data(self, **extra):
+        now = timezone.now().isoformat()
+        return {'subject': self.maths.id, 'start_time': now, 'end_time': now, 'duration_seconds': 600, **extra}
+
+    def test_full_snapshot_then_empty_delta(self):
+        """AC: A first sync returns everything; a sync with nothing new is empty."""
+        snapshot = self._sync()
+        self.assertTrue(snapshot['full'])
+        self.assertEqual([s['name'] for s in snapshot['subjects']], ['Maths'])
+        self.assertEqual([t['name'] for t in snapshot['topics']], ['Limits'])
+        self.assertEqual(snapshot['topics'], self.client.get('/api/topics/').json()['results'])
+
+        self.client.get('/api/auth/user/')  # warm the auth cache
+        # the cursor and the change rows; no table is read for kinds with no changes
+        with self.assertNumQueries(2):
+            delta = self._sync(snapshot['cursor'])
+        self.assertEqual(delta, {
+            'cursor': snapshot['cursor'], 'full': False, 'subjects': [], 'topics': [], 'sessions': [],
+            'deleted': {'subjects': [], 'topics': [], 'sessions': []},
+        })
+
+    def test_delta_has_changes_and_tombstones(self):
+        """AC: Created, updated and deleted rows since the cursor, and nothing older."""
+        other = Subject.objects.create(user=self.user, name='Physics')
+        optics = Topic.objects.create(subject=other, name='Optics')
+        cursor = self._sync()['cursor']
+
+        self.client.patch(f'/api/topics/{self.limits.id}/', {'status': 'mastered'})
+        session = self.client.post('/api/sessions/', self._session_data()).json()
+        optics_id, other_id = optics.id, other.id
+        optics.delete()
+        delta = self._sync(cursor)
+
+        self.assertGreater(delta['cursor'], cursor)
+        self.assertEqual([t['id'] for t in delta['topics']], [self.limits.id])
+        self.assertEqual(delta['topics'][0]['status'], 'mastered')
+        self.assertEqual([s['id'] for s in delta['sessions']], [session['id']])
+        # Counter changes come with the subject rows
+        self.assertEqual({s['id']: s['mastered_count'] for s in delta['subjects']}, {self.maths.id: 1, other.id: 0})
+        self.assertEqual(delta['deleted']['topics'], [optics_id])
+
+        other.delete()
+        later = self._sync(delta['cursor'])
+        self.assertEqual(later['deleted'], {'subjects': [other_id], 'topics': [], 'sessions': []})
+
+    def test_reorder_and_other_users(self):
+        """Bulk topic writes are logged; other users' changes never appear."""
+        second = Topic.objects.create(subject=self.maths, name='Derivatives')
+        cursor = self._sync()['cursor']
+        intruder = User.objects.create_user(username='intruder', password='pass')
+        Subject.objects.create(user=intruder, name='Chemistry')
+
+        self.client.post(
+            f'/api/subjects/{self.maths.id}/reorder-topics/', {'topics': [second.id, self.limits.id]}, format='json',
+        )
+        delta = self._sync(cursor)
+        self.assertEqual(sorted(t['id'] for t in delta['topics']), sorted([self.limits.id, second.id]))
+        self.assertEqual(delta['subjects'], [])
+        self.assertEqual(set(SyncChange.objects.filter(user=intruder).values_list('kind', flat=True)), {'subject'})
+
+    def test_stale_or_invalid_cursor(self):
+        self.assertTrue(self._sync(10 ** 9)['full'])
+        self.assertEqual(self.client.get(self.url, {'since': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'since': -1}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_applies_once(self):
+        """AC: Offline writes are applied in one request, and a retried batch is a no-op."""
+        batch = {
+            'batch_id': str(uuid.uuid4()),
+            'sessions': [self._session_data(notes='on the train'), self._session_data(duration_seconds=300)],
+            'topics': [{'id': self.limits.id, 'status': 'in_progress'}],
+        }
+        response = self.client.post(self.url, batch, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.json()['sessions']), 2)
+        self.assertEqual(response.json()['topics'][0]['status'], 'in_progress')
+
+        retry = self.client.post(self.url, batch, format='json')
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.json(), response.json())
+        self.assertEqual(StudySession.objects.filter(user=self.user).count(), 2)
+        self.maths.refresh_from_db()
+        self.assertEqual(self.maths.total_study_seconds, 900)
+
+    def test_batch_sessions_deduped_by_client_id(self):
+        """AC: A session already created by a direct POST isn't created again by a batch replay."""
+        client_id = str(uuid.uuid4())
+        self.client.post('/api/sessions/', self._session_data(), format='json', HTTP_IDEMPOTENCY_KEY=client_id)
+        batch = {
+            'batch_id': str(uuid.uuid4()),
+            'sessions': [self._session_data(client_id=client_id), self._session_data(client_id=str(uuid.uuid4()))],
+        }
+        response = self.client.post(self.url, batch, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['sessions'][0]['client_id'], client_id)
+        self.assertEqual(StudySession.objects.filter(user=self.user).count(), 2)
+
+    def test_invalid_batch_writes_nothing(self):
+        batch_id = str(uuid.uuid4())
+        bad_session = {'batch_id': batch_id, 'sessions': [self._session_data(), {'subject': self.maths.id}]}
+        foreign = Topic.objects.create(
+            subject=Subject.objects.create(user=User.objects.create_user(username='other'), name='Art'), name='Colour',
+        )
+        for body in (
+            bad_session,
+            {'batch_id': batch_id, 'topics': [{'id': foreign.id, 'status': 'mastered'}]},
+            {'batch_id': batch_id, 'topics': [{'id': self.limits.id, 'status': 'done'}]},
+            {'batch_id': 'nope'},
+        ):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(StudySession.objects.exists())
+        self.limits.refresh_from_db()
+        self.assertEqual(self.limits.status, 'not_started')
+        # The rejected batch id is still free
+        response = self.client.post(self.url, {'batch_id': batch_id, 'sessions': [self._session_data()]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_batch_body_must_be_an_object(self):
+        response = self.client.post(self.url, [{'batch_id': str(uuid.uuid4())}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.json())
+
+    def test_deleting_user_logs_no_tombstones(self):
+        """Deleting an account cascades through its rows without writing sync changes for it."""
+        now = timezone.now()
+        StudySession.objects.create(
+            user=self.user, subject=self.maths, topic=self.limits, start_time=now, end_time=now, duration_seconds=600,
+        )
+        user_id = self.user.id
+        self.user.delete()
+        self.assertFalse(Subject.objects.exists())
+        self.assertFalse(SyncChange.objects.filter(user_id=user_id).exists())
+
+        # The admin's bulk action deletes a queryset
+        other = User.objects.create_user(username='other', password='pass')
+        Topic.objects.create(subject=Subject.objects.create(user=other, name='Art'), name='Colour')
+        User.objects.filter(pk=other.pk).delete()
+        self.assertFalse(SyncChange.objects.exists())
+
+    def test_batch_cannot_touch_other_users_rows(self):
+        """AC: Batch sessions must use the user's own subjects; no write rewrites another user's change rows."""
+        cursor = self._sync()['cursor']
+        intruder = User.objects.create_user(username='intruder', password='pass')
+        self.client.force_login(intruder)
+        for session in (self._session_data(), self._session_data(subject=None, topic=self.limits.id)):
+            response = self.client.post(self.url, {'batch_id': str(uuid.uuid4()), 'sessions': [session]}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(StudySession.objects.exists())
+
+        sync.record(intruder.id, {'subject': [self.maths.id]})
+        self.assertEqual(SyncChange.objects.get(user=self.user, kind='subject', object_id=self.maths.id).version, cursor)
+        self.client.force_login(self.user)
+        self.maths.save()
+        self.assertEqual([s['id'] for s in self._sync(cursor)['subjects']], [self.maths.id])
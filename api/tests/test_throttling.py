@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from api.models import Subject
+from api.throttling import SlidingWindowThrottle
+
+
+def rates(**scopes):
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': scopes})
+
+
+class ThrottleTests(APITestCase):
+    """Per-user sliding-window budgets, per endpoint scope and for writes."""
+
+    def setUp(self):
+        caches['throttle'].clear()
+        self.user = User.objects.create_user(username='busy_user', password='pass')
+        self.other = User.objects.create_user(username='quiet_user', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Physics')
+        self.client.force_login(self.user)
+
+    @rates(ai_parse='2/hour')
+    def test_ai_parse_budget(self):
+        """AC: The AI parse has its own budget; the 429 carries Retry-After."""
+        url = f'/api/subjects/{self.subject.id}/ai-parse-syllabus/'
+        for _ in range(2):
+            self.assertEqual(self.client.post(url).status_code, 400)  # no file, but counted
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(3590 <= int(response['Retry-After']) <= 3600)
+        # Other endpoints and other users are unaffected
+        self.assertEqual(self.client.get('/api/subjects/').status_code, 200)
+        self.client.force_login(self.other)
+        other_subject = Subject.objects.create(user=self.other, name='Chemistry')
+        self.assertEqual(self.client.post(f'/api/subjects/{other_subject.id}/ai-parse-syllabus/').status_code, 400)
+
+    @rates(reports='3/min')
+    def test_report_budget(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get('/api/reports/weekly/').status_code, 200)
+        self.assertEqual(self.client.get('/api/sessions/streak/').status_code, 429)  # shared scope
+        self.assertEqual(self.client.get('/api/sessions/').status_code, 200)
+
+    @rates(writes='2/min')
+    def test_write_budget(self):
+        """AC: Writes share a budget; reads keep working once it is spent."""
+        self.assertEqual(self.client.post('/api/subjects/', {'name': 'A'}).status_code, 201)
+        self.assertEqual(self.client.post('/api/subjects/', {'name': 'B'}).status_code, 201)
+        self.assertEqual(self.client.delete(f'/api/subjects/{self.subject.id}/').status_code, 429)
+        self.assertEqual(self.client.get('/api/subjects/').status_code, 200)
+
+    @rates(user='2/min')
+    def test_sliding_window(self):
+        """A slot opens when the oldest request leaves the window, not at a fixed reset."""
+        with patch.object(SlidingWindowThrottle, 'timer') as timer:
+            for now in (1000, 1030):
+                timer.return_value = now
+                self.assertEqual(self.client.get('/api/subjects/').status_code, 200)
+            timer.return_value = 1040
+            response = self.client.get('/api/subjects/')
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '20')
+            timer.return_value = 1061
+            self.assertEqual(self.client.get('/api/subjects/').status_code, 200)
+            self.assertEqual(self.client.get('/api/subjects/').status_code, 429)
+
+    def test_unlisted_scope_unlimited(self):
+        with rates():
+            for _ in range(5):
+                self.assertEqual(self.client.get('/api/reports/weekly/').status_code, 200)
@@ -0,0 +1,111 @@
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.models import Subject, Topic
+
+
+class TopicOrderTests(APITestCase):
+    """Topic.position, POST /api/subjects/{id}/reorder-topics/ and /api/topics/{id}/move/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='order_user', password='pass')
+        self.subject = Subject.objects.create(user=self.user, name='Maths')
+        self.topics = [Topic.objects.create(subject=self.subject, name=name) for name in 'ABCD']
+        self.client.force_login(self.user)
+
+    def _names(self):
+        response = self.client.get(f'/api/topics/?subject={self.subject.id}')
+        return ''.join(t['name'] for t in response.json()['results'])
+
+    def _move(self, topic, after):
+        return self.client.post(
+            f'/api/topics/{topic.id}/move/', {'after': after.id if after else None}, format='json',
+        )
+
+    # ── Numbering ─────────────────────────────────────────────────────────────
+
+    def test_new_topics_are_appended_with_gaps(self):
+        """AC: Topics are numbered POSITION_GAP apart in creation order."""
+        gap = Topic.POSITION_GAP
+        self.assertEqual([t.position for t in self.topics], [gap, 2 * gap, 3 * gap, 4 * gap])
+
+        self.client.post(
+            f'/api/subjects/{self.subject.id}/parse-syllabus/', {'topics': ['E', 'F']}, format='json',
+        )
+        self.client.post('/api/topics/', {'subject': self.subject.id, 'name': 'G'}, format='json')
+        self.assertEqual(self._names(), 'ABCDEFG')
+
+    def test_topic_moved_to_other_subject_goes_last(self):
+        other = Subject.objects.create(user=self.user, name='Physics')
+        last = Topic.objects.create(subject=other, name='Vectors')
+        self.client.patch(f'/api/topics/{self.topics[0].id}/', {'subject': other.id}, format='json')
+        self.topics[0].refresh_from_db()
+        self.assertGreater(self.topics[0].position, last.position)
+
+    # ── Move ──────────────────────────────────────────────────────────────────
+
+    def test_move_updates_only_the_moved_topic(self):
+        """AC: A single move takes the midpoint between its new neighbours."""
+        a, b, c, d = self.topics
+        response = self._move(d, after=a)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._names(), 'ADBC')
+        self.assertEqual(
+            list(Topic.objects.exclude(pk=d.pk).values_list('position', flat=True)),
+            [a.position, b.position, c.position],
+        )
+        self._move(c, after=None)
+        self.assertEqual(self._names(), 'CADB')
+
+    def test_move_renumbers_when_gap_is_used_up(self):
+        a, b, c, d = self.topics
+        Topic.objects.filter(pk=b.pk).update(position=a.position + 1)
+        self._move(d, after=a)
+        self.assertEqual(self._names(), 'ADBC')
+        positions = list(Topic.objects.values_list('position', flat=True))
+        self.assertEqual(positions, [Topic.POSITION_GAP * i for i in range(1, 5)])
+
+    def test_move_rejects_topic_of_other_subject(self):
+        other = Subject.objects.create(user=self.user, name='Physics')
+        foreign = Topic.objects.create(subject=other, name='Vectors')
+        response = self._move(self.topics[0], after=foreign)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ── Reorder ───────────────────────────────────────────────────────────────
+
+    def test_reorder_rewrites_positions_in_one_statement(self):
+        """AC: The bulk reorder endpoint is a single UPDATE."""
+        a, b, c, d = self.topics
+        url = f'/api/subjects/{self.subject.id}/reorder-topics/'
+        self.client.get('/api/auth/user/')  # warm the auth cache
+        # subject, its topic ids, the UPDATE, the sync log (cursor bump and
+        # read, upsert), the re-read
+        with self.assertNumQueries(7):
+            response = self.client.post(url, {'topics': [c.id, a.id, d.id, b.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(''.join(t['name'] for t in response.json()), 'CADB')
+        self.assertEqual(self._names(), 'CADB')
+
+    def test_reorder_requires_every_topic_once(self):
+        a, b, c, d = self.topics
+        url = f'/api/subjects/{self.subject.id}/reorder-topics/'
+        for topics in ([a.id, b.id, c.id], [a.id, b.id, c.id, d.id, d.id], 'abc'):
+            response = self.client.post(url, {'topics': topics}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self._names(), 'ABCD')
+
+    def test_reorder_other_users_subject(self):
+        other_user = User.objects.create_user(username='other', password='pass')
+        other = Subject.objects.create(user=other_user, name='Physics')
+        response = self.client.post(f'/api/subjects/{other.id}/reorder-topics/', {'topics': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    # ── Recommendations ───────────────────────────────────────────────────────
+
+    def test_recommendation_follows_syllabus_order(self):
+        """AC: Among equal candidates the recommendation is the first in position order."""
+        a, b, c, d = self.topics
+        self._move(c, after=None)
+        response = self.client.get(f'/api/subjects/{self.subject.id}/recommend-topic/')
+        self.assertEqual(response.json()['name'], 'C')
@@ -2,6 +2,7 @@ from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from rest_framework import status
 from api.models import Subject, Topic
+from api.tests.query_budget import query_budget
 
 
 class TopicAPITests(APITestCase):
@@ -90,6 +91,17 @@ class TopicAPITests(APITestCase):
         response = self.client.patch(url, {'name': 'Hacked'}, format='json')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_cannot_move_topic_into_other_users_subject(self):
+        """Data isolation: PATCHing subject to another user's subject is refused."""
+        self.client.force_login(self.user_a)
+        url = f'{self.url}{self.topic_a.id}/'
+        response = self.client.patch(url, {'subject': self.subject_b.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.topic_a.refresh_from_db()
+        self.assertEqual(self.topic_a.subject_id, self.subject_a.id)
+        self.subject_b.refresh_from_db()
+        self.assertEqual(self.subject_b.topic_count, 1)
+
     # ─── Delete ───────────────────────────────────────────────────────────────
 
     def test_delete_topic(self):
@@ -107,6 +119,17 @@ class TopicAPITests(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    # ─── Query budget ─────────────────────────────────────────────────────────
+
+    @query_budget(2)
+    def test_list_query_budget(self, rows):
+        """AC: Topic list cost doesn't grow with the number of topics."""
+        Topic.objects.bulk_create([
+            Topic(subject=self.subject_a, name=f'Topic {i}') for i in range(rows)
+        ])
+        self.client.force_login(self.user_a)
+        return lambda: self.client.get(f'{self.url}?subject={self.subject_a.id}')
+
     # ─── Auth ─────────────────────────────────────────────────────────────────
 
     def test_unauthenticated_cannot_access_topics(self):
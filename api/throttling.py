@@ -0,0 +1,79 @@
+"""
+throttling.py — Per-user request budgets.
+
+Three throttles run on every API view (``DEFAULT_THROTTLE_CLASSES``):
+
+- ``UserThrottle``: everything a user sends, scope ``user``.
+- ``WriteThrottle``: a user's POST/PUT/PATCH/DELETE requests, scope ``writes``.
+- ``EndpointThrottle``: views that set ``throttle_scope`` get a budget of
+  their own on top, e.g. ``ai_parse`` for the LLM-backed syllabus parser and
+  ``reports`` for the report endpoints.
+
+Rates (``'10/hour'``, ``'60/min'``) come from
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``; a scope without a rate isn't
+limited. Each budget is a sliding window: the timestamps of the requests
+made in the last period are kept in the ``throttle`` cache, and a request
+is refused while the window is full. The 429 response carries
+``Retry-After``, the seconds until the oldest request leaves the window.
+
+The ``throttle`` cache is per-process memory by default, so with several
+workers the effective budget is the rate times the worker count; point
+``THROTTLE_CACHE_BACKEND`` at a shared cache for exact limits.
+"""
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """``SimpleRateThrottle`` keyed by user, with an exact ``Retry-After``."""
+
+    cache = ConnectionProxy(caches, 'throttle')
+    cache_format = 'throttle.%(scope)s.%(ident)s'
+
+    def get_rate(self):
+        # Read per call, so rate changes (and override_settings) apply at once
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        user = request.user
+        ident = f'u{user.pk}' if user and user.is_authenticated else self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def wait(self):
+        # History is newest first: a slot opens when the request at position
+        # num_requests - 1 falls out of the window.
+        if len(self.history) < self.num_requests:
+            return None
+        return max(self.history[self.num_requests - 1] + self.duration - self.now, 0)
+
+
+class UserThrottle(SlidingWindowThrottle):
+    scope = 'user'
+
+
+class WriteThrottle(SlidingWindowThrottle):
+    scope = 'writes'
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        return super().allow_request(request, view)
+
+
+class EndpointThrottle(SlidingWindowThrottle):
+    """Budget named by the view's ``throttle_scope``; views without one pass."""
+
+    def __init__(self):
+        pass  # the rate depends on the view; resolved in allow_request
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, 'throttle_scope', None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,76 @@
+"""
+topic_import.py — Bulk syllabus import shared by the parse-syllabus views.
+
+Names are normalized (surrounding and repeated whitespace collapsed) and
+compared case-insensitively, so re-importing a syllabus, or a syllabus that
+lists a topic twice, only adds the topics the subject doesn't have yet.
+Existing names are read with one query per import, new topics are appended
+after the subject's last topic, in syllabus order, in batches of
+``BATCH_SIZE``, and the whole import runs in one transaction with the
+subject row locked, so two concurrent imports of the same syllabus can't
+both insert it.
+"""
+
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from . import counters, sync
+from .models import Subject, Topic
+
+BATCH_SIZE = 500
+
+NAME_MAX_LENGTH = Topic._meta.get_field('name').max_length
+
+
+@dataclass
+class ImportResult:
+    topics: list = field(default_factory=list)   # created, in syllabus order
+    skipped: int = 0                              # duplicates and blank names
+
+    @property
+    def created(self):
+        return len(self.topics)
+
+
+def normalize_name(name):
+    """``'  Linear   algebra '`` → ``'Linear algebra'``; non-strings → ``''``."""
+    if not isinstance(name, str):
+        return ''
+    return ' '.join(name.split())[:NAME_MAX_LENGTH]
+
+
+def name_key(name):
+    return name.casefold()
+
+
+def import_topics(subject, items, batch_size=BATCH_SIZE):
+    """
+    Create a topic for each item of ``items`` the subject doesn't already have.
+
+    Each item is a dict of Topic fields with at least ``name``. Items with a
+    blank name, or whose name matches an existing topic or an earlier item,
+    are counted as skipped.
+    """
+    result = ImportResult()
+    with transaction.atomic():
+        list(Subject.objects.select_for_update().filter(pk=subject.pk).order_by().values_list('pk'))
+        existing = list(Topic.objects.filter(subject=subject).order_by().values_list('name', 'position'))
+        seen = {name_key(name) for name, _ in existing}
+        position = max((p for _, p in existing), default=0)
+        new_topics = []
+        for item in items:
+            name = normalize_name(item.get('name'))
+            key = name_key(name)
+            if not name or key in seen:
+                result.skipped += 1
+                continue
+            seen.add(key)
+            position += Topic.POSITION_GAP
+            new_topics.append(Topic(subject=subject, **{**item, 'name': name, 'position': position}))
+
+        if new_topics:
+            result.topics = Topic.objects.bulk_create(new_topics, batch_size=batch_size)
+            counters.topics_added(subject.pk, len(result.topics))
+            sync.record(subject.user_id, {'topic': [t.pk for t in result.topics], 'subject': [subject.pk]})
+    return result
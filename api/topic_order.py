@@ -0,0 +1,72 @@
+"""
+topic_order.py — Syllabus order of a subject's topics.
+
+``Topic.position`` is numbered in steps of ``GAP`` (new topics are appended
+``GAP`` after the last one by ``Topic.save``), so a topic can be moved
+between two neighbours by giving it the midpoint of their positions, one
+single-row UPDATE. Only when two neighbours end up adjacent is the subject
+renumbered, and renumbering (like a full reorder from the client) is a
+single ``UPDATE ... SET position = CASE id WHEN ... END``. Both log the
+moved topics for delta sync (sync.py).
+
+Topics are read in ``(subject, position)`` index order (``Topic.Meta.ordering``).
+"""
+
+from django.db import transaction
+from django.db.models import Case, PositiveIntegerField, Value, When
+
+from . import sync
+from .models import Topic
+
+GAP = Topic.POSITION_GAP
+
+
+def renumber(subject_id, topic_ids, user_id):
+    """
+    Set the subject's topics to ``topic_ids`` order, ``GAP`` apart, in one
+    statement. ``user_id`` owns the subject; its sync log records the move.
+    """
+    if not topic_ids:
+        return 0
+    updated = Topic.objects.filter(subject_id=subject_id, pk__in=topic_ids).update(
+        position=Case(
+            *[When(pk=pk, then=Value((i + 1) * GAP)) for i, pk in enumerate(topic_ids)],
+            default='position',
+            output_field=PositiveIntegerField(),
+        )
+    )
+    sync.record(user_id, {'topic': topic_ids})
+    return updated
+
+
+def move(topic, after_id, user_id):
+    """
+    Move ``topic`` (owned by ``user_id``) to just after the topic
+    ``after_id`` of the same subject, or to the top when ``after_id`` is
+    None. Raises Topic.DoesNotExist when ``after_id`` isn't a topic of the
+    subject.
+    """
+    with transaction.atomic():
+        siblings = Topic.objects.filter(subject_id=topic.subject_id).exclude(pk=topic.pk)
+        if after_id is None:
+            before, after = 0, siblings.values_list('position', flat=True).first()
+        else:
+            before = siblings.values_list('position', flat=True).get(pk=after_id)
+            after = siblings.filter(position__gt=before).values_list('position', flat=True).first()
+
+        if after is None:
+            position = before + GAP
+        elif after - before > 1:
+            position = (before + after) // 2
+        else:
+            # No room between the neighbours: renumber the whole subject once
+            ids = list(siblings.values_list('pk', flat=True))
+            ids.insert(ids.index(after_id) + 1 if after_id is not None else 0, topic.pk)
+            renumber(topic.subject_id, ids, user_id)
+            topic.position = (ids.index(topic.pk) + 1) * GAP
+            return topic
+
+        Topic.objects.filter(pk=topic.pk).update(position=position)
+        sync.record(user_id, {'topic': [topic.pk]})
+        topic.position = position
+        return topic
@@ -1,26 +1,43 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from .metrics import metrics_view
 from .views import (
     UserDetailView, LogoutView,
     SubjectViewSet, TopicViewSet, SessionViewSet,
-    StreakView, WeeklyReportView, ParseSyllabusView,
-    AIParseSyllabusView, RecommendTopicView,
+    StreakView, WeeklyReportView, RangeReportView, ParseSyllabusView,
+    AIParseSyllabusView, RecommendTopicView, ReorderTopicsView, MoveTopicView,
+    DailyGoalView, HomeTimezoneView, TodayGoalView, DashboardView, SearchView, SyncView,
+    StudyGroupViewSet, JoinGroupView, LeaveGroupView, LeaderboardView,
 )
 
 router = DefaultRouter()
 router.register(r'subjects', SubjectViewSet, basename='subject')
 router.register(r'topics', TopicViewSet, basename='topic')
 router.register(r'sessions', SessionViewSet, basename='session')
+router.register(r'groups', StudyGroupViewSet, basename='study-group')
 
 urlpatterns = [
     path('auth/user/', UserDetailView.as_view(), name='user-detail'),
     path('auth/logout/', LogoutView.as_view(), name='logout'),
     path('subjects/<int:subject_id>/parse-syllabus/', ParseSyllabusView.as_view(), name='parse-syllabus'),
     path('subjects/<int:subject_id>/ai-parse-syllabus/', AIParseSyllabusView.as_view(), name='ai-parse-syllabus'),
+    path('subjects/<int:subject_id>/reorder-topics/', ReorderTopicsView.as_view(), name='reorder-topics'),
     path('subjects/<int:subject_id>/recommend-topic/', RecommendTopicView.as_view(), name='recommend-topic'),
     # Static paths before router to avoid PK conflicts
+    path('topics/<int:topic_id>/move/', MoveTopicView.as_view(), name='move-topic'),
+    path('groups/join/', JoinGroupView.as_view(), name='join-group'),
+    path('groups/<int:group_id>/leave/', LeaveGroupView.as_view(), name='leave-group'),
+    path('groups/<int:group_id>/leaderboard/', LeaderboardView.as_view(), name='group-leaderboard'),
     path('sessions/streak/', StreakView.as_view(), name='session-streak'),
     path('reports/weekly/', WeeklyReportView.as_view(), name='weekly-report'),
+    path('reports/range/', RangeReportView.as_view(), name='range-report'),
+    path('goals/', DailyGoalView.as_view(), name='daily-goal'),
+    path('goals/today/', TodayGoalView.as_view(), name='goal-today'),
+    path('profile/timezone/', HomeTimezoneView.as_view(), name='home-timezone'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('sync/', SyncView.as_view(), name='sync'),
+    path('metrics/', metrics_view, name='metrics'),
     path('', include(router.urls)),
 ]
@@ -0,0 +1,66 @@
+"""
+usage.py — Platform-wide usage figures for the admin dashboard.
+
+Everything here reads precomputed data, never the session table: weekly
+activity comes from the weekly rollups (rollups.py) in ``TIME_ZONE``, one
+grouped read of the ``(tz, week)`` index, and all-time totals from the
+denormalized subject counters (counters.py).
+
+Every session write stores its user's ``TIME_ZONE`` week (see rollups.py),
+so weeks are complete from the first session on. Sessions written before
+that, or by bulk loads that skip signals, are added by
+``manage.py rebuild_weekly_rollups --tz UTC`` (with the deployment's
+``TIME_ZONE``); run it once after upgrading.
+"""
+
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import StudyGroup, Subject, WeeklyRollup
+from .stats import current_monday
+
+WEEKS = 12
+
+
+def platform_usage(weeks=WEEKS):
+    """Totals across all users, and activity for each of the last ``weeks`` weeks (oldest first)."""
+    tz = ZoneInfo(settings.TIME_ZONE)
+    last = current_monday(tz)
+    first = last - timedelta(weeks=weeks - 1)
+    stored = {
+        row.pop('week'): row
+        for row in WeeklyRollup.objects.filter(tz=tz.key, week__gte=first, week__lte=last)
+        .order_by().values('week').annotate(
+            active_users=Count('user', filter=Q(session_count__gt=0)),
+            session_count=Sum('session_count'),
+            total_duration_seconds=Sum('total_duration_seconds'),
+            days_studied=Sum('days_studied'),
+        )
+    }
+    empty = {'active_users': 0, 'session_count': 0, 'total_duration_seconds': 0, 'days_studied': 0}
+    activity = []
+    for i in range(weeks):
+        monday = first + timedelta(weeks=i)
+        row = stored.get(monday, empty)
+        activity.append({
+            'week_start': monday.isoformat(),
+            **row,
+            'average_seconds_per_active_user': (
+                row['total_duration_seconds'] // row['active_users'] if row['active_users'] else 0
+            ),
+        })
+
+    totals = Subject.objects.aggregate(
+        subjects=Count('id'),
+        topics=Coalesce(Sum('topic_count'), 0),
+        topics_mastered=Coalesce(Sum('mastered_count'), 0),
+        study_seconds=Coalesce(Sum('total_study_seconds'), 0),
+    )
+    totals['users'] = User.objects.count()
+    totals['study_groups'] = StudyGroup.objects.count()
+    return {'tz': tz.key, 'totals': totals, 'weeks': activity}
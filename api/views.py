@@ -1,39 +1,50 @@
 import io
+import uuid
 
 from django.contrib.auth import logout
+from django.db import IntegrityError, transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from datetime import timedelta, date, datetime
+from datetime import timedelta, date
 from rest_framework import status, viewsets
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from pypdf import PdfReader
-
-from .models import Subject, Topic, StudySession
-from .serializers import SubjectSerializer, TopicSerializer, StudySessionSerializer
+from adrf import viewsets as async_viewsets
+from asgiref.sync import sync_to_async
+from adrf.views import APIView as AsyncAPIView
+
+from .models import Subject, Topic, StudySession, StudyGroup, SyncBatch, UserProfile
+from .serializers import (
+    SubjectSerializer, TopicSerializer, StudySessionSerializer, DailyGoalSerializer, HomeTimezoneSerializer,
+    StudyGroupSerializer,
+)
 from .ai_parser import parse_syllabus_with_ai
+from .auth_cache import get_profile
+from .fast_lists import AsyncFastListMixin, FastJSONRenderer, FastListMixin, ValuesRows
+from .lazy_imports import LazyImport
+from .realtime import notify_stats_changed
+from .search import search
+from . import idempotency, leaderboard, rollups, sync, topic_order
+from .topic_import import import_topics, normalize_name
+from .local_dates import redate, request_tz
+from .stats import (
+    parse_week, current_monday, compute_streak, acompute_streak,
+    daily_goal_progress, weekly_report, aweekly_report,
+)
+
+# Only the syllabus upload reads PDFs; see lazy_imports.py
+PdfReader = LazyImport('pypdf', 'PdfReader')
 
 
 class UserDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        avatar_url = ''
-        try:
-            social_account = user.socialaccount_set.filter(provider='github').first()
-            if social_account:
-                avatar_url = social_account.extra_data.get('avatar_url', '')
-        except Exception:
-            pass
-        return Response({
-            'id': user.id, 'username': user.username,
-            'email': user.email,
-            'name': user.get_full_name() or user.username,
-            'avatar_url': avatar_url,
-        })
+        return Response(get_profile(request.user))
 
 
 class LogoutView(APIView):
@@ -44,7 +55,7 @@ class LogoutView(APIView):
         return Response({'detail': 'Successfully logged out.'})
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+class SubjectViewSet(async_viewsets.ModelViewSet):
     serializer_class = SubjectSerializer
     permission_classes = [IsAuthenticated]
 
@@ -54,10 +65,15 @@ class SubjectViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
 
-class TopicViewSet(viewsets.ModelViewSet):
+class TopicViewSet(FastListMixin, viewsets.ModelViewSet):
     serializer_class = TopicSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    list_rows = ValuesRows(TopicSerializer)
 
     def get_queryset(self):
         qs = Topic.objects.filter(subject__user=self.request.user)
@@ -71,14 +87,26 @@ class TopicViewSet(viewsets.ModelViewSet):
         subject = get_object_or_404(Subject, pk=subject_id, user=self.request.user)
         serializer.save(subject=subject)
 
+    def perform_update(self, serializer):
+        # Moving a topic is only allowed into another of the user's subjects
+        subject = serializer.validated_data.get('subject')
+        if subject is not None and subject.user_id != self.request.user.id:
+            raise Http404
+        serializer.save()
 
-class SessionViewSet(viewsets.ModelViewSet):
+
+class SessionViewSet(AsyncFastListMixin, async_viewsets.ModelViewSet):
     serializer_class = StudySessionSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    list_rows = ValuesRows(
+        StudySessionSerializer, sources={'subject_name': 'subject__name', 'topic_name': 'topic__name'},
+    )
     http_method_names = ['get', 'post', 'head', 'options']
 
     def get_queryset(self):
-        qs = StudySession.objects.filter(user=self.request.user)
+        # subject_name/topic_name are serialized per session
+        qs = StudySession.objects.filter(user=self.request.user).select_related('subject', 'topic')
         subject_id = self.request.query_params.get('subject')
         if subject_id:
             qs = qs.filter(subject_id=subject_id)
@@ -91,115 +119,178 @@ class SessionViewSet(viewsets.ModelViewSet):
                 pass
         return qs
 
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+    def create(self, request, *args, **kwargs):
+        # A retry with the same Idempotency-Key (or client_id) returns the
+        # session the first attempt created; see idempotency.py
+        try:
+            key = idempotency.header_key(request)
+        except ValueError:
+            return Response({'error': 'Idempotency-Key must be a UUID'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        body_key = serializer.validated_data.get('client_id')
+        if key and body_key and key != body_key:
+            return Response(
+                {'error': 'client_id and Idempotency-Key must match'}, status=status.HTTP_400_BAD_REQUEST,
+            )
+        _, created = idempotency.save_session(serializer, request.user, key)
+        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
-class StreakView(APIView):
+class StreakView(AsyncAPIView):
     """
     GET /api/sessions/streak/?tz=Asia/Kolkata
     Returns { streak: int, studied_today: bool }
 
-    Dates are computed in the user's local timezone (defaults to UTC).
-    A session at 23:00 UTC+5:30 correctly counts as local Monday, not UTC Tuesday.
+    Dates are computed in the given timezone, by default the user's home
+    timezone (see local_dates.py). A session at 23:00 UTC+5:30 correctly
+    counts as local Monday, not UTC Tuesday.
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'reports'
 
-    def get(self, request):
-        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
-
-        tz_name = request.query_params.get('tz', 'UTC')
-        try:
-            tz = ZoneInfo(tz_name)
-        except ZoneInfoNotFoundError:
-            tz = ZoneInfo('UTC')
-
-        sessions = StudySession.objects.filter(user=request.user)
-        # Convert created_at to local date
-        unique_dates = sorted(
-            {s.created_at.astimezone(tz).date() for s in sessions},
-            reverse=True
-        )
-        today = datetime.now(tz).date()
-        studied_today = today in unique_dates
-
-        streak = 0
-        check = today if studied_today else today - timedelta(days=1)
-        for d in unique_dates:
-            if d == check:
-                streak += 1
-                check -= timedelta(days=1)
-            elif d < check:
-                break
+    async def get(self, request):
+        tz = await sync_to_async(request_tz)(request)
+        streak, studied_today = await acompute_streak(request.user, tz)
         return Response({'streak': streak, 'studied_today': studied_today})
 
 
-class WeeklyReportView(APIView):
+class WeeklyReportView(AsyncAPIView):
     """
     GET /api/reports/weekly/?week=YYYY-WW&tz=Asia/Kolkata
     Filters sessions by local date within Mon–Sun of the specified week.
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'reports'
 
-    def get(self, request):
-        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    async def get(self, request):
+        tz = await sync_to_async(request_tz)(request)
 
-        tz_name = request.query_params.get('tz', 'UTC')
+        week_str = request.query_params.get('week')
         try:
-            tz = ZoneInfo(tz_name)
-        except ZoneInfoNotFoundError:
-            tz = ZoneInfo('UTC')
+            monday = parse_week(week_str) if week_str else current_monday(tz)
+        except (ValueError, TypeError):
+            return Response({'error': 'Invalid week format. Use YYYY-WW (e.g. 2026-08).'}, status=400)
 
-        week_str = request.query_params.get('week')
+        return Response(await aweekly_report(request.user, monday, tz))
+
+
+class RangeReportView(APIView):
+    """
+    GET /api/reports/range/?from_week=YYYY-WW&to_week=YYYY-WW&tz=Asia/Kolkata
+
+    Per-week stats (the weekly report's fields) for every week from
+    ``from_week`` through ``to_week``, plus totals, served from the weekly
+    rollup table (see rollups.py). ``to_week`` defaults to the current week
+    and ``from_week`` to 15 weeks before it (a semester). At most 104 weeks.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'reports'
+
+    def get(self, request):
+        tz = request_tz(request)
         try:
-            if week_str:
-                monday = datetime.strptime(f'{week_str}-1', '%G-%V-%u').date()
-            else:
-                local_today = datetime.now(tz).date()
-                monday = local_today - timedelta(days=local_today.weekday())
+            to_week = request.query_params.get('to_week')
+            last = parse_week(to_week) if to_week else current_monday(tz)
+            from_week = request.query_params.get('from_week')
+            first = parse_week(from_week) if from_week else last - timedelta(weeks=15)
         except (ValueError, TypeError):
             return Response({'error': 'Invalid week format. Use YYYY-WW (e.g. 2026-08).'}, status=400)
+        if first > last:
+            return Response({'error': 'from_week must not be after to_week.'}, status=400)
+        if (last - first).days // 7 + 1 > rollups.MAX_WEEKS:
+            return Response({'error': f'At most {rollups.MAX_WEEKS} weeks per request.'}, status=400)
 
-        sunday = monday + timedelta(days=6)
+        return Response(rollups.range_report(request.user, first, last, tz))
 
-        # Filter sessions by converting created_at to local date
-        all_sessions = StudySession.objects.filter(user=request.user)
-        sessions = [
-            s for s in all_sessions
-            if monday <= s.created_at.astimezone(tz).date() <= sunday
-        ]
 
-        total_duration_seconds = sum(s.duration_seconds for s in sessions)
-        unique_subjects_count = len({s.subject_id for s in sessions if s.subject_id})
-        session_count = len(sessions)
-        days_studied = len({s.created_at.astimezone(tz).date() for s in sessions})
-
-        # Topics marked mastered within this week (local date)
-        topics_mastered_count = Topic.objects.filter(
-            subject__user=request.user,
-            status='mastered',
-        ).count()
-        # Refine: only those updated in this local week
-        topics_mastered_count = sum(
-            1 for t in Topic.objects.filter(
-                subject__user=request.user,
-                status='mastered',
-            )
-            if monday <= t.updated_at.astimezone(tz).date() <= sunday
-        )
+class DailyGoalView(APIView):
+    """
+    GET /api/goals/       → { daily_goal_minutes: int | null }
+    PUT /api/goals/       { daily_goal_minutes: int | null } — null clears the goal
 
-        return Response({
-            'week_start': monday.isoformat(),
-            'week_end': sunday.isoformat(),
-            'total_duration_seconds': total_duration_seconds,
-            'session_count': session_count,
-            'unique_subjects_count': unique_subjects_count,
-            'topics_mastered_count': topics_mastered_count,
-            'days_studied': days_studied,
-        })
+    Stored server-side so the goal follows the user across devices.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        profile = UserProfile.objects.filter(user=request.user).first()
+        return Response({'daily_goal_minutes': profile.daily_goal_minutes if profile else None})
+
+    def put(self, request):
+        profile, _ = UserProfile.objects.get_or_create(user=request.user)
+        serializer = DailyGoalSerializer(profile, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class HomeTimezoneView(APIView):
+    """
+    GET /api/profile/timezone/   → { timezone: "Asia/Kolkata" | "" }
+    PUT /api/profile/timezone/   { timezone: "Asia/Kolkata" }
+
+    The timezone streaks, goals and reports use when a request names none,
+    and the one sessions are dated in. Changing it re-dates the user's
+    sessions and rescores their study groups (see local_dates.py and
+    leaderboard.py).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({'timezone': get_profile(request.user)['timezone']})
+
+    def put(self, request):
+        profile, _ = UserProfile.objects.get_or_create(user=request.user)
+        previous = profile.timezone
+        serializer = HomeTimezoneSerializer(profile, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+            if profile.timezone != previous:
+                redate(user_ids=[request.user.id])
+                leaderboard.rebuild_scores(user_ids=[request.user.id])
+        notify_stats_changed(request.user.id)
+        return Response(serializer.data)
+
+
+class TodayGoalView(APIView):
+    """
+    GET /api/goals/today/?tz=Asia/Kolkata
+    Returns { goal_minutes, today_seconds, percent, goal_achieved }
+
+    today_seconds is one SUM over the (user, local_date) index (the
+    (user, created_at) one for a tz other than the home timezone) — the
+    session list is never shipped.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        tz = request_tz(request)
+        return Response(daily_goal_progress(request.user, tz))
+
+
+def import_response(request, result):
+    """``{created, skipped, topics}`` — 201 if anything was created, else 200."""
+    if result.created:
+        notify_stats_changed(request.user.id)
+    return Response(
+        {
+            'created': result.created,
+            'skipped': result.skipped,
+            'topics': TopicSerializer(result.topics, many=True).data,
+        },
+        status=status.HTTP_201_CREATED if result.created else status.HTTP_200_OK,
+    )
 
 
 class ParseSyllabusView(APIView):
+    """
+    POST /api/subjects/{id}/parse-syllabus/
+
+    Body: {"topics": ["name", ...]}. Adds the topics the subject doesn't
+    already have, in order; see topic_import.py.
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request, subject_id):
@@ -207,12 +298,58 @@ class ParseSyllabusView(APIView):
         topic_names = request.data.get('topics', [])
         if not topic_names or not isinstance(topic_names, list):
             return Response({'error': 'topics must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
-        cleaned = [n.strip() for n in topic_names if isinstance(n, str) and n.strip()]
-        if not cleaned:
+        if not any(normalize_name(n) for n in topic_names):
             return Response({'error': 'No valid topic names provided'}, status=status.HTTP_400_BAD_REQUEST)
-        topics = Topic.objects.bulk_create([Topic(subject=subject, name=name) for name in cleaned])
-        serializer = TopicSerializer(topics, many=True)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        result = import_topics(subject, [{'name': name} for name in topic_names])
+        return import_response(request, result)
+
+
+class ReorderTopicsView(APIView):
+    """
+    POST /api/subjects/{id}/reorder-topics/
+
+    Body: {"topics": [id, ...]} — every topic of the subject, in the new
+    order. Rewrites all positions in one statement and returns the topics
+    in their new order.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, subject_id):
+        subject = get_object_or_404(Subject, pk=subject_id, user=request.user)
+        topic_ids = request.data.get('topics')
+        if not isinstance(topic_ids, list) or not all(isinstance(pk, int) for pk in topic_ids):
+            return Response({'error': 'topics must be a list of topic ids'}, status=status.HTTP_400_BAD_REQUEST)
+        existing = set(Topic.objects.filter(subject=subject).values_list('pk', flat=True))
+        if len(topic_ids) != len(existing) or set(topic_ids) != existing:
+            return Response(
+                {'error': 'topics must list every topic of the subject exactly once'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        topic_order.renumber(subject.id, topic_ids, request.user.id)
+        topics = Topic.objects.filter(subject=subject)
+        return Response(TopicSerializer(topics, many=True).data)
+
+
+class MoveTopicView(APIView):
+    """
+    POST /api/topics/{id}/move/
+
+    Body: {"after": id} moves the topic to just after that topic of the same
+    subject; {"after": null} moves it to the top. Usually updates only this
+    topic's position (see topic_order.py).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, topic_id):
+        topic = get_object_or_404(Topic, pk=topic_id, subject__user=request.user)
+        after_id = request.data.get('after')
+        if after_id is not None and (not isinstance(after_id, int) or after_id == topic.pk):
+            return Response({'error': 'after must be another topic id or null'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            topic_order.move(topic, after_id, request.user.id)
+        except Topic.DoesNotExist:
+            return Response({'error': 'after must be a topic of the same subject'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(TopicSerializer(topic).data)
 
 
 class AIParseSyllabusView(APIView):
@@ -220,12 +357,13 @@ class AIParseSyllabusView(APIView):
     POST /api/subjects/{id}/ai-parse-syllabus/
 
     Accepts a PDF file via multipart/form-data (field name: 'file').
-    Extracts the text from the PDF, sends it to Google Gemini (gemini-2.0-flash-lite,
-    free tier), and bulk-creates Topic objects with AI-assigned difficulty ratings.
+    Extracts the text from the PDF, sends it to Groq (llama-3.1-8b-instant, free
+    tier), and bulk-creates Topic objects with AI-assigned difficulty ratings.
 
-    Returns the list of created Topic objects.
+    Returns the created topics and the number skipped as duplicates.
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'ai_parse'
     parser_classes = [MultiPartParser, FormParser]
 
     def post(self, request, subject_id):
@@ -263,7 +401,7 @@ class AIParseSyllabusView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Send to Gemini
+        # Send to Groq
         try:
             parsed_topics = parse_syllabus_with_ai(raw_text)
         except ValueError as exc:
@@ -277,14 +415,10 @@ class AIParseSyllabusView(APIView):
                 status=status.HTTP_422_UNPROCESSABLE_ENTITY,
             )
 
-        # Bulk create Topic objects
-        topics = Topic.objects.bulk_create([
-            Topic(subject=subject, name=item['name'], difficulty=item['difficulty'])
-            for item in parsed_topics
+        result = import_topics(subject, [
+            {'name': item['name'], 'difficulty': item['difficulty']} for item in parsed_topics
         ])
-
-        serializer = TopicSerializer(topics, many=True)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return import_response(request, result)
 
 
 class RecommendTopicView(APIView):
@@ -297,7 +431,7 @@ class RecommendTopicView(APIView):
       1. Exclude mastered topics.
       2. Prioritise "in_progress" over "not_started" (finish what you started).
       3. Within each group, rank easy → medium → hard (build momentum, avoid overwhelm).
-      4. Use syllabus insertion order as the final tiebreaker (natural order matters).
+      4. Use syllabus order (Topic.position) as the final tiebreaker (natural order matters).
 
     Returns 200 with the topic, or 204 No Content if all topics are mastered / none exist.
     """
@@ -308,23 +442,297 @@ class RecommendTopicView(APIView):
     # Status score: lower = higher priority (in_progress first)
     STATUS_SCORE = {'in_progress': 0, 'not_started': 1}
 
+    @classmethod
+    def pick(cls, candidates):
+        """Best topic among non-mastered ``candidates`` (in syllabus order), or None."""
+        def score(topic: Topic):
+            status_rank = cls.STATUS_SCORE.get(topic.status, 2)
+            difficulty_rank = cls.DIFFICULTY_SCORE.get(topic.difficulty, 1)
+            return (status_rank, difficulty_rank)
+
+        return min(candidates, key=score, default=None)
+
     def get(self, request, subject_id):
         subject = get_object_or_404(Subject, pk=subject_id, user=request.user)
 
         candidates = list(
             Topic.objects.filter(subject=subject)
-            .exclude(status='mastered')
-            .order_by('id')  # syllabus order as base
+            .exclude(status='mastered')  # (subject, position) index order = syllabus order
         )
 
-        if not candidates:
+        recommended = self.pick(candidates)
+        if recommended is None:
             return Response(status=status.HTTP_204_NO_CONTENT)
 
-        def score(topic: Topic):
-            status_rank = self.STATUS_SCORE.get(topic.status, 2)
-            difficulty_rank = self.DIFFICULTY_SCORE.get(topic.difficulty, 1)
-            return (status_rank, difficulty_rank)
-
-        recommended = min(candidates, key=score)
         serializer = TopicSerializer(recommended)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class DashboardView(APIView):
+    """
+    GET /api/dashboard/?tz=Asia/Kolkata
+
+    Everything the dashboard needs in one round trip: user, subjects (with
+    counts), recent sessions, streak, today's goal progress, this week's
+    report and the recommended topic per subject (null when none is left).
+
+    Runs a fixed number of queries regardless of how many subjects, topics
+    or sessions the user has.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'reports'
+    RECENT_SESSIONS = 10
+
+    def get(self, request):
+        user = request.user
+        tz = request_tz(request)
+
+        subjects = list(Subject.objects.filter(user=user))
+        recent_sessions = (
+            StudySession.objects.filter(user=user)
+            .select_related('subject', 'topic')[:self.RECENT_SESSIONS]
+        )
+
+        # All open topics in one query, grouped per subject in syllabus order
+        open_topics = {subject.id: [] for subject in subjects}
+        for topic in Topic.objects.filter(subject__user=user).exclude(status='mastered'):
+            open_topics[topic.subject_id].append(topic)
+        recommendations = {}
+        for subject_id, candidates in open_topics.items():
+            recommended = RecommendTopicView.pick(candidates)
+            recommendations[str(subject_id)] = TopicSerializer(recommended).data if recommended else None
+
+        streak, studied_today = compute_streak(user, tz)
+
+        return Response({
+            'user': get_profile(user),
+            'subjects': SubjectSerializer(subjects, many=True).data,
+            'recent_sessions': StudySessionSerializer(recent_sessions, many=True).data,
+            'streak': {'streak': streak, 'studied_today': studied_today},
+            'daily_goal': daily_goal_progress(user, tz),
+            'weekly_report': weekly_report(user, current_monday(tz), tz),
+            'recommendations': recommendations,
+        })
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=linear alg&limit=20
+
+    Ranked full-text matches across the user's topic names, subject names and
+    descriptions, and session notes. Every word matches as a prefix. Returns
+    { query, results: [{ type, id, subject, subject_name, title, text, rank }] }.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'query': query, 'results': search(request.user, query, limit)})
+
+
+class SyncView(APIView):
+    """
+    GET /api/sync/?since=<cursor>
+
+    The subjects, topics and sessions changed since ``cursor`` (from the
+    previous response), plus the ids deleted since, as
+    { cursor, full, subjects, topics, sessions, deleted: {subjects, topics, sessions} }.
+    Without ``since`` (or with a cursor newer than the server's) it is a full
+    snapshot with ``full: true`` and no tombstones. See sync.py.
+
+    POST /api/sync/
+
+    Body: {"batch_id": uuid, "sessions": [session, ...], "topics": [{"id": ..., "status": ...}, ...]}.
+    Offline writes applied in one transaction: new sessions (deduplicated by
+    client_id, see idempotency.py), and name, status or difficulty edits to
+    existing topics. Returns the created sessions and
+    updated topics; a batch_id that was already applied returns the stored
+    response without writing anything, so retries are safe.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    MAX_BATCH = 500
+    TOPIC_FIELDS = ('name', 'status', 'difficulty')
+
+    def get(self, request):
+        user = request.user
+        try:
+            since = int(request.query_params.get('since') or 0)
+        except ValueError:
+            return Response({'error': 'since must be an integer cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        if since < 0:
+            return Response({'error': 'since must be an integer cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cursor = sync.current_cursor(user.id)
+        subjects = Subject.objects.filter(user=user)
+        topics = Topic.objects.filter(subject__user=user)
+        sessions = StudySession.objects.filter(user=user)
+        full = not since or since > cursor
+        if full:
+            deleted = {kind: [] for kind in sync.KINDS}
+        else:
+            changed, deleted = sync.changes(user.id, since, cursor)
+            subjects = subjects.filter(pk__in=changed['subject'])
+            topics = topics.filter(pk__in=changed['topic'])
+            sessions = sessions.filter(pk__in=changed['session'])
+
+        topic_rows, session_rows = TopicViewSet.list_rows, SessionViewSet.list_rows
+        return Response({
+            'cursor': cursor,
+            'full': full,
+            'subjects': SubjectSerializer(subjects, many=True).data,
+            'topics': topic_rows.rows(topic_rows.values(topics)),
+            'sessions': session_rows.rows(session_rows.values(sessions)),
+            'deleted': {f'{kind}s': ids for kind, ids in deleted.items()},
+        })
+
+    def post(self, request):
+        if not isinstance(request.data, dict):
+            return Response({'error': 'body must be a JSON object'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            batch_id = uuid.UUID(str(request.data.get('batch_id')))
+        except ValueError:
+            return Response({'error': 'batch_id must be a UUID'}, status=status.HTTP_400_BAD_REQUEST)
+        sessions = request.data.get('sessions', [])
+        topics = request.data.get('topics', [])
+        if (not isinstance(sessions, list) or not isinstance(topics, list)
+                or not all(isinstance(item, dict) and isinstance(item.get('id'), int) for item in topics)):
+            return Response(
+                {'error': 'sessions must be a list and topics a list of {id, ...} objects'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(sessions) + len(topics) > self.MAX_BATCH:
+            return Response(
+                {'error': f'at most {self.MAX_BATCH} writes per batch'}, status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        batches = SyncBatch.objects.filter(user=request.user, batch_id=batch_id)
+        applied = batches.values_list('response', flat=True).first()
+        if applied is not None:
+            return Response(applied)
+
+        # Everything is validated before anything is written
+        session_serializers = [StudySessionSerializer(data=item, context={'request': request}) for item in sessions]
+        owned = Topic.objects.filter(subject__user=request.user).in_bulk([item['id'] for item in topics])
+        if len(owned) != len({item['id'] for item in topics}):
+            return Response({'error': 'topics must be your own topic ids'}, status=status.HTTP_400_BAD_REQUEST)
+        topic_serializers = [
+            TopicSerializer(
+                owned[item['id']], data={f: item[f] for f in self.TOPIC_FIELDS if f in item}, partial=True,
+            )
+            for item in topics
+        ]
+        errors = {}
+        if not all([serializer.is_valid() for serializer in session_serializers]):
+            errors['sessions'] = [serializer.errors for serializer in session_serializers]
+        if not all([serializer.is_valid() for serializer in topic_serializers]):
+            errors['topics'] = [serializer.errors for serializer in topic_serializers]
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    batch = SyncBatch.objects.create(user=request.user, batch_id=batch_id)
+            except IntegrityError:
+                # The same batch, applied by a concurrent retry
+                return Response(batches.values_list('response', flat=True).get())
+            # Sessions with a client_id that already exists come back as they are
+            created = [idempotency.save_session(serializer, request.user)[0] for serializer in session_serializers]
+            updated = [serializer.save() for serializer in topic_serializers]
+            batch.response = {
+                'batch_id': str(batch_id),
+                'sessions': StudySessionSerializer(created, many=True).data,
+                'topics': TopicSerializer(updated, many=True).data,
+            }
+            batch.save(update_fields=['response'])
+        return Response(batch.response, status=status.HTTP_201_CREATED)
+
+
+class StudyGroupViewSet(viewsets.ModelViewSet):
+    """
+    The study groups the user is a member of. Creating one makes the user
+    its owner and first member; only the owner can delete it. Others join
+    with the group's invite code (``JoinGroupView``).
+    """
+    serializer_class = StudyGroupSerializer
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    def get_queryset(self):
+        return StudyGroup.objects.filter(memberships__user=self.request.user)
+
+    def perform_create(self, serializer):
+        leaderboard.create_group(self.request.user, serializer)
+
+    def destroy(self, request, *args, **kwargs):
+        group = self.get_object()
+        if group.owner_id != request.user.id:
+            return Response({'error': 'Only the owner can delete a group.'}, status=status.HTTP_403_FORBIDDEN)
+        self.perform_destroy(group)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class JoinGroupView(APIView):
+    """
+    POST /api/groups/join/   { invite_code: "..." }
+    Returns the group: 201 when joined, 200 if already a member.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        code = request.data.get('invite_code')
+        if not isinstance(code, str) or not code:
+            return Response({'error': 'invite_code is required'}, status=status.HTTP_400_BAD_REQUEST)
+        group = get_object_or_404(StudyGroup, invite_code=code)
+        joined = leaderboard.join(group, request.user)
+        group.refresh_from_db(fields=['member_count'])
+        return Response(
+            StudyGroupSerializer(group).data, status=status.HTTP_201_CREATED if joined else status.HTTP_200_OK,
+        )
+
+
+class LeaveGroupView(APIView):
+    """
+    POST /api/groups/<group_id>/leave/
+    Removes the user and their scores from the group. The owner deletes
+    the group instead.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, group_id):
+        group = get_object_or_404(StudyGroup, pk=group_id, memberships__user=request.user)
+        if group.owner_id == request.user.id:
+            return Response(
+                {'error': 'The owner cannot leave; delete the group instead.'}, status=status.HTTP_400_BAD_REQUEST,
+            )
+        leaderboard.leave(group, request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class LeaderboardView(APIView):
+    """
+    GET /api/groups/<group_id>/leaderboard/?week=YYYY-WW&tz=Asia/Kolkata
+    Returns { group, week_start, week_end, entries: [{ rank, user_id,
+    username, total_seconds, session_count }], me }
+
+    Members ranked by study time in the week, read in order from the
+    incrementally maintained score table (see leaderboard.py) with one
+    query, whatever the group's size. Each member's time is counted in
+    their own home timezone; ``tz`` only picks the default week.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'reports'
+
+    def get(self, request, group_id):
+        group = get_object_or_404(StudyGroup, pk=group_id, memberships__user=request.user)
+        week_str = request.query_params.get('week')
+        try:
+            monday = parse_week(week_str) if week_str else current_monday(request_tz(request))
+        except (ValueError, TypeError):
+            return Response({'error': 'Invalid week format. Use YYYY-WW (e.g. 2026-08).'}, status=400)
+        return Response(leaderboard.leaderboard(group, monday, request.user))
@@ -0,0 +1,69 @@
+"""
+Serving the Vite build (``frontend/dist``) from Django.
+
+WhiteNoise serves ``FRONTEND_DIST`` at the site root. ``npm run build``
+writes ``.br`` and ``.gz`` siblings next to each asset
+(frontend/scripts/precompress.mjs), and WhiteNoise sends them to clients
+that accept them, with no compression at request time. Vite's
+content-hashed files under ``/assets/`` are cached for a year as
+``immutable``. HTML is revalidated on every load, so a deploy takes effect
+on the next page view. Paths that aren't files or backend routes get
+``index.html``, so client-side routes survive a reload.
+"""
+
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+# Vite/Rollup output names: assets/<name>-<8-char base64url hash>.<ext>
+VITE_HASHED_ASSET = re.compile(r'^/assets/.+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+
+
+class FrontendWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that caches Vite's hashed assets forever and never caches
+    HTML. Unlike WhiteNoise's own middleware it is also async capable, so
+    under ASGI requests that aren't for a file reach the app without a
+    thread hop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        # WhiteNoise's lookup is a dict read (a stat with autorefresh in development)
+        static_file = self.find_file(request.path_info) if self.autorefresh else self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+    def immutable_file_test(self, path, url):
+        return bool(VITE_HASHED_ASSET.match(url)) or super().immutable_file_test(path, url)
+
+    def add_cache_headers(self, headers, path, url):
+        super().add_cache_headers(headers, path, url)
+        if url.endswith(('/', '.html')):
+            headers['Cache-Control'] = 'no-cache'
+
+
+def index(request):
+    """``index.html`` for client-side routes; 404 when the frontend isn't built."""
+    index_html = settings.FRONTEND_DIST / 'index.html'
+    if not index_html.is_file():
+        raise Http404('Frontend not built')
+    response = HttpResponse(index_html.read_bytes(), content_type='text/html; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    return response
@@ -3,8 +3,11 @@ Django settings for SyllabusTrackingApp backend.
 """
 
 from pathlib import Path
+from corsheaders.defaults import default_headers
 from decouple import config, Csv
 
+from .database import database_config
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # ─── Core ────────────────────────────────────────────────────────────────────
@@ -49,7 +52,9 @@ SITE_ID = 1  # Required by allauth
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',    # MUST be first
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'backend.frontend.FrontendWhiteNoiseMiddleware',  # static files + frontend/dist
+    'api.compression.CompressionMiddleware',    # outside metrics, so timings exclude it
+    'api.metrics.RequestMetricsMiddleware',     # after static files, before sessions/auth
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -79,20 +84,60 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 # ─── Database ────────────────────────────────────────────────────────────────
+# DATABASE_URL picks PostgreSQL (postgres://…) or SQLite (sqlite:///…);
+# unset keeps db.sqlite3. See backend/database.py for what each profile tunes.
 DATABASES = {
+    'default': database_config(
+        config('DATABASE_URL', default=''),
+        default_sqlite_path=BASE_DIR / 'db.sqlite3',
+        # PostgreSQL: persistent connections, or a per-worker pool if DB_POOL_MAX_SIZE > 0
+        conn_max_age=config('CONN_MAX_AGE', default=60, cast=int),
+        pool_max_size=config('DB_POOL_MAX_SIZE', default=0, cast=int),
+        pgbouncer=config('DB_PGBOUNCER', default=False, cast=bool),
+        # SQLite: WAL, synchronous=NORMAL, mmap, busy_timeout, IMMEDIATE transactions
+        sqlite_tuned=config('SQLITE_TUNED', default=True, cast=bool),
+    ),
+}
+
+# ─── Cache & Sessions ─────────────────────────────────────────────────────────
+# Per-process memory by default; set CACHE_BACKEND/CACHE_LOCATION to a shared
+# cache (e.g. Redis or Memcached) when running several workers.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    },
+    # Rate-limit windows (api/throttling.py); local to each process by default
+    'throttle': {
+        'BACKEND': config('THROTTLE_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('THROTTLE_CACHE_LOCATION', default='throttle'),
+    },
 }
 
+# cached_db reads sessions from the cache and writes through to the DB, so
+# they survive restarts. 'django.contrib.sessions.backends.cache' skips the
+# DB entirely (sessions are lost if the cache is flushed).
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
+
 # ─── Auth ─────────────────────────────────────────────────────────────────────
 AUTHENTICATION_BACKENDS = [
+    'api.auth_cache.CachedAuthenticationBackend',
+    # Still resolves sessions that logged in before the cached backend existed
     'allauth.account.auth_backends.AuthenticationBackend',
 ]
 
+# How long a cached user / profile lives; entries are also dropped on change,
+# but only in the process that handled the change. AUTH_CACHE_TIMEOUT applies
+# only with a shared default cache (Redis, Memcached, database) — with the
+# per-process LocMemCache, other workers would keep authenticating a
+# deactivated user or an old password until expiry, so entries live at most
+# AUTH_CACHE_LOCAL_TIMEOUT seconds there (api/auth_cache.py).
+AUTH_CACHE_TIMEOUT = config('AUTH_CACHE_TIMEOUT', default=3600, cast=int)
+AUTH_CACHE_LOCAL_TIMEOUT = config('AUTH_CACHE_LOCAL_TIMEOUT', default=5, cast=int)
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -116,12 +161,49 @@ SOCIALACCOUNT_PROVIDERS = {
 # ─── CORS ────────────────────────────────────────────────────────────────────
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', cast=Csv())
 CORS_ALLOW_CREDENTIALS = True   # Required for session cookies
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')  # retry-safe session writes
 
 # ─── CSRF ────────────────────────────────────────────────────────────────────
 CSRF_TRUSTED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS', cast=Csv()
 )
 
+# ─── Live updates (WebSockets) ────────────────────────────────────────────────
+# The in-memory layer fans out within one process only — enough for a single
+# ASGI worker and for tests. Several ASGI workers need a shared layer, e.g.
+# CHANNEL_LAYER_BACKEND=channels_redis.core.RedisChannelLayer with
+# CHANNEL_LAYER_URL=redis://...; gunicorn.conf.py refuses to start them on the
+# in-memory one.
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': config('CHANNEL_LAYER_BACKEND', default='channels.layers.InMemoryChannelLayer'),
+    },
+}
+if config('CHANNEL_LAYER_URL', default=''):
+    CHANNEL_LAYERS['default']['CONFIG'] = {'hosts': [config('CHANNEL_LAYER_URL')]}
+
+# ─── Session archival ─────────────────────────────────────────────────────────
+# `manage.py archive_sessions` (run it daily) folds sessions older than this
+# many days into per-day aggregates; ARCHIVE_EXPORT_DIR also keeps the raw
+# rows as gzipped JSON lines.
+SESSION_RETENTION_DAYS = config('SESSION_RETENTION_DAYS', default=365, cast=int)
+ARCHIVE_EXPORT_DIR = config('ARCHIVE_EXPORT_DIR', default='') or None
+
+# ─── Request metrics ──────────────────────────────────────────────────────────
+# Per-endpoint query count, DB/serializer time and latency, as Server-Timing
+# headers and Prometheus histograms at /api/metrics/. Scrapers authenticate
+# with "Authorization: Bearer <METRICS_TOKEN>"; unset, only staff can read it.
+REQUEST_METRICS_ENABLED = config('REQUEST_METRICS_ENABLED', default=True, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# ─── Response compression ─────────────────────────────────────────────────────
+# JSON responses of at least COMPRESSION_MIN_SIZE bytes are sent brotli- or
+# gzip-encoded, whichever the client prefers (brotli needs the Brotli package).
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 4   # fast enough per request; build-time assets use 11
+
 # ─── Django REST Framework ────────────────────────────────────────────────────
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -132,6 +214,18 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
+    # Sliding-window budgets per user (api/throttling.py); an empty rate disables one
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.UserThrottle',
+        'api.throttling.WriteThrottle',
+        'api.throttling.EndpointThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'user': config('THROTTLE_RATE_USER', default='600/min') or None,
+        'writes': config('THROTTLE_RATE_WRITES', default='120/min') or None,
+        'reports': config('THROTTLE_RATE_REPORTS', default='60/min') or None,
+        'ai_parse': config('THROTTLE_RATE_AI_PARSE', default='10/hour') or None,
+    },
 }
 
 # ─── Internationalization ─────────────────────────────────────────────────────
@@ -149,6 +243,12 @@ STORAGES = {
     },
 }
 
+# The Vite build, served at the site root when present (backend/frontend.py).
+# `npm run build` precompresses it; hashed /assets/ files are cached as immutable.
+FRONTEND_DIST = BASE_DIR / 'frontend' / 'dist'
+WHITENOISE_ROOT = FRONTEND_DIST if FRONTEND_DIST.is_dir() else None
+WHITENOISE_INDEX_FILE = True
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # ─── AI Features ─────────────────────────────────────────────────────────────
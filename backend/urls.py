@@ -2,10 +2,14 @@
 URL configuration for SyllabusTrackingApp backend.
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from . import frontend
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('allauth.urls')),  # GitHub OAuth endpoints
     path('api/', include('api.urls')),           # App API endpoints
+    # Client-side routes of the frontend build (files themselves are served by WhiteNoise)
+    re_path(r'^(?!api/|admin/|accounts/|static/|ws/)', frontend.index, name='frontend'),
 ]
@@ -0,0 +1,101 @@
+"""
+compression.py — Bytes on the wire for the sessions list and the initial
+page load, uncompressed versus gzip and brotli.
+
+The first page of the sessions list is fetched through the full middleware
+stack once per Accept-Encoding; body size, ratio and compression time are
+reported. The initial page load is ``index.html`` plus the scripts and
+stylesheets it references in ``frontend/dist``, compared with the
+``.gz``/``.br`` files written by ``npm run build``; it is skipped when the
+frontend hasn't been built.
+
+    python -m benchmarks.compression --sessions 500 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.dataset import seed_dataset  # noqa: E402
+
+ENCODINGS = ('identity', 'gzip', 'br')
+ASSET_REFERENCE = re.compile(r'(?:src|href)="/(assets/[^"]+\.(?:js|css))"')
+
+
+def sessions_list(account, repeat):
+    from django.conf import settings
+    from django.test import Client
+
+    from api import compression
+
+    client = Client()
+    client.cookies[settings.SESSION_COOKIE_NAME] = account['cookie'].split('=', 1)[1]
+    identity = client.get('/api/sessions/', HTTP_ACCEPT_ENCODING='identity').content
+
+    results = {}
+    for encoding in ENCODINGS:
+        if encoding == 'br' and compression.brotli is None:
+            results[encoding] = None  # Brotli package not installed
+            continue
+        response = client.get('/api/sessions/', HTTP_ACCEPT_ENCODING=encoding)
+        entry = {'bytes': len(response.content), 'content_encoding': response.get('Content-Encoding')}
+        if encoding != 'identity':
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                compression.compress(identity, encoding)
+                timings.append(time.perf_counter() - started)
+            entry['compress_ms'] = round(statistics.median(timings) * 1000, 3)
+            entry['ratio'] = round(len(response.content) / len(identity), 3)
+        results[encoding] = entry
+    return results
+
+
+def initial_page_load():
+    from django.conf import settings
+
+    index = settings.FRONTEND_DIST / 'index.html'
+    if not index.is_file():
+        return None
+    paths = [index] + [settings.FRONTEND_DIST / ref for ref in ASSET_REFERENCE.findall(index.read_text())]
+
+    def size(path, suffix):
+        encoded = path.with_name(path.name + suffix)
+        return (encoded if suffix and encoded.is_file() else path).stat().st_size
+
+    totals = {
+        encoding: sum(size(path, suffix) for path in paths)
+        for encoding, suffix in (('identity', ''), ('gzip', '.gz'), ('br', '.br'))
+    }
+    return {'files': [str(p.relative_to(settings.FRONTEND_DIST)) for p in paths], 'bytes': totals}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20, help='compression timing runs')
+    parser.add_argument('--output', help='write JSON results here as well as stdout')
+    args = parser.parse_args(argv)
+
+    account = seed_dataset(users=1, subjects=8, topics=20, sessions=args.sessions)[0]
+    results = {
+        'sessions_list': sessions_list(account, args.repeat),
+        'initial_page_load': initial_page_load(),  # None: frontend/dist not built
+    }
+
+    output = json.dumps({'config': vars(args), 'results': results}, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
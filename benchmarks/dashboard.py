@@ -0,0 +1,103 @@
+"""
+dashboard.py — Time-to-interactive of the dashboard: the old per-widget
+fan-out versus the single GET /api/dashboard/ round trip.
+
+Each request is run in-process through the full middleware stack to get its
+server time and query count. TTI is then modelled for a browser that opens
+``--parallel`` connections with ``--rtt-ms`` of network latency per request:
+the fan-out pays for as many round trips as its slowest connection lane,
+the consolidated endpoint for exactly one.
+
+    python -m benchmarks.dashboard --subjects 8 --rtt-ms 80
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.dataset import seed_dataset  # noqa: E402
+
+TZ = 'Asia/Kolkata'
+
+
+def measure(client, path, repeat):
+    """Median server time (ms) and query count for one GET."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = client.get(path)
+            timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code in (200, 204), (path, response.status_code)
+    return {'path': path, 'server_ms': round(statistics.median(timings), 2), 'queries': len(ctx.captured_queries)}
+
+
+def modelled_tti(requests, parallel, rtt_ms):
+    """Finish time of the last request when spread over ``parallel`` connections."""
+    lanes = [0.0] * parallel
+    for req in sorted(requests, key=lambda r: r['server_ms'], reverse=True):
+        lane = lanes.index(min(lanes))
+        lanes[lane] += rtt_ms + req['server_ms']
+    return round(max(lanes), 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subjects', type=int, default=8)
+    parser.add_argument('--sessions', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--parallel', type=int, default=6, help='browser connections per origin')
+    parser.add_argument('--rtt-ms', type=float, default=80.0)
+    args = parser.parse_args(argv)
+
+    account = seed_dataset(users=1, subjects=args.subjects, sessions=args.sessions)[0]
+
+    from django.conf import settings
+    from django.test import Client
+
+    client = Client()
+    client.cookies[settings.SESSION_COOKIE_NAME] = account['cookie'].split('=', 1)[1]
+
+    fan_out_paths = [
+        '/api/auth/user/',
+        '/api/subjects/',
+        f'/api/sessions/streak/?tz={TZ}',
+        f'/api/goals/today/?tz={TZ}',
+        f'/api/reports/weekly/?tz={TZ}',
+    ] + [
+        f'/api/subjects/{subject_id}/recommend-topic/'
+        for subject_id in account['subject_ids']
+    ]
+    fan_out = [measure(client, path, args.repeat) for path in fan_out_paths]
+    consolidated = [measure(client, f'/api/dashboard/?tz={TZ}', args.repeat)]
+
+    results = {
+        'config': vars(args),
+        'fan_out': {
+            'requests': len(fan_out),
+            'server_ms': round(sum(r['server_ms'] for r in fan_out), 2),
+            'queries': sum(r['queries'] for r in fan_out),
+            'tti_ms': modelled_tti(fan_out, args.parallel, args.rtt_ms),
+            'detail': fan_out,
+        },
+        'dashboard': {
+            'requests': 1,
+            'server_ms': consolidated[0]['server_ms'],
+            'queries': consolidated[0]['queries'],
+            'tti_ms': modelled_tti(consolidated, args.parallel, args.rtt_ms),
+        },
+    }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
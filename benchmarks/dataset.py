@@ -0,0 +1,113 @@
+"""
+dataset.py — Synthetic benchmark data: N users × M subjects × K topics ×
+S sessions, written with ``bulk_create`` so large datasets seed in seconds.
+
+Every user gets a logged-in session, returned as a cookie string so both
+the in-process test client and raw HTTP clients can use it. All users are
+members of one study group, so its leaderboard ranks the whole dataset.
+"""
+
+from datetime import timedelta
+from importlib import import_module
+
+USERNAME_PREFIX = 'bench-'
+STATUSES = ('not_started', 'in_progress', 'mastered')
+DIFFICULTIES = ('easy', 'medium', 'hard')
+BATCH_SIZE = 1000
+
+
+def seed_dataset(users=1, subjects=8, topics=20, sessions=2000):
+    """
+    Replace any previous benchmark users with a fresh dataset.
+
+    ``subjects`` is per user, ``topics`` per subject and ``sessions`` per user.
+    Returns one dict per user: ``username``, ``user_id``, ``cookie``,
+    ``subject_ids``, ``topic_ids``, ``session_ids`` and ``group_id``.
+    """
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from api.counters import reconcile_subject_counters
+    from api.leaderboard import new_invite_code, rebuild_scores
+    from api.models import Subject, Topic, StudyGroup, StudyGroupMembership, StudySession, UserProfile
+
+    call_command('migrate', verbosity=0)
+    User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    password = make_password(None)
+    user_objs = User.objects.bulk_create([
+        User(username=f'{USERNAME_PREFIX}{i}', password=password) for i in range(users)
+    ])
+    UserProfile.objects.bulk_create([
+        UserProfile(user=user, daily_goal_minutes=60) for user in user_objs
+    ])
+    subject_objs = Subject.objects.bulk_create([
+        Subject(user=user, name=f'Subject {j}') for user in user_objs for j in range(subjects)
+    ], batch_size=BATCH_SIZE)
+    topic_objs = Topic.objects.bulk_create([
+        Topic(
+            subject=subject, name=f'Topic {k}', position=(k + 1) * Topic.POSITION_GAP,
+            status=STATUSES[k % len(STATUSES)], difficulty=DIFFICULTIES[k % len(DIFFICULTIES)],
+        )
+        for subject in subject_objs for k in range(topics)
+    ], batch_size=BATCH_SIZE)
+
+    now = timezone.now()
+    subjects_by_user = {}
+    for subject in subject_objs:
+        subjects_by_user.setdefault(subject.user_id, []).append(subject)
+    session_objs = StudySession.objects.bulk_create([
+        StudySession(
+            user=user, subject=subjects_by_user[user.id][i % subjects] if subjects else None,
+            start_time=now - timedelta(hours=i * 7, minutes=30),
+            end_time=now - timedelta(hours=i * 7),
+            duration_seconds=1800,
+        )
+        for user in user_objs for i in range(sessions)
+    ], batch_size=BATCH_SIZE)
+    # auto_now_add overrides created_at on insert; spread the history afterwards
+    for i, session in enumerate(session_objs):
+        session.created_at = now - timedelta(hours=(i % sessions) * 7)
+    StudySession.objects.bulk_update(session_objs, ['created_at'], batch_size=BATCH_SIZE)
+    # bulk_create skips the signals that maintain the per-subject counters
+    reconcile_subject_counters(Subject.objects.filter(user__in=user_objs))
+
+    group = StudyGroup.objects.create(
+        name='Bench cohort', owner=user_objs[0], invite_code=new_invite_code(), member_count=len(user_objs),
+    )
+    StudyGroupMembership.objects.bulk_create(
+        [StudyGroupMembership(group=group, user=user) for user in user_objs], batch_size=BATCH_SIZE,
+    )
+    rebuild_scores(user_ids=[user.pk for user in user_objs])
+
+    topics_by_user, sessions_by_user = {}, {}
+    for topic in topic_objs:
+        topics_by_user.setdefault(topic.subject.user_id, []).append(topic.pk)
+    for session in session_objs:
+        sessions_by_user.setdefault(session.user_id, []).append(session.pk)
+
+    store_class = import_module(settings.SESSION_ENGINE).SessionStore
+    accounts = []
+    for user in user_objs:
+        store = store_class()
+        store[SESSION_KEY] = str(user.pk)
+        store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        store.create()
+        accounts.append({
+            'username': user.username,
+            'user_id': user.pk,
+            'cookie': f'{settings.SESSION_COOKIE_NAME}={store.session_key}',
+            'subject_ids': [s.pk for s in subjects_by_user.get(user.pk, [])],
+            'topic_ids': topics_by_user.get(user.pk, []),
+            'session_ids': sessions_by_user.get(user.pk, []),
+            'group_id': group.pk,
+        })
+    return accounts
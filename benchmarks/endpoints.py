@@ -0,0 +1,264 @@
+"""
+endpoints.py — Throughput and latency of every endpoint in api/urls.py.
+
+Seeds N users × M subjects × K topics × S sessions (see dataset.py), then
+drives each endpoint below at the given concurrency and reports requests/sec
+and latency percentiles as JSON, one entry per ``METHOD url-name``.
+
+    # In-process (Django test client in threads, no network or server)
+    python -m benchmarks.endpoints --mode inprocess --users 20 --subjects 8 --topics 30 --sessions 500
+
+    # Over HTTP against a gunicorn server started for the run (wsgi or asgi)
+    python -m benchmarks.endpoints --mode asgi --concurrency 64 --workers 4
+
+    # Over HTTP against an already running server that shares this DATABASE_URL
+    python -m benchmarks.endpoints --mode remote --target staging.internal:8000
+
+Requests are spread across the seeded users round-robin. Endpoints that
+write (POST/PUT/PATCH) grow the dataset while they run. ``uncovered`` in the
+output lists URL names added to api/urls.py without a benchmark entry.
+Numbers are only comparable between runs on the same machine.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.dataset import seed_dataset  # noqa: E402
+from benchmarks.loadtest import (  # noqa: E402
+    SERVERS, build_request, drive_requests, free_port, start_server, stop_server, summarize,
+)
+
+TZ = 'Asia/Kolkata'
+
+
+@dataclass
+class Endpoint:
+    name: str                  # URL name in api/urls.py
+    method: str
+    path: str                  # {subject}, {topic}, {session} and {group} are filled per user
+    expected: int = 200
+    body: dict = None
+
+    @property
+    def key(self):
+        return f'{self.method} {self.name}'
+
+    def path_for(self, account):
+        return self.path.format(
+            subject=account['subject_ids'][0],
+            topic=account['topic_ids'][0],
+            session=account['session_ids'][0],
+            group=account['group_id'],
+        )
+
+    def body_for(self, account):
+        if self.body is None:
+            return None
+        return {k: account['subject_ids'][0] if v == '{subject}' else v for k, v in self.body.items()}
+
+
+ENDPOINTS = [
+    Endpoint('user-detail', 'GET', '/api/auth/user/'),
+    Endpoint('dashboard', 'GET', f'/api/dashboard/?tz={TZ}'),
+    Endpoint('subject-list', 'GET', '/api/subjects/'),
+    Endpoint('subject-detail', 'GET', '/api/subjects/{subject}/'),
+    Endpoint('recommend-topic', 'GET', '/api/subjects/{subject}/recommend-topic/'),
+    Endpoint('topic-list', 'GET', '/api/topics/?subject={subject}'),
+    Endpoint('topic-detail', 'GET', '/api/topics/{topic}/'),
+    Endpoint('session-list', 'GET', '/api/sessions/'),
+    Endpoint('session-detail', 'GET', '/api/sessions/{session}/'),
+    Endpoint('session-streak', 'GET', f'/api/sessions/streak/?tz={TZ}'),
+    Endpoint('weekly-report', 'GET', f'/api/reports/weekly/?tz={TZ}'),
+    Endpoint('range-report', 'GET', f'/api/reports/range/?tz={TZ}'),  # last 16 weeks
+    Endpoint('search', 'GET', '/api/search/?q=topic%201'),
+    Endpoint('sync', 'GET', '/api/sync/'),  # full snapshot
+    Endpoint('daily-goal', 'GET', '/api/goals/'),
+    Endpoint('goal-today', 'GET', f'/api/goals/today/?tz={TZ}'),
+    Endpoint('home-timezone', 'GET', '/api/profile/timezone/'),
+    Endpoint('study-group-list', 'GET', '/api/groups/'),
+    Endpoint('study-group-detail', 'GET', '/api/groups/{group}/'),
+    Endpoint('group-leaderboard', 'GET', f'/api/groups/{{group}}/leaderboard/?tz={TZ}'),  # every user ranked
+    # Writes
+    Endpoint('subject-list', 'POST', '/api/subjects/', 201, {'name': 'Bench subject'}),
+    Endpoint('topic-list', 'POST', '/api/topics/', 201, {'subject': '{subject}', 'name': 'Bench topic'}),
+    Endpoint('topic-detail', 'PATCH', '/api/topics/{topic}/', 200, {'status': 'in_progress'}),
+    Endpoint('session-list', 'POST', '/api/sessions/', 201, {
+        'subject': '{subject}', 'start_time': '2026-01-05T09:00:00Z',
+        'end_time': '2026-01-05T09:30:00Z', 'duration_seconds': 1800,
+    }),
+    # Re-imports of the same syllabus: after the warm-up every topic is skipped as a duplicate
+    Endpoint('parse-syllabus', 'POST', '/api/subjects/{subject}/parse-syllabus/', 200,
+             {'topics': ['Bench A', 'Bench B', 'Bench C']}),
+    Endpoint('move-topic', 'POST', '/api/topics/{topic}/move/', 200, {'after': None}),
+    # Retries of one offline batch: after the warm-up every request replays the stored response
+    Endpoint('sync', 'POST', '/api/sync/', 200, {'batch_id': '2f1d6c2e-54a3-4c47-9a5e-3c2b1d0e9f10', 'sessions': []}),
+    Endpoint('daily-goal', 'PUT', '/api/goals/', 200, {'daily_goal_minutes': 90}),
+]
+
+SKIPPED = {
+    'logout': 'ends the session the run is using',
+    'ai-parse-syllabus': 'calls the external Groq API',
+    'metrics': 'operational endpoint, not part of the API',
+    'reorder-topics': 'needs every topic id of the subject; covered by move-topic',
+    'api-root': 'browsable-API index',
+    'join-group': 'benchmark users are seeded as members of the one group',
+    'leave-group': 'would empty the group whose leaderboard is measured',
+}
+
+
+def uncovered_url_names():
+    """URL names in api/urls.py with neither a benchmark entry nor a reason to skip it."""
+    from django.urls import URLResolver, get_resolver
+
+    def names(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from names(pattern.url_patterns)
+            elif pattern.name:
+                yield pattern.name
+
+    api = next(p for p in get_resolver().url_patterns if str(p.pattern) == 'api/')
+    covered = {e.name for e in ENDPOINTS} | set(SKIPPED)
+    return sorted({n for n in names(api.url_patterns) if n not in covered})
+
+
+# ── In-process ────────────────────────────────────────────────────────────────
+
+def run_inprocess(endpoint, accounts, concurrency, total):
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client
+
+    latencies, errors, lock = [], [0], threading.Lock()
+    remaining = [total]
+
+    def worker(i):
+        account = accounts[i % len(accounts)]
+        client = Client()
+        client.cookies[settings.SESSION_COOKIE_NAME] = account['cookie'].split('=', 1)[1]
+        path, body = endpoint.path_for(account), endpoint.body_for(account)
+        call = getattr(client, endpoint.method.lower())
+        try:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                if body is None:
+                    response = call(path)
+                else:
+                    response = call(path, data=json.dumps(body), content_type='application/json')
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    if response.status_code != endpoint.expected:
+                        errors[0] += 1
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+# ── Over HTTP ─────────────────────────────────────────────────────────────────
+
+def run_http(endpoint, accounts, concurrency, total, host, port):
+    # SessionAuthentication enforces CSRF on writes: send a matching cookie/header pair
+    token = secrets.token_hex(16)
+    requests = []
+    for account in accounts[:concurrency]:
+        body = endpoint.body_for(account)
+        requests.append(build_request(
+            endpoint.path_for(account), f"{account['cookie']}; csrftoken={token}",
+            method=endpoint.method,
+            body=json.dumps(body).encode() if body is not None else b'',
+            headers={'X-CSRFToken': token}, host=host,
+        ))
+    return asyncio.run(drive_requests(host, port, requests, concurrency, total, endpoint.expected))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=['inprocess', 'remote'] + sorted(SERVERS), default='inprocess')
+    parser.add_argument('--target', help='host:port of a running server (--mode remote)')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--subjects', type=int, default=8, help='per user')
+    parser.add_argument('--topics', type=int, default=20, help='per subject')
+    parser.add_argument('--sessions', type=int, default=500, help='per user')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=500, help='requests per endpoint')
+    parser.add_argument('--workers', type=int, default=4, help='server workers (wsgi/asgi modes)')
+    parser.add_argument('--only', nargs='+', help='run only these url names')
+    parser.add_argument('--reads-only', action='store_true', help='skip endpoints that write')
+    parser.add_argument('--output', help='write JSON results here as well as stdout')
+    args = parser.parse_args(argv)
+    if args.mode == 'remote' and not args.target:
+        parser.error('--mode remote needs --target host:port')
+
+    started = time.perf_counter()
+    accounts = seed_dataset(args.users, args.subjects, args.topics, args.sessions)
+    seed_seconds = time.perf_counter() - started
+
+    endpoints = [
+        e for e in ENDPOINTS
+        if (not args.only or e.name in args.only) and not (args.reads_only and e.method != 'GET')
+    ]
+
+    proc = None
+    if args.mode in SERVERS:
+        host, port = '127.0.0.1', free_port()
+        proc = start_server(args.mode, port, args.workers)
+    elif args.mode == 'remote':
+        host, _, port = args.target.rpartition(':')
+        port = int(port)
+
+    results = {}
+    try:
+        for endpoint in endpoints:
+            if args.mode == 'inprocess':
+                run_inprocess(endpoint, accounts, args.concurrency, args.concurrency * 2)  # warm-up
+                results[endpoint.key] = run_inprocess(endpoint, accounts, args.concurrency, args.requests)
+            else:
+                run_http(endpoint, accounts, args.concurrency, args.concurrency * 2, host, port)
+                results[endpoint.key] = run_http(endpoint, accounts, args.concurrency, args.requests, host, port)
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+    output = json.dumps({
+        'config': vars(args),
+        'dataset': {
+            'users': args.users,
+            'subjects': args.users * args.subjects,
+            'topics': args.users * args.subjects * args.topics,
+            'sessions': args.users * args.sessions,
+            'seed_seconds': round(seed_seconds, 2),
+        },
+        'endpoints': results,
+        'skipped': SKIPPED,
+        'uncovered': uncovered_url_names(),
+    }, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+loadtest.py — Compare the WSGI (sync gunicorn) and ASGI (gunicorn + uvicorn
+workers) deployments of the API under concurrent load.
+
+Seeds one user with a realistic history into a throwaway SQLite database,
+starts each server in turn on a free port, then hammers the read endpoints
+from an asyncio HTTP/1.1 keep-alive client and reports requests/sec and
+latency percentiles as JSON.
+
+    python -m benchmarks.loadtest --concurrency 200 --requests 4000 --workers 4
+
+Numbers are only comparable between runs on the same machine.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.dataset import seed_dataset  # noqa: E402
+
+SERVERS = {
+    'wsgi': ['gunicorn', 'backend.wsgi:application'],
+    'asgi': ['gunicorn', 'backend.asgi:application', '-k', 'uvicorn_worker.UvicornWorker'],
+}
+
+DEFAULT_PATHS = [
+    '/api/sessions/streak/?tz=Asia/Kolkata',
+    '/api/reports/weekly/?tz=Asia/Kolkata',
+    '/api/sessions/',
+    '/api/subjects/',
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, port, workers, env=None, extra_args=()):
+    cmd = SERVERS[kind] + ['--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning']
+    cmd += extra_args
+    proc = subprocess.Popen(cmd, env=env or os.environ.copy())
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f'{kind} server did not start on port {port}')
+
+
+def stop_server(proc):
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def build_request(path, cookie, method='GET', body=b'', headers=None, host='127.0.0.1'):
+    """Raw HTTP/1.1 request bytes for the keep-alive client."""
+    lines = [
+        f'{method} {path} HTTP/1.1', f'Host: {host}',
+        f'Cookie: {cookie}', 'Accept: application/json',
+    ]
+    lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+    if body:
+        lines += ['Content-Type: application/json', f'Content-Length: {len(body)}']
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+
+
+async def _worker(host, port, request, expected, remaining, latencies, errors):
+    ok = f' {expected} '.encode()
+    reader = writer = None
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            started = time.perf_counter()
+            # Sync gunicorn workers close after every response; reconnect as needed
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length, keep_alive = 0, True
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                name, value = name.strip().lower(), value.strip().lower()
+                if name == 'content-length':
+                    length = int(value)
+                elif name == 'connection' and value == 'close':
+                    keep_alive = False
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if ok not in status_line:
+                errors[0] += 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def drive(port, path, cookie, concurrency, total, method='GET', body=b'', headers=None, expected=200):
+    """Send ``total`` requests from ``concurrency`` keep-alive connections; return ``summarize``."""
+    request = build_request(path, cookie, method, body, headers)
+    return await drive_requests('127.0.0.1', port, [request], concurrency, total, expected)
+
+
+async def drive_requests(host, port, requests, concurrency, total, expected=200):
+    """Like ``drive``, with connection ``i`` sending ``requests[i % len(requests)]``."""
+    latencies, errors, remaining = [], [0], [total]
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        _worker(host, port, requests[i % len(requests)], expected, remaining, latencies, errors)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors[0])
+
+
+def summarize(latencies, elapsed, errors):
+    """Throughput and latency percentiles (ms) for one endpoint run."""
+    ordered = sorted(latencies)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 2)
+
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'rps': round(len(ordered) / elapsed, 1),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 2),
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=['wsgi', 'asgi'])
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=4000, help='requests per endpoint')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--sessions', type=int, default=2000)
+    parser.add_argument('--subjects', type=int, default=8)
+    parser.add_argument('--output', help='write JSON results here as well as stdout')
+    args = parser.parse_args(argv)
+
+    cookie = seed_dataset(users=1, subjects=args.subjects, sessions=args.sessions)[0]['cookie']
+    results = {'config': vars(args), 'servers': {}}
+    for kind in args.servers:
+        port = free_port()
+        proc = start_server(kind, port, args.workers)
+        try:
+            # Warm up workers (imports, connections) before measuring
+            asyncio.run(drive(port, args.paths[0], cookie, args.workers, args.workers * 10))
+            results['servers'][kind] = {
+                path: asyncio.run(drive(port, path, cookie, args.concurrency, args.requests))
+                for path in args.paths
+            }
+        finally:
+            stop_server(proc)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+serializers.py — Serialization throughput of the session and topic lists:
+ModelSerializer + JSONRenderer versus ValuesRows + FastJSONRenderer
+(api/fast_lists.py).
+
+For each list, the same page of rows is fetched, converted and rendered
+both ways. The output reports milliseconds per 1,000 rows for each stage
+(fetch = query + row objects, build = dicts, render = JSON bytes) and the
+speedup. It also checks that both paths produce identical bytes.
+
+    python -m benchmarks.serializers --rows 1000 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.dataset import seed_dataset  # noqa: E402
+
+
+def timed(fn, repeat):
+    """Median seconds of ``fn()`` over ``repeat`` runs, and its last result."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def compare(name, queryset, serializer_class, rows, repeat):
+    from rest_framework.renderers import JSONRenderer
+
+    from api.fast_lists import FastJSONRenderer
+
+    per_k = 1000 / max(len(rows.values(queryset)), 1) * 1000  # seconds → ms per 1,000 rows
+
+    def drf():
+        fetch, objs = timed(lambda: list(queryset.all()), repeat)  # .all(): no result cache
+        build, data = timed(lambda: serializer_class(objs, many=True).data, repeat)
+        render, body = timed(lambda: JSONRenderer().render(data), repeat)
+        return {'fetch': fetch, 'build': build, 'render': render}, body
+
+    def fast():
+        fetch, tuples = timed(lambda: list(rows.values(queryset)), repeat)
+        build, data = timed(lambda: rows.rows(tuples), repeat)
+        render, body = timed(lambda: FastJSONRenderer().render(data), repeat)
+        return {'fetch': fetch, 'build': build, 'render': render}, body
+
+    results = {}
+    bodies = {}
+    for label, run in (('drf', drf), ('fast', fast)):
+        stages, bodies[label] = run()
+        stages['total'] = sum(stages.values())
+        results[label] = {f'{stage}_ms_per_1k': round(s * per_k, 3) for stage, s in stages.items()}
+    results['speedup'] = round(
+        results['drf']['total_ms_per_1k'] / results['fast']['total_ms_per_1k'], 2,
+    )
+    results['identical_bytes'] = bodies['drf'] == bodies['fast']
+    results['bytes'] = len(bodies['fast'])
+    return name, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000, help='rows per list')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='write JSON results here as well as stdout')
+    args = parser.parse_args(argv)
+
+    account = seed_dataset(users=1, subjects=10, topics=max(args.rows // 10, 1), sessions=args.rows)[0]
+
+    from api.models import StudySession, Topic
+    from api.serializers import StudySessionSerializer, TopicSerializer
+    from api.views import SessionViewSet, TopicViewSet
+
+    sessions = (
+        StudySession.objects.filter(user_id=account['user_id'])
+        .select_related('subject', 'topic')[:args.rows]
+    )
+    topics = Topic.objects.filter(subject__user_id=account['user_id'])[:args.rows]
+    results = dict([
+        compare('sessions', sessions, StudySessionSerializer, SessionViewSet.list_rows, args.repeat),
+        compare('topics', topics, TopicSerializer, TopicViewSet.list_rows, args.repeat),
+    ])
+
+    output = json.dumps({'config': vars(args), 'lists': results}, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(output)
+    return 0 if all(r['identical_bytes'] for r in results.values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+Settings for benchmark runs — the normal backend settings pointed at a
+throwaway SQLite file (so seeding never touches a real database) and with the
+per-user rate limits off. An explicit DATABASE_URL (e.g. a scratch
+PostgreSQL database) is used as-is.
+"""
+
+import os
+
+os.environ.setdefault('SECRET_KEY', 'benchmark-only-not-secret')
+os.environ.setdefault('ALLOWED_HOSTS', '127.0.0.1,localhost,testserver')
+os.environ.setdefault('CORS_ALLOWED_ORIGINS', 'http://localhost:5173')
+os.environ.setdefault('DEBUG', 'False')
+# Benchmarks drive one user far past the per-user budgets; no rate limits
+for scope in ('USER', 'WRITES', 'REPORTS', 'AI_PARSE'):
+    os.environ.setdefault(f'THROTTLE_RATE_{scope}', '')
+
+from backend.settings import *  # noqa: E402,F401,F403
+from backend.settings import DATABASES  # noqa: E402
+
+if not os.environ.get('DATABASE_URL'):
+    DATABASES['default']['NAME'] = os.environ.get('BENCH_DB', '/tmp/studytracker-bench.sqlite3')
@@ -0,0 +1,152 @@
+"""
+startup.py — Cold start of an API worker: import time and memory.
+
+``imports`` runs fresh interpreters that set Django up and import the
+URLconf (every view and its dependencies), as each worker does before its
+first response, and reports the median wall time and RSS. ``eager`` also
+imports pypdf and the Groq SDK, as ``api/views.py`` did at load time
+before they became lazy (api/lazy_imports.py); ``lazy`` is the code as it
+is.
+
+``workers`` starts gunicorn (the opt-in ASGI command) with and without
+``preload_app`` (gunicorn.conf.py), sends a few requests so every worker
+has loaded the views, and reads each worker's memory from
+``/proc/<pid>/smaps_rollup``: RSS, PSS (shared pages split between the
+processes sharing them) and private pages. With preloading, the code and
+objects loaded in the master are shared copy-on-write, so per-worker
+private memory and PSS drop. Linux only.
+
+    python -m benchmarks.startup --runs 5 --workers 4
+
+Numbers are only comparable between runs on the same machine.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+from benchmarks.loadtest import free_port, start_server, stop_server  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ('pypdf', 'groq')
+
+IMPORT_PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+for module in sys.argv[1:]:
+    __import__(module)
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - started
+rss = next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmRSS:'))
+print(json.dumps({
+    'import_ms': round(elapsed * 1000, 1),
+    'rss_kb': rss,
+    'heavy_loaded': [m for m in %r if m in sys.modules],
+}))
+''' % (HEAVY_MODULES,)
+
+
+def probe_imports(eager, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE, *(HEAVY_MODULES if eager else ())],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        'import_ms': statistics.median(s['import_ms'] for s in samples),
+        'rss_mb': round(statistics.median(s['rss_kb'] for s in samples) / 1024, 1),
+        'heavy_loaded': samples[-1]['heavy_loaded'],
+    }
+
+
+def worker_pids(master_pid):
+    children = Path(f'/proc/{master_pid}/task/{master_pid}/children').read_text().split()
+    return [int(pid) for pid in children]
+
+
+def memory_kb(pid):
+    """``Rss``, ``Pss`` and private (clean + dirty) kB of one process."""
+    fields = {}
+    for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines()[1:]:
+        name, value = line.split(':', 1)
+        fields[name] = int(value.split()[0])
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'private': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def warm(port, requests):
+    for _ in range(requests):
+        with socket.create_connection(('127.0.0.1', port), timeout=5) as conn:
+            conn.sendall(b'GET /api/auth/user/ HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n')
+            while conn.recv(65536):
+                pass
+
+
+def probe_workers(preload, workers):
+    env = os.environ.copy()
+    with tempfile.NamedTemporaryFile('w', suffix='.py') as empty_config:
+        # An empty config file replaces gunicorn.conf.py: no preloading
+        config = [] if preload else ['--config', empty_config.name]
+        port = free_port()
+        started = time.perf_counter()
+        proc = start_server('asgi', port, workers, env=env, extra_args=config)
+        try:
+            warm(port, workers * 8)
+            boot_seconds = time.perf_counter() - started
+            time.sleep(0.5)
+            per_worker = [memory_kb(pid) for pid in worker_pids(proc.pid)]
+        finally:
+            stop_server(proc)
+    return {
+        'workers': len(per_worker),
+        'ready_and_warm_s': round(boot_seconds, 2),
+        'per_worker_mb': {
+            key: round(statistics.mean(w[key] for w in per_worker) / 1024, 1)
+            for key in ('rss', 'pss', 'private')
+        },
+        'total_pss_mb': round(sum(w['pss'] for w in per_worker) / 1024, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='interpreters per import mode')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--skip-workers', action='store_true', help='only measure imports')
+    args = parser.parse_args(argv)
+
+    results = {
+        'config': vars(args),
+        'imports': {
+            'eager': probe_imports(True, args.runs),
+            'lazy': probe_imports(False, args.runs),
+        },
+    }
+    if not args.skip_workers:
+        results['workers'] = {
+            'no_preload': probe_workers(False, args.workers),
+            'preload': probe_workers(True, args.workers),
+        }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+// Writes .br and .gz siblings for every compressible file in dist/ so the
+// backend (WhiteNoise) can serve them without compressing per request.
+// Runs after `vite build`; uses maximum settings since it only runs once.
+import { readdir, readFile, writeFile } from 'node:fs/promises'
+import { join, extname } from 'node:path'
+import { brotliCompressSync, gzipSync, constants } from 'node:zlib'
+
+const DIST = new URL('../dist/', import.meta.url).pathname
+const MIN_SIZE = 1024
+const COMPRESSIBLE = new Set(['.html', '.js', '.mjs', '.css', '.svg', '.json', '.map', '.txt', '.xml', '.ico'])
+
+async function* files(dir) {
+  for (const entry of await readdir(dir, { withFileTypes: true })) {
+    const path = join(dir, entry.name)
+    if (entry.isDirectory()) yield* files(path)
+    else yield path
+  }
+}
+
+let original = 0
+let brotli = 0
+for await (const path of files(DIST)) {
+  if (!COMPRESSIBLE.has(extname(path))) continue
+  const content = await readFile(path)
+  if (content.length < MIN_SIZE) continue
+
+  const br = brotliCompressSync(content, {
+    params: {
+      [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+      [constants.BROTLI_PARAM_SIZE_HINT]: content.length,
+    },
+  })
+  const gz = gzipSync(content, { level: 9 })
+  // Only keep an encoded copy when it is actually smaller
+  if (br.length < content.length) await writeFile(`${path}.br`, br)
+  if (gz.length < content.length) await writeFile(`${path}.gz`, gz)
+  original += content.length
+  brotli += Math.min(br.length, content.length)
+}
+
+console.log(`precompress: ${(original / 1024).toFixed(1)} kB -> ${(brotli / 1024).toFixed(1)} kB brotli`)
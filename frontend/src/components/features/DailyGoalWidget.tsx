@@ -10,7 +10,7 @@ interface DailyGoalWidgetProps {
 
 export default function DailyGoalWidget({ state }: DailyGoalWidgetProps) {
     const { goalMinutes, setGoal, todayMinutes, todaySeconds, pct, goalAchieved, loading } = state;
-    const [editing, setEditing] = useState(goalMinutes === null); // open on first visit
+    const [editing, setEditing] = useState(false); // the form also opens whenever no goal is set
     const [customInput, setCustomInput] = useState('');
 
     const handlePreset = (mins: number) => {
@@ -33,6 +33,15 @@ export default function DailyGoalWidget({ state }: DailyGoalWidgetProps) {
         setEditing(true);
     };
 
+    // ── Waiting for the saved goal from the server ───────────────────────────
+    if (loading && goalMinutes === null && !editing) {
+        return (
+            <div style={cardStyle}>
+                <span style={{ fontSize: '13px', color: '#94a3b8' }}>Loading goal…</span>
+            </div>
+        );
+    }
+
     // ── No goal set yet ──────────────────────────────────────────────────────
     if (editing || goalMinutes === null) {
         return (
@@ -17,6 +17,8 @@ export default function EndSessionModal({ elapsed, startTime, onSaved, onCancel
     const [selectedTopicId, setSelectedTopicId] = useState<number | ''>('');
     const [notes, setNotes] = useState('');
     const [saving, setSaving] = useState(false);
+    // One key per recorded session: "try again" after a timeout can't save it twice
+    const [clientId] = useState(() => crypto.randomUUID());
     const [error, setError] = useState('');
     // Success confirmation state
     const [saved, setSaved] = useState<{ subjectName: string; topicName: string | null; duration: string } | null>(null);
@@ -50,6 +52,7 @@ export default function EndSessionModal({ elapsed, startTime, onSaved, onCancel
                 end_time: endTime.toISOString(),
                 duration_seconds: elapsed,
                 notes,
+                client_id: clientId,
             });
             const subjectName = subjectList.find((s) => s.id === selectedSubjectId)?.name ?? '';
             const topicName = selectedTopicId
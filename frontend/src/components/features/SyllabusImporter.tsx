@@ -1,7 +1,7 @@
 import { useState, useRef } from 'react';
 import { parseSyllabus } from '../../utils/syllabusParser';
 import { syllabusParser as syllabusApi } from '../../services/api';
-import type { Topic } from '../../types';
+import type { Topic, SyllabusImportResult } from '../../types';
 
 interface SyllabusImporterProps {
     subjectId: number;
@@ -64,10 +64,12 @@ export default function SyllabusImporter({ subjectId, subjectName, onSaved, onCa
         setError('');
         try {
             const res = await syllabusApi.aiParse(subjectId, file);
-            const topics: AiTopic[] = (res.data as Topic[]).map(t => ({
+            const result = res.data as SyllabusImportResult;
+            const topics: AiTopic[] = result.topics.map(t => ({
                 name: t.name,
                 difficulty: t.difficulty ?? 'medium',
             }));
+            if (topics.length === 0 && result.skipped > 0) { setError('All of these topics are already in this subject.'); return; }
             if (topics.length === 0) { setError('AI could not extract any topics. Try a different file.'); return; }
             setAiTopics(topics);
             setStep('preview');
@@ -103,6 +105,7 @@ export default function SyllabusImporter({ subjectId, subjectName, onSaved, onCa
                     name: t.name,
                     status: 'not_started',
                     difficulty: t.difficulty,
+                    position: i,
                     created_at: '',
                     updated_at: '',
                 }));
@@ -111,7 +114,7 @@ export default function SyllabusImporter({ subjectId, subjectName, onSaved, onCa
                 const valid = manualTopics.filter(t => t.trim().length > 0);
                 if (valid.length === 0) { setError('Add at least one topic.'); setSaving(false); return; }
                 const res = await syllabusApi.save(subjectId, valid);
-                onSaved(res.data as Topic[]);
+                onSaved((res.data as SyllabusImportResult).topics);
             }
         } catch {
             setError('Failed to save topics. Please try again.');
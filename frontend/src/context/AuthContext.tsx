@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useEffect, useState } from 'react';
-import { auth } from '../services/api';
+import { auth, profile } from '../services/api';
 import type { User } from '../types';
 
 interface AuthContextType {
@@ -24,7 +24,14 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
         auth
             .getCurrentUser()
             .then((res) => {
-                setUser(res.data as User);
+                const current = res.data as User;
+                setUser(current);
+                // First visit: adopt the browser's timezone as home, so days and weeks
+                // stay put afterwards wherever the user travels
+                if (!current.timezone) {
+                    const timezone = Intl.DateTimeFormat().resolvedOptions().timeZone;
+                    profile.setTimezone(timezone).then(() => setUser({ ...current, timezone })).catch(() => { });
+                }
             })
             .catch(() => {
                 setUser(null);
@@ -1,9 +1,10 @@
-import { useCallback, useEffect, useState } from 'react';
-import { sessions as sessionsApi } from '../services/api';
-import type { Session } from '../types';
+import { useEffect, useState } from 'react';
+import { goals as goalsApi } from '../services/api';
+import type { DailyGoalProgress } from '../types';
+import type { LiveStats } from './useLiveStats';
 
-const STORAGE_KEY = 'daily_goal_minutes';
-const todayStr = () => new Date().toLocaleDateString('en-CA'); // "2026-02-23"
+// Goals used to live in localStorage — migrated to the server on first load
+const LEGACY_STORAGE_KEY = 'daily_goal_minutes';
 
 export interface DailyGoalState {
     goalMinutes: number | null;
@@ -16,50 +17,44 @@ export interface DailyGoalState {
     refresh: () => void;
 }
 
-export function useDailyGoal(refreshKey?: number): DailyGoalState {
-    const [goalMinutes, setGoalState] = useState<number | null>(() => {
-        const stored = localStorage.getItem(STORAGE_KEY);
-        const parsed = stored ? parseInt(stored, 10) : NaN;
-        return isNaN(parsed) || parsed <= 0 ? null : parsed;
-    });
-
-    const [todaySeconds, setTodaySeconds] = useState(0);
-    const [loading, setLoading] = useState(true);
+function takeLegacyGoal(): number | null {
+    const stored = localStorage.getItem(LEGACY_STORAGE_KEY);
+    localStorage.removeItem(LEGACY_STORAGE_KEY);
+    const parsed = stored ? parseInt(stored, 10) : NaN;
+    return isNaN(parsed) || parsed <= 0 ? null : parsed;
+}
 
-    const fetchToday = useCallback(() => {
-        setLoading(true);
-        sessionsApi
-            .list({ days: 1 })
-            .then((res) => {
-                const data = res.data;
-                const all: Session[] = Array.isArray(data) ? data : (data.results ?? []);
-                const today = todayStr();
-                const secs = all
-                    .filter((s) => new Date(s.created_at).toLocaleDateString('en-CA') === today)
-                    .reduce((acc, s) => acc + s.duration_seconds, 0);
-                setTodaySeconds(secs);
-            })
-            .catch(() => setTodaySeconds(0))
-            .finally(() => setLoading(false));
-    }, []);
-
-    // Re-fetch whenever refreshKey changes (after a session is saved)
-    useEffect(() => {
-        fetchToday();
-    }, [fetchToday, refreshKey]);
+/**
+ * Daily goal progress from the dashboard payload. Goal edits are saved with
+ * PUT /api/goals/ and shown immediately, without waiting for a refetch.
+ */
+export function useDailyGoal(
+    fetched: DailyGoalProgress | null,
+    loading: boolean,
+    refresh: () => void,
+    live?: LiveStats | null,
+): DailyGoalState {
+    // undefined = no local edit yet, use the server's value
+    const [edited, setEdited] = useState<number | null | undefined>(undefined);
 
     const setGoal = (n: number | null) => {
-        setGoalState(n);
-        if (n === null) {
-            localStorage.removeItem(STORAGE_KEY);
-        } else {
-            localStorage.setItem(STORAGE_KEY, String(n));
-        }
+        setEdited(n);
+        goalsApi.set(n).catch(() => undefined);
     };
 
+    useEffect(() => {
+        if (!fetched || fetched.goal_minutes !== null) return;
+        const legacy = takeLegacyGoal();
+        if (legacy !== null) setGoal(legacy);
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [fetched]);
+
+    const goalMinutes = edited !== undefined ? edited : fetched?.goal_minutes ?? null;
+    // Pushed total from the live stats socket wins over the last HTTP fetch
+    const todaySeconds = live ? live.today_seconds : fetched?.today_seconds ?? 0;
     const todayMinutes = Math.floor(todaySeconds / 60);
     const pct = goalMinutes ? Math.min(Math.round((todaySeconds / (goalMinutes * 60)) * 100), 999) : 0;
     const goalAchieved = goalMinutes !== null && todaySeconds >= goalMinutes * 60;
 
-    return { goalMinutes, setGoal, todaySeconds, todayMinutes, pct, goalAchieved, loading, refresh: fetchToday };
+    return { goalMinutes, setGoal, todaySeconds, todayMinutes, pct, goalAchieved, loading, refresh };
 }
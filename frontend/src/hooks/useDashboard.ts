@@ -0,0 +1,36 @@
+import { useCallback, useEffect, useState } from 'react';
+import { dashboard as dashboardApi } from '../services/api';
+import type { DashboardData } from '../types';
+
+export interface DashboardState {
+    data: DashboardData | null;
+    loading: boolean;
+    error: boolean;
+    refresh: () => void;
+}
+
+/** GET /api/dashboard/ — one round trip instead of one request per widget. */
+export function useDashboard(refreshKey?: number): DashboardState {
+    const [data, setData] = useState<DashboardData | null>(null);
+    const [loading, setLoading] = useState(true);
+    const [error, setError] = useState(false);
+
+    const fetchDashboard = useCallback(() => {
+        setLoading(true);
+        dashboardApi
+            .get()
+            .then((res) => {
+                setData(res.data as DashboardData);
+                setError(false);
+            })
+            .catch(() => setError(true))
+            .finally(() => setLoading(false));
+    }, []);
+
+    // Re-fetch whenever refreshKey changes (after a session is saved)
+    useEffect(() => {
+        fetchDashboard();
+    }, [fetchDashboard, refreshKey]);
+
+    return { data, loading, error, refresh: fetchDashboard };
+}
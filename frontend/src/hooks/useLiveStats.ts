@@ -0,0 +1,72 @@
+import { useEffect, useRef, useState } from 'react';
+
+export interface LiveStats {
+    today_seconds: number;
+    streak: number;
+    studied_today: boolean;
+    topic_count: number;
+    mastered_count: number;
+}
+
+export interface LiveStatsState {
+    stats: LiveStats | null;  // null until the first snapshot arrives
+    connected: boolean;
+}
+
+const MAX_RETRY_MS = 30_000;
+
+function socketUrl(): string {
+    const base = (import.meta.env.VITE_API_URL as string) || window.location.origin;
+    // No ?tz=: stats are computed in the user's home timezone
+    return `${base.replace(/^http/, 'ws')}/ws/stats/`;
+}
+
+/**
+ * Subscribes to /ws/stats/ — the server sends a full snapshot on connect,
+ * then only the fields that changed after each session/topic write.
+ * Reconnects with exponential backoff; callers fall back to HTTP while
+ * `connected` is false.
+ */
+export function useLiveStats(): LiveStatsState {
+    const [stats, setStats] = useState<LiveStats | null>(null);
+    const [connected, setConnected] = useState(false);
+    const retryRef = useRef(1000);
+
+    useEffect(() => {
+        let socket: WebSocket | null = null;
+        let timer: ReturnType<typeof setTimeout> | null = null;
+        let closed = false;
+
+        const open = () => {
+            socket = new WebSocket(socketUrl());
+            socket.onopen = () => {
+                retryRef.current = 1000;
+                setConnected(true);
+            };
+            socket.onmessage = (event) => {
+                const msg = JSON.parse(event.data);
+                if (msg.type === 'snapshot') {
+                    setStats(msg.stats);
+                } else if (msg.type === 'delta') {
+                    setStats((prev) => (prev ? { ...prev, ...msg.changes } : prev));
+                }
+            };
+            socket.onclose = (event) => {
+                setConnected(false);
+                // 4403 = not logged in; retrying won't help
+                if (closed || event.code === 4403) return;
+                timer = setTimeout(open, retryRef.current);
+                retryRef.current = Math.min(retryRef.current * 2, MAX_RETRY_MS);
+            };
+        };
+
+        open();
+        return () => {
+            closed = true;
+            if (timer) clearTimeout(timer);
+            socket?.close();
+        };
+    }, []);
+
+    return { stats, connected };
+}
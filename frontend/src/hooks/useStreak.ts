@@ -1,5 +1,4 @@
-import { useCallback, useEffect, useState } from 'react';
-import API from '../services/api';
+import type { LiveStats } from './useLiveStats';
 
 export interface StreakState {
     streak: number;
@@ -7,29 +6,17 @@ export interface StreakState {
     loading: boolean;
 }
 
-export function useStreak(refreshKey?: number): StreakState {
-    const [streak, setStreak] = useState(0);
-    const [studiedToday, setStudiedToday] = useState(false);
-    const [loading, setLoading] = useState(true);
-
-    const fetchStreak = useCallback(() => {
-        setLoading(true);
-        const tz = encodeURIComponent(Intl.DateTimeFormat().resolvedOptions().timeZone);
-        API.get(`/api/sessions/streak/?tz=${tz}`)
-            .then((res) => {
-                setStreak(res.data.streak ?? 0);
-                setStudiedToday(res.data.studied_today ?? false);
-            })
-            .catch(() => {
-                setStreak(0);
-                setStudiedToday(false);
-            })
-            .finally(() => setLoading(false));
-    }, []);
-
-    useEffect(() => {
-        fetchStreak();
-    }, [fetchStreak, refreshKey]);
-
-    return { streak, studiedToday, loading };
+/**
+ * Streak from the dashboard payload; pushed values from the live stats
+ * socket win over the last HTTP fetch.
+ */
+export function useStreak(
+    fetched: { streak: number; studied_today: boolean } | null,
+    loading: boolean,
+    live?: LiveStats | null,
+): StreakState {
+    if (live) {
+        return { streak: live.streak, studiedToday: live.studied_today, loading: false };
+    }
+    return { streak: fetched?.streak ?? 0, studiedToday: fetched?.studied_today ?? false, loading };
 }
@@ -1,15 +1,8 @@
 import { useCallback, useEffect, useState } from 'react';
 import API from '../services/api';
+import type { WeeklyReport } from '../types';
 
-export interface WeeklyReportData {
-    week_start: string;
-    week_end: string;
-    total_duration_seconds: number;
-    session_count: number;
-    unique_subjects_count: number;
-    topics_mastered_count: number;
-    days_studied: number;
-}
+export type WeeklyReportData = WeeklyReport;
 
 export interface WeeklyReportState {
     data: WeeklyReportData | null;
@@ -59,8 +52,8 @@ export function useWeeklyReport(): WeeklyReportState {
 
     const fetchReport = useCallback(() => {
         setLoading(true);
-        const tz = encodeURIComponent(Intl.DateTimeFormat().resolvedOptions().timeZone);
-        API.get(`/api/reports/weekly/?week=${param}&tz=${tz}`)
+        // In the user's home timezone (server default), so travelling doesn't move sessions between weeks
+        API.get(`/api/reports/weekly/?week=${param}`)
             .then((res) => setData(res.data as WeeklyReportData))
             .catch(() => setData(null))
             .finally(() => setLoading(false));
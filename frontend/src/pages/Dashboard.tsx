@@ -1,6 +1,5 @@
 import { useEffect, useState } from 'react';
 import { useAuth } from '../context/AuthContext';
-import { subjects as subjectsApi } from '../services/api';
 import type { Subject } from '../types';
 import SubjectCard from '../components/features/SubjectCard';
 import SubjectForm from '../components/features/SubjectForm';
@@ -10,44 +9,42 @@ import StreakWidget from '../components/features/StreakWidget';
 import OverallProgressWidget from '../components/features/OverallProgressWidget';
 import { useDailyGoal } from '../hooks/useDailyGoal';
 import { useStreak } from '../hooks/useStreak';
+import { useLiveStats } from '../hooks/useLiveStats';
+import { useDashboard } from '../hooks/useDashboard';
 import { useTimer } from '../context/TimerContext';
 import { Link } from 'react-router-dom';
 
 export default function Dashboard() {
     const { user, logout } = useAuth();
     const [subjectList, setSubjectList] = useState<Subject[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState<string | null>(null);
     const [showForm, setShowForm] = useState(false);
     const [sessionRefreshKey, setSessionRefreshKey] = useState(0);
 
-    // When timer resets after a session is saved, increment refreshKey so
-    // DailyGoalWidget re-fetches today's total.
+    // Streak and today's total are pushed over /ws/stats/ while connected.
+    const live = useLiveStats();
+
+    // Fallback when the socket is down: when the timer resets after a session
+    // is saved, increment refreshKey so the widgets re-fetch over HTTP.
     const { elapsed } = useTimer();
     const [prevElapsed, setPrevElapsed] = useState(elapsed);
     useEffect(() => {
-        if (prevElapsed > 0 && elapsed === 0) {
+        if (prevElapsed > 0 && elapsed === 0 && !live.connected) {
             // Timer was just reset → a session was saved
             setSessionRefreshKey((k) => k + 1);
         }
         setPrevElapsed(elapsed);
-    }, [elapsed, prevElapsed]);
+    }, [elapsed, prevElapsed, live.connected]);
 
-    const dailyGoal = useDailyGoal(sessionRefreshKey);
-    const streak = useStreak(sessionRefreshKey);
+    // Subjects, streak and goal progress all arrive in one /api/dashboard/ response
+    const dashboard = useDashboard(sessionRefreshKey);
+    const loading = dashboard.loading && dashboard.data === null;
+    const error = dashboard.error ? 'Failed to load subjects. Please refresh.' : null;
+    const dailyGoal = useDailyGoal(dashboard.data?.daily_goal ?? null, dashboard.loading, dashboard.refresh, live.stats);
+    const streak = useStreak(dashboard.data?.streak ?? null, dashboard.loading, live.stats);
 
     useEffect(() => {
-        setLoading(true);
-        subjectsApi
-            .list()
-            .then((res) => {
-                const data = res.data;
-                setSubjectList(Array.isArray(data) ? data : data.results ?? []);
-                setError(null);
-            })
-            .catch(() => setError('Failed to load subjects. Please refresh.'))
-            .finally(() => setLoading(false));
-    }, []);
+        if (dashboard.data) setSubjectList(dashboard.data.subjects);
+    }, [dashboard.data]);
 
     const handleCreated = (subject: Subject) => {
         setSubjectList((prev) => [subject, ...prev]);
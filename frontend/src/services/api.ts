@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { SubjectFormData, Topic } from '../types';
+import type { Session, SubjectFormData, Topic } from '../types';
 
 function getCsrfToken(): string {
     const match = document.cookie
@@ -26,6 +26,10 @@ export const auth = {
     logout: () => API.post('/api/auth/logout/'),
 };
 
+export const profile = {
+    setTimezone: (timezone: string) => API.put('/api/profile/timezone/', { timezone }),
+};
+
 export const subjects = {
     list: () => API.get('/api/subjects/'),
     get: (id: number) => API.get(`/api/subjects/${id}/`),
@@ -42,6 +46,10 @@ export const topics = {
     update: (id: number, data: Partial<Topic>) =>
         API.patch(`/api/topics/${id}/`, data),
     remove: (id: number) => API.delete(`/api/topics/${id}/`),
+    move: (id: number, after: number | null) =>
+        API.post(`/api/topics/${id}/move/`, { after }),
+    reorder: (subjectId: number, topicIds: number[]) =>
+        API.post(`/api/subjects/${subjectId}/reorder-topics/`, { topics: topicIds }),
     recommend: (subjectId: number) =>
         API.get(`/api/subjects/${subjectId}/recommend-topic/`),
 };
@@ -65,6 +73,7 @@ export interface SessionPayload {
     end_time: string;
     duration_seconds: number;
     notes?: string;
+    client_id?: string;  // generated once per session; retries with it never create a duplicate
 }
 
 export const sessions = {
@@ -78,9 +87,51 @@ export const sessions = {
     create: (data: SessionPayload) => API.post('/api/sessions/', data),
 };
 
+export const goals = {
+    get: () => API.get('/api/goals/'),
+    set: (minutes: number | null) => API.put('/api/goals/', { daily_goal_minutes: minutes }),
+    today: () => API.get('/api/goals/today/'),
+};
+
+// Dates in goals, dashboard and reports are in the user's home timezone (profile.setTimezone)
+export const dashboard = {
+    get: () => API.get('/api/dashboard/'),
+};
+
 export const reports = {
     weekly: (week?: string) =>
         API.get(`/api/reports/weekly/${week ? '?week=' + week : ''}`),
+    // Per-week stats for fromWeek..toWeek (YYYY-WW) in one call; defaults to the last 16 weeks
+    range: (fromWeek?: string, toWeek?: string) => {
+        const params = new URLSearchParams();
+        if (fromWeek) params.set('from_week', fromWeek);
+        if (toWeek) params.set('to_week', toWeek);
+        return API.get(`/api/reports/range/?${params}`);
+    },
+};
+
+// Delta sync: pass the cursor from the previous response (none for a full snapshot)
+export const sync = {
+    pull: (since?: number) =>
+        API.get(`/api/sync/${since ? '?since=' + since : ''}`),
+    // Offline writes; retrying with the same batchId never applies them twice
+    push: (batchId: string, data: { sessions?: Partial<Session>[]; topics?: (Pick<Topic, 'id'> & Partial<Topic>)[] }) =>
+        API.post('/api/sync/', { batch_id: batchId, ...data }),
+};
+
+export const groups = {
+    list: () => API.get('/api/groups/'),
+    create: (name: string) => API.post('/api/groups/', { name }),
+    join: (inviteCode: string) => API.post('/api/groups/join/', { invite_code: inviteCode }),
+    leave: (id: number) => API.post(`/api/groups/${id}/leave/`),
+    remove: (id: number) => API.delete(`/api/groups/${id}/`),
+    leaderboard: (id: number, week?: string) =>
+        API.get(`/api/groups/${id}/leaderboard/${week ? '?week=' + week : ''}`),
+};
+
+export const search = {
+    query: (q: string, limit = 20) =>
+        API.get(`/api/search/?q=${encodeURIComponent(q)}&limit=${limit}`),
 };
 
 export default API;
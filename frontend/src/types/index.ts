@@ -6,6 +6,7 @@ export interface User {
   email: string;
   name: string;
   avatar_url: string;
+  timezone: string;  // home timezone; '' until chosen (dates are then in UTC)
 }
 
 export interface Subject {
@@ -15,6 +16,7 @@ export interface Subject {
   color: string;
   topic_count: number;
   mastered_count: number;
+  total_study_seconds: number;
   created_at: string;
   updated_at: string;
 }
@@ -31,10 +33,17 @@ export interface Topic {
   name: string;
   status: 'not_started' | 'in_progress' | 'mastered';
   difficulty: 'easy' | 'medium' | 'hard';
+  position: number;
   created_at: string;
   updated_at: string;
 }
 
+export interface SyllabusImportResult {
+  created: number;
+  skipped: number;
+  topics: Topic[];
+}
+
 export interface Session {
   id: number;
   subject: number | null;
@@ -45,5 +54,95 @@ export interface Session {
   end_time: string;
   duration_seconds: number;
   notes: string;
+  client_id: string | null;
   created_at: string;
 }
+
+export interface DailyGoalProgress {
+  goal_minutes: number | null;
+  today_seconds: number;
+  percent: number;
+  goal_achieved: boolean;
+}
+
+export interface WeeklyReport {
+  week_start: string;
+  week_end: string;
+  total_duration_seconds: number;
+  session_count: number;
+  unique_subjects_count: number;
+  topics_mastered_count: number;
+  topics_mastered_by_subject: Record<string, number>;  // subject id → topics mastered that week
+  days_studied: number;
+}
+
+// GET /api/reports/range/ — one WeeklyReport per week, oldest first
+export interface RangeReport {
+  from_week: string;
+  to_week: string;
+  weeks: WeeklyReport[];
+  totals: {
+    total_duration_seconds: number;
+    session_count: number;
+    topics_mastered_count: number;
+    days_studied: number;
+    weeks_studied: number;
+  };
+}
+
+// GET /api/sync/?since=<cursor> — rows changed since the cursor, and ids deleted since
+export interface SyncDelta {
+  cursor: number;
+  full: boolean;  // a full snapshot: replace local data instead of merging
+  subjects: Subject[];
+  topics: Topic[];
+  sessions: Session[];
+  deleted: { subjects: number[]; topics: number[]; sessions: number[] };
+}
+
+export interface StudyGroup {
+  id: number;
+  name: string;
+  owner: number;
+  invite_code: string;
+  member_count: number;
+  created_at: string;
+}
+
+export interface LeaderboardEntry {
+  rank: number | null;  // null: no study time this week
+  user_id: number;
+  username: string;
+  total_seconds: number;
+  session_count: number;
+}
+
+// GET /api/groups/:id/leaderboard/ — members who studied that week, in rank order
+export interface Leaderboard {
+  group: Pick<StudyGroup, 'id' | 'name' | 'member_count'>;
+  week_start: string;
+  week_end: string;
+  entries: LeaderboardEntry[];
+  me: LeaderboardEntry;
+}
+
+// GET /api/dashboard/ — everything the dashboard renders, in one response
+export interface DashboardData {
+  user: User;
+  subjects: Subject[];
+  recent_sessions: Session[];
+  streak: { streak: number; studied_today: boolean };
+  daily_goal: DailyGoalProgress;
+  weekly_report: WeeklyReport;
+  recommendations: Record<string, Topic | null>;
+}
+
+export interface SearchResult {
+  type: 'topic' | 'subject' | 'session';
+  id: number;
+  subject: number | null;
+  subject_name: string | null;
+  title: string;
+  text: string;
+  rank: number;
+}
@@ -0,0 +1,44 @@
+"""
+Gunicorn settings, read automatically from the working directory.
+
+The app is loaded once in the master process before the workers are
+forked (``preload_app``), so the workers share the imported code and
+objects copy-on-write instead of each importing them again: faster worker
+start-up and restarts, and less memory per worker. Django resolves its
+URLconf (and so imports every view and its dependencies) on the first
+request, so ``when_ready`` does that in the master too, then freezes the
+garbage collector's view of those objects so collections in the workers
+don't write to, and un-share, their pages.
+
+No database connection is opened before the fork; each worker connects on
+its first query. ``python -m benchmarks.startup`` measures the difference.
+
+The in-memory channel layer only reaches sockets in its own process, so
+``on_starting`` refuses to run several ASGI workers on it: a live-stats
+event would only reach the clients connected to the worker that handled the
+write. Set ``CHANNEL_LAYER_BACKEND`` to a shared layer (channels_redis)
+first.
+"""
+
+import gc
+
+preload_app = True
+
+
+def on_starting(server):
+    from django.conf import settings
+
+    asgi = 'uvicorn' in server.cfg.worker_class_str.lower()
+    backend = settings.CHANNEL_LAYERS['default']['BACKEND']
+    if asgi and server.cfg.workers > 1 and backend.endswith('.InMemoryChannelLayer'):
+        raise RuntimeError(
+            f'{server.cfg.workers} ASGI workers cannot share the in-memory channel layer; '
+            'set CHANNEL_LAYER_BACKEND (e.g. channels_redis.core.RedisChannelLayer) or run one worker'
+        )
+
+
+def when_ready(server):
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns  # import the URLconf and every view module
+    gc.freeze()